@@ -132,11 +132,22 @@ def main():
     window.show()
 
     from sff.tray_icon import TrayIcon
-    tray = TrayIcon()
+    tray = TrayIcon(icon_path=str(root_folder() / "SFF.png"))
     tray.show_requested.connect(window.showNormal)
     tray.show_requested.connect(window.activateWindow)
     tray.exit_requested.connect(app.quit)
-    tray.show()
+    tray.setup()
+
+    from sff.save_watcher import get_save_watcher
+    save_watcher = get_save_watcher()
+    tray.attach_save_watcher(
+        save_watcher,
+        start=bool(get_setting(Settings.AUTO_BACKUP_SAVES)),
+        prepare=lambda: save_watcher.watch_steam_library(
+            steam_path, get_setting(Settings.STEAM32_ID)
+        ),
+    )
+    app.aboutToQuit.connect(save_watcher.stop)
 
     from sff.uri_handler import UriHandler
     if not UriHandler.is_registered():
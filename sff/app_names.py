@@ -0,0 +1,277 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+App ID -> game name, from the cheapest source that has it:
+
+  1. appmanifest_*.acf of an installed game
+  2. the persistent name table (app_names.bin)
+  3. the Steam store API, fetched concurrently behind a shared rate limit
+
+Every name found online is written to the name table, so an app ID is only
+ever fetched once. IDs the store doesn't know are remembered for a day.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import msgpack  # type: ignore
+
+from sff.http_client import get_async_client, run_async
+from sff.utils import root_folder
+
+logger = logging.getLogger(__name__)
+
+NAME_TABLE_FILE = root_folder(outside_internal=True) / "app_names.bin"
+NAME_TABLE_VERSION = 1
+STORE_APPDETAILS_URL = "https://store.steampowered.com/api/appdetails"
+# The store API starts returning 429s at a few requests per second
+STORE_RATE = 2.5  # requests per second
+STORE_BURST = 5
+STORE_CONCURRENCY = 4
+STORE_TIMEOUT = 10.0
+MISSING_RETRY = 24 * 3600  # seconds before an unknown ID is asked for again
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve a token up front and sleep
+    for however long the bucket is in debt, so it works from threads and
+    from any event loop.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """take a token; returns how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+# Shared by everything that hits the store API
+store_rate_limiter = TokenBucket(STORE_RATE, STORE_BURST)
+
+
+class NameTable:
+    """{app_id: name} persisted as msgpack, plus recently failed lookups"""
+
+    def __init__(self, path = None):
+        self.path = path or NAME_TABLE_FILE
+        self._names: dict[int, str] = {}
+        self._missing: dict[int, float] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if self.path.exists():
+                data = msgpack.unpackb(self.path.read_bytes(), strict_map_key=False)
+                if data.get("version") == NAME_TABLE_VERSION:
+                    self._names = data.get("names", {})
+                    self._missing = data.get("missing", {})
+        except Exception as e:
+            logger.warning(f"Failed to load app name table, starting over: {e}")
+            self._names, self._missing = {}, {}
+
+    def get(self, app_id):
+        with self._lock:
+            self._load()
+            return self._names.get(app_id)
+
+    def is_missing(self, app_id):
+        with self._lock:
+            self._load()
+            failed_at = self._missing.get(app_id)
+            return failed_at is not None and time.time() - failed_at < MISSING_RETRY
+
+    def update(self, names):
+        with self._lock:
+            self._load()
+            for app_id, name in names.items():
+                if name and self._names.get(app_id) != name:
+                    self._names[app_id] = name
+                    self._missing.pop(app_id, None)
+                    self._dirty = True
+
+    def mark_missing(self, app_ids):
+        with self._lock:
+            self._load()
+            now = time.time()
+            for app_id in app_ids:
+                self._missing[app_id] = now
+                self._dirty = True
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                tmp.write_bytes(msgpack.packb({  # type: ignore
+                    "version": NAME_TABLE_VERSION,
+                    "names": self._names,
+                    "missing": self._missing,
+                }))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.error(f"Failed to save app name table: {e}")
+
+
+async def _fetch_store_name(app_id, semaphore):
+    async with semaphore:
+        await store_rate_limiter.acquire_async()
+        try:
+            resp = await get_async_client().get(
+                STORE_APPDETAILS_URL,
+                params={"appids": app_id, "filters": "basic"},
+                timeout=STORE_TIMEOUT,
+            )
+            if resp.status_code != 200:
+                logger.debug(f"Store API returned {resp.status_code} for {app_id}")
+                return app_id, None
+            info = (resp.json() or {}).get(str(app_id)) or {}
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Store API request failed for {app_id}: {e}")
+            return app_id, None
+    if not info.get("success"):
+        return app_id, ""
+    return app_id, info.get("data", {}).get("name") or ""
+
+
+async def _fetch_store_names(app_ids):
+    semaphore = asyncio.Semaphore(STORE_CONCURRENCY)
+    return await asyncio.gather(*(_fetch_store_name(a, semaphore) for a in app_ids))
+
+
+class AppNameResolver:
+
+    def __init__(self, steam_path = None, table = None):
+        self.steam_path = steam_path
+        self.table = table or NameTable()
+
+    def _library_service(self):
+        steam_path = self.steam_path
+        if steam_path is None:
+            from sff.storage.settings import get_setting
+            from sff.structs import Settings
+
+            steam_path = get_setting(Settings.STEAM_PATH)
+        if not steam_path or not Path(steam_path).exists():
+            return None
+        from sff.steam_library import get_library_service
+
+        return get_library_service(steam_path)
+
+    def _from_acf(self, app_ids):
+        names = {}
+        try:
+            service = self._library_service()
+            if service is None:
+                return names
+            for app_id in app_ids:
+                entry = service.get_entry(app_id)
+                if entry is not None and entry.name:
+                    names[app_id] = entry.name
+        except Exception as e:
+            logger.debug(f"ACF name lookup failed: {e}")
+        return names
+
+    def resolve_many(self, app_ids, online = True):
+        """
+        {app_id: name} for every ID that could be resolved. With online=False
+        only the local sources (ACF, name table) are used.
+        """
+        ids = list(dict.fromkeys(int(a) for a in app_ids))
+        names = self._from_acf(ids)
+        for app_id in ids:
+            if app_id not in names and (name := self.table.get(app_id)):
+                names[app_id] = name
+        self.table.update(names)
+        if online:
+            to_fetch = [a for a in ids if a not in names and not self.table.is_missing(a)]
+            if to_fetch:
+                logger.debug(f"Fetching {len(to_fetch)} app names from the store")
+                results = _run(_fetch_store_names(to_fetch))
+                fetched = {app_id: name for app_id, name in results if name}
+                names.update(fetched)
+                self.table.update(fetched)
+                # "" means the store answered but has no such app; None was a network error
+                self.table.mark_missing(app_id for app_id, name in results if name == "")
+        self.table.flush()
+        return names
+
+    def resolve(self, app_id, online = True):
+        return self.resolve_many([app_id], online=online).get(int(app_id))
+
+    def remember(self, names):
+        """add names found elsewhere (e.g. fix game cache) to the name table"""
+        self.table.update({int(k): v for k, v in names.items()})
+        self.table.flush()
+
+
+def _run(coro):
+    """run a coroutine whether or not this thread already has an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run_async(coro)
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_async, coro).result()
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_name_resolver():
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = AppNameResolver()
+        return _resolver
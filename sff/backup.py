@@ -1,30 +1,28 @@
-# SteaMidra - Steam game setup and manifest tool (SFF)
-# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
-#
-# This file is part of SteaMidra.
-#
-# SteaMidra is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# SteaMidra is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-#
-# You should have received a copy of the GNU General Public License
-# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
-
-"""Backup system for critical files and folders"""
+"""
+Backup system for critical files and folders
+
+Backups are incremental: a file whose size and mtime (and optionally
+SHA-256) match the previous backup of the same source is hard-linked to it
+instead of copied. backups.idx records each backup's source, time and
+sizes, plus the bytes on disk, so listing, retention and size queries
+don't walk the backup folders. The file list of each backup, used for the
+next comparison, is kept in .index/<backup name>.
+"""
 
 import logging
+import os
+import re
 import shutil
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+import msgpack  # type: ignore
 from colorama import Fore, Style
 
+from sff.file_copy import copy_entries, copy_file, copy_tree, scan_folder, scan_tree
+from sff.integrity import IntegrityVerifier
 from sff.storage.settings import get_setting
 from sff.structs import Settings
 from sff.utils import root_folder
@@ -33,6 +31,28 @@ logger = logging.getLogger(__name__)
 
 BACKUP_DIR = root_folder(outside_internal=True) / "backups"
 DEFAULT_RETENTION = 5  # Keep last 5 backups
+INDEX_FILE = "backups.idx"
+INDEX_VERSION = 1
+META_DIR = ".index"
+_TIMESTAMP_SUFFIX = re.compile(r"_\d{8}_\d{6}(_\d+)?$")
+
+_index_lock = threading.RLock()
+
+
+def _unique_size(path):
+    """bytes that deleting path would free: files no other backup links to"""
+    if path.is_file():
+        st = path.stat()
+        return st.st_size if st.st_nlink == 1 else 0
+    freed = 0
+    for entry in scan_tree(path):
+        try:
+            st = entry.path.stat()
+        except OSError:
+            continue
+        if st.st_nlink == 1:
+            freed += st.st_size
+    return freed
 
 
 class BackupManager:
@@ -40,6 +60,10 @@ class BackupManager:
     def __init__(self):
         self.backup_dir = BACKUP_DIR
         self.backup_dir.mkdir(exist_ok=True)
+        self.meta_dir = self.backup_dir / META_DIR
+        self._index = None
+        # (mtime_ns, size) of the index file as last loaded or saved
+        self._index_stamp = None
 
     def get_retention_count(self):
         try:
@@ -50,29 +74,143 @@ class BackupManager:
             pass
         return DEFAULT_RETENTION
 
-    def create_backup(self, source, backup_name = None):
+    def create_backup(self, source, backup_name = None, checksum = False, verify = True):
+        """
+        Back up a file or folder. Unchanged files are hard-linked to the
+        previous backup of the same source; with checksum, their SHA-256 must
+        match as well, not just size and mtime. With verify, copied files are
+        checked against their source afterwards. A backup that fails is removed.
+        """
+        backup_path = None
         try:
             if not source.exists():
                 logger.error(f"Source does not exist: {source}")
                 return None
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if backup_name is None:
-                backup_name = f"{source.name}_{timestamp}"
-            else:
-                backup_name = f"{backup_name}_{timestamp}"
-            backup_path = self.backup_dir / backup_name
-            if source.is_dir():
-                shutil.copytree(source, backup_path)
-                logger.info(f"Created folder backup: {backup_path}")
-            else:
-                shutil.copy2(source, backup_path)
-                logger.info(f"Created file backup: {backup_path}")
-            self._cleanup_old_backups(source.name)
+            group = source.name if backup_name is None else backup_name
+            backup_path = self.backup_dir / f"{group}_{timestamp}"
+            n = 1
+            # never write into an existing backup: its files may be linked elsewhere
+            while backup_path.exists():
+                backup_path = self.backup_dir / f"{group}_{timestamp}_{n}"
+                n += 1
+            with _index_lock:
+                previous = self._previous_backup(group, source)
+            rows, stored, size = self._copy_incremental(source, backup_path, previous, checksum, verify)
+            self.meta_dir.mkdir(exist_ok=True)
+            meta_tmp = self.meta_dir / (backup_path.name + ".tmp")
+            meta_tmp.write_bytes(msgpack.packb(rows))  # type: ignore
+            os.replace(meta_tmp, self.meta_dir / backup_path.name)
+            with _index_lock:
+                index = self._load_index()
+                # another process's reconcile may have listed it while we copied
+                listed = index["backups"].get(backup_path.name)
+                if listed is not None:
+                    index["total"] -= listed["stored"]
+                index["backups"][backup_path.name] = {
+                    "group": group,
+                    "source": str(source.resolve()),
+                    "created": time.time(),
+                    "is_dir": source.is_dir(),
+                    "file_count": len(rows),
+                    "size": size,
+                    "stored": stored,
+                }
+                index["total"] += stored
+                self._save_index()
+            logger.info(
+                f"Created {'folder' if source.is_dir() else 'file'} backup: {backup_path} "
+                f"({stored} of {size} bytes copied, the rest linked)"
+            )
+            self._cleanup_old_backups(group)
             return backup_path
         except Exception as e:
             logger.error(f"Failed to create backup of {source}: {e}", exc_info=True)
+            if backup_path is not None:
+                self._remove_partial(backup_path)
             return None
 
+    def _remove_partial(self, backup_path):
+        """delete what a failed create_backup left behind"""
+        try:
+            if backup_path.is_dir():
+                shutil.rmtree(backup_path)
+            else:
+                backup_path.unlink(missing_ok=True)
+            (self.meta_dir / (backup_path.name + ".tmp")).unlink(missing_ok=True)
+            (self.meta_dir / backup_path.name).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to remove incomplete backup {backup_path}: {e}")
+
+    def _copy_incremental(self, source, backup_path, previous, checksum, verify):
+        """copy source to backup_path, linking what's unchanged; returns (rows, bytes copied, total bytes)"""
+        # like shutil.copytree: symlinked folders are followed, empty ones kept
+        entries, folders = scan_folder(source)
+        if source.is_dir():
+            root = backup_path
+        else:
+            entries[0].rel = backup_path.name
+            root = backup_path.parent
+        old_rows, old_root = {}, None
+        if previous is not None:
+            old_rows = {row[0]: row for row in self._load_file_rows(previous)}
+            old_root = self.backup_dir / previous if source.is_dir() else self.backup_dir
+        # hashed in parallel; unchanged files come from the shared checksum cache
+        digests = IntegrityVerifier.compute_many([e.path for e in entries]) if checksum else {}
+        rows, to_copy = [], []
+        for entry in entries:
+            key = entry.rel if source.is_dir() else ""
+            old = old_rows.get(key)
+            digest = digests.get(entry.path)
+            if old is not None and old[1] == entry.size and old[2] == entry.mtime_ns:
+                old_path = old_root / (old[0] if source.is_dir() else previous)
+                if checksum and (
+                    digest is None
+                    or (old[3] or IntegrityVerifier.compute_checksum(old_path)) != digest
+                ):
+                    old_path = None
+                if old_path is not None:
+                    target = root / entry.rel
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        os.link(old_path, target)
+                        rows.append([key, entry.size, entry.mtime_ns, digest or old[3]])
+                        continue
+                    except OSError as e:
+                        # FAT/exFAT, a link count limit, or the old file is gone: copy it
+                        logger.debug(f"Can't link {old_path}, copying: {e}")
+            rows.append([key, entry.size, entry.mtime_ns, digest])
+            to_copy.append(entry)
+        if source.is_dir():
+            backup_path.mkdir(parents=True, exist_ok=True)
+        result = copy_entries(to_copy, root, folders=folders)
+        if not result.ok:
+            raise OSError(f"{len(result.errors)} file(s) could not be copied: {result.errors[0][1]}")
+        if verify:
+            failed = IntegrityVerifier.verify_copies([(e.path, root / e.rel) for e in to_copy])
+            if failed:
+                raise OSError(f"{len(failed)} copied file(s) don't match their source, first: {failed[0]}")
+        return rows, result.total_size, sum(e.size for e in entries)
+
+    def _previous_backup(self, group, source):
+        """newest indexed backup of the same source, or None"""
+        backups = self._load_index()["backups"]
+        source_key = str(source.resolve())
+        candidates = [
+            (meta["created"], name) for name, meta in backups.items()
+            if meta["group"] == group and meta["source"] == source_key
+            and meta["is_dir"] == source.is_dir()
+            and (self.meta_dir / name).exists()
+        ]
+        return max(candidates)[1] if candidates else None
+
+    def _load_file_rows(self, name):
+        try:
+            return msgpack.unpackb((self.meta_dir / name).read_bytes())
+        except Exception as e:
+            logger.warning(f"Failed to read file list of backup {name}: {e}")
+            return []
+
     def restore_backup(self, backup_path, destination):
         try:
             if not backup_path.exists():
@@ -88,9 +226,11 @@ class BackupManager:
                 else:
                     destination.unlink()
             if backup_path.is_dir():
-                shutil.copytree(backup_path, destination)
+                result = copy_tree(backup_path, destination)
+                if not result.ok:
+                    raise OSError(f"{len(result.errors)} file(s) could not be copied: {result.errors[0][1]}")
             else:
-                shutil.copy2(backup_path, destination)
+                copy_file(backup_path, destination)
             logger.info(f"Restored backup from {backup_path} to {destination}")
             return True
         except Exception as e:
@@ -98,18 +238,91 @@ class BackupManager:
             return False
 
     def list_backups(self, filter_name = None):
+        """backup paths, newest first"""
         try:
+            with _index_lock:
+                backups = self._load_index()["backups"]
+                names = sorted(backups, key=lambda n: backups[n]["created"], reverse=True)
             if filter_name:
-                backups = [p for p in self.backup_dir.iterdir() if p.name.startswith(filter_name)]
-            else:
-                backups = list(self.backup_dir.iterdir())
-            # Sort by modification time, newest first
-            backups.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-            return backups
+                names = [n for n in names if n.startswith(filter_name)]
+            return [self.backup_dir / n for n in names]
         except Exception as e:
             logger.error(f"Failed to list backups: {e}", exc_info=True)
             return []
 
+    def _index_path(self):
+        return self.backup_dir / INDEX_FILE
+
+    def _current_stamp(self):
+        try:
+            st = self._index_path().stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load_index(self):
+        """
+        the index, checked against the backup folder's entries; reloaded when
+        another process has rewritten the file since we last read or wrote it
+        """
+        stamp = self._current_stamp()
+        if self._index is not None and stamp == self._index_stamp:
+            return self._index
+        self._index_stamp = stamp
+        index = None
+        try:
+            if self._index_path().exists():
+                data = msgpack.unpackb(self._index_path().read_bytes())
+                if data.get("version") == INDEX_VERSION:
+                    index = data
+        except Exception as e:
+            logger.warning(f"Failed to load backup index, rebuilding: {e}")
+        if index is None:
+            index = {"version": INDEX_VERSION, "total": 0, "backups": {}}
+        self._index = index
+        self._reconcile_index()
+        return index
+
+    def _reconcile_index(self):
+        """
+        drop entries whose backup is gone and add backups made before the
+        index existed; only unknown backups are walked
+        """
+        index = self._index
+        on_disk = {
+            entry.name: entry for entry in os.scandir(self.backup_dir)
+            if entry.name not in (INDEX_FILE, META_DIR) and not entry.name.endswith(".tmp")
+        }
+        changed = False
+        for name in [n for n in index["backups"] if n not in on_disk]:
+            index["total"] -= index["backups"].pop(name)["stored"]
+            (self.meta_dir / name).unlink(missing_ok=True)
+            changed = True
+        for name, entry in on_disk.items():
+            if name in index["backups"]:
+                continue
+            files = scan_tree(entry.path)
+            size = sum(e.size for e in files)
+            index["backups"][name] = {
+                "group": _TIMESTAMP_SUFFIX.sub("", name),
+                "source": "",
+                "created": entry.stat().st_mtime,
+                "is_dir": entry.is_dir(),
+                "file_count": len(files),
+                "size": size,
+                "stored": size,
+            }
+            index["total"] += size
+            changed = True
+        if changed:
+            self._save_index()
+
+    def _save_index(self):
+        tmp = self.backup_dir / (INDEX_FILE + ".tmp")
+        tmp.write_bytes(msgpack.packb(self._index))  # type: ignore
+        os.replace(tmp, self._index_path())
+        self._index_stamp = self._current_stamp()
+
     def _verify_backup(self, backup_path):
         try:
             if backup_path.is_dir():
@@ -120,33 +333,63 @@ class BackupManager:
             logger.error(f"Backup verification failed: {e}", exc_info=True)
             return False
 
-    def _cleanup_old_backups(self, source_name):
+    def _cleanup_old_backups(self, group):
         try:
             retention = self.get_retention_count()
-            backups = self.list_backups(source_name)
-            for backup in backups[retention:]:
+            with _index_lock:
+                backups = self._load_index()["backups"]
+                names = sorted(
+                    (n for n, meta in backups.items() if meta["group"] == group),
+                    key=lambda n: backups[n]["created"], reverse=True,
+                )
+            for name in names[retention:]:
                 try:
-                    if backup.is_dir():
-                        shutil.rmtree(backup)
-                    else:
-                        backup.unlink()
-                    logger.info(f"Removed old backup: {backup}")
+                    self.delete_backup(self.backup_dir / name)
+                    logger.info(f"Removed old backup: {self.backup_dir / name}")
                 except Exception as e:
-                    logger.error(f"Failed to remove old backup {backup}: {e}")
+                    logger.error(f"Failed to remove old backup {name}: {e}")
         except Exception as e:
             logger.error(f"Failed to cleanup old backups: {e}", exc_info=True)
 
+    def delete_backup(self, backup_path):
+        """remove a backup and its index entry; files linked from other backups stay"""
+        with _index_lock:
+            index = self._load_index()
+            freed = _unique_size(backup_path) if backup_path.exists() else 0
+            if backup_path.is_dir():
+                shutil.rmtree(backup_path)
+            else:
+                backup_path.unlink(missing_ok=True)
+            (self.meta_dir / backup_path.name).unlink(missing_ok=True)
+            meta = index["backups"].pop(backup_path.name, None)
+            if meta is not None:
+                index["total"] -= freed
+                # the bytes still in use now count towards the backups linking them
+                shared = meta["stored"] - freed
+                if shared > 0:
+                    newer = [
+                        (m["created"], n) for n, m in index["backups"].items()
+                        if m["group"] == meta["group"] and m["source"] == meta["source"]
+                        and m["created"] > meta["created"]
+                    ]
+                    if newer:
+                        index["backups"][min(newer)[1]]["stored"] += shared
+            self._save_index()
+
     def get_backup_size(self):
+        """bytes on disk used by all backups (linked files counted once)"""
         try:
-            total_size = 0
-            for backup in self.backup_dir.rglob("*"):
-                if backup.is_file():
-                    total_size += backup.stat().st_size
-            return total_size
+            with _index_lock:
+                return self._load_index()["total"]
         except Exception as e:
             logger.error(f"Failed to calculate backup size: {e}", exc_info=True)
             return 0
 
+    def get_backup_info(self, backup_path):
+        """index entry of a backup: group, source, created, file_count, size, stored"""
+        with _index_lock:
+            return dict(self._load_index()["backups"].get(Path(backup_path).name, {}))
+
 
 # Global backup manager instance
 _backup_manager = None
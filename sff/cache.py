@@ -16,102 +16,315 @@
 # You should have received a copy of the GNU General Public License
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
-"""Simple caching layer for Steam API responses"""
+"""
+Caching layer for Steam API responses.
+
+Entries live in a SQLite database (WAL mode) next to the settings file, so a
+set() only writes its own row and nothing is read until a key is asked for.
+Each entry has its own TTL; once the cache grows past MAX_ENTRIES / MAX_BYTES
+the least recently used entries are evicted. Expired rows are cleaned up by a
+background thread.
+
+Values are stored as msgpack; anything over COMPRESS_THRESHOLD bytes is
+zlib-compressed (product-info blobs shrink ~5-10x). Rows are only decoded
+when get() is called for them.
+"""
 
 import json
 import logging
+import sqlite3
+import threading
 import time
-from pathlib import Path
-from typing import Any
+import zlib
+
+import msgpack  # type: ignore
 
-from sff.storage.settings import get_setting
-from sff.structs import Settings
 from sff.utils import root_folder
 
 logger = logging.getLogger(__name__)
 
-CACHE_FILE = root_folder(outside_internal=True) / "api_cache.json"
+CACHE_FILE = root_folder(outside_internal=True) / "api_cache.db"
+LEGACY_CACHE_FILE = root_folder(outside_internal=True) / "api_cache.json"
 DEFAULT_TTL = 3600  # 1 hour in seconds
+MAX_ENTRIES = 20_000
+MAX_BYTES = 256 * 1024 * 1024
+CLEANUP_INTERVAL = 30 * 60  # seconds between background expiry sweeps
+COMPRESS_THRESHOLD = 2048
+COMPRESS_LEVEL = 6
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    data     BLOB NOT NULL,
+    expires  REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size     INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+# First byte of a stored value
+_TAG_MSGPACK = b"\x00"
+_TAG_ZLIB = b"\x01"
+
+
+def _encode(data):
+    """(blob, uncompressed size)"""
+    packed = msgpack.packb(data)  # type: ignore
+    if len(packed) > COMPRESS_THRESHOLD:
+        return _TAG_ZLIB + zlib.compress(packed, COMPRESS_LEVEL), len(packed)
+    return _TAG_MSGPACK + packed, len(packed)
+
+
+def _decode(blob):
+    tag, payload = blob[:1], blob[1:]
+    if tag == _TAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return msgpack.unpackb(payload, strict_map_key=False)  # type: ignore
 
 
 class APICache:
 
-    def __init__(self):
-        self.cache: dict[str, dict[str, Any]] = {}
-        self.load()
+    def __init__(self, path = None, max_entries = MAX_ENTRIES, max_bytes = MAX_BYTES):
+        self.path = path or CACHE_FILE
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn = self._connect()
+        self._import_legacy()
 
-    def load(self):
+    def _connect(self):
         try:
-            if CACHE_FILE.exists():
-                with CACHE_FILE.open("r", encoding="utf-8") as f:
-                    self.cache = json.load(f)
-                logger.debug(f"Loaded cache with {len(self.cache)} entries")
-        except Exception as e:
-            logger.error(f"Failed to load cache: {e}", exc_info=True)
-            self.cache = {}
+            return self._open()
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Cache database is unusable, recreating it: {e}")
+            for suffix in ("", "-wal", "-shm"):
+                self.path.with_name(self.path.name + suffix).unlink(missing_ok=True)
+            return self._open()
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # it's only a cache: start over instead of migrating rows
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.executescript(_SCHEMA)
+        return conn
 
-    def save(self):
+    def _import_legacy(self):
+        """one-time move of the old api_cache.json into the database"""
+        if self.path != CACHE_FILE or not LEGACY_CACHE_FILE.exists():
+            return
         try:
-            with CACHE_FILE.open("w", encoding="utf-8") as f:
-                json.dump(self.cache, f)
-            logger.debug(f"Saved cache with {len(self.cache)} entries")
+            with LEGACY_CACHE_FILE.open("r", encoding="utf-8") as f:
+                legacy = json.load(f)
+            now = time.time()
+            rows = []
+            for key, entry in legacy.items():
+                expires = entry.get("timestamp", 0) + entry.get("ttl", DEFAULT_TTL)
+                if expires > now:
+                    blob, raw_size = _encode(entry.get("data"))
+                    rows.append((key, blob, expires, now, len(blob), raw_size))
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            logger.info(f"Imported {len(rows)} entries from {LEGACY_CACHE_FILE.name}")
         except Exception as e:
-            logger.error(f"Failed to save cache: {e}", exc_info=True)
+            logger.error(f"Failed to import legacy cache: {e}", exc_info=True)
+        LEGACY_CACHE_FILE.unlink(missing_ok=True)
 
     def get(self, key):
-        if key not in self.cache:
-            return None
-        entry = self.cache[key]
-        timestamp = entry.get("timestamp", 0)
-        ttl = entry.get("ttl", DEFAULT_TTL)
-        if time.time() - timestamp > ttl:
-            logger.debug(f"Cache expired for key: {key}")
-            del self.cache[key]
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data, expires FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                if row[1] < now:
+                    logger.debug(f"Cache expired for key: {key}")
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.misses += 1
+                    return None
+                self.hits += 1
+                self._conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read cache entry {key}: {e}")
             return None
         logger.debug(f"Cache hit for key: {key}")
-        return entry.get("data")
+        try:
+            return _decode(row[0])
+        except Exception as e:
+            logger.error(f"Corrupt cache entry {key}, dropping it: {e}")
+            self.invalidate(key)
+            return None
 
     def set(self, key, data, ttl = None):
+        self.set_many({key: data}, ttl)
+
+    def set_many(self, items, ttl = None):
+        """store several entries in one transaction"""
         if ttl is None:
             ttl = DEFAULT_TTL
-        self.cache[key] = {
-            "data": data,
-            "timestamp": time.time(),
-            "ttl": ttl
-        }
-        logger.debug(f"Cached data for key: {key} (TTL: {ttl}s)")
-        self.save()
+        now = time.time()
+        rows = []
+        for key, data in items.items():
+            blob, raw_size = _encode(data)
+            rows.append((key, blob, now + ttl, now, len(blob), raw_size))
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows
+                    )
+                    self._evict()
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save cache: {e}", exc_info=True)
+            return
+        logger.debug(f"Cached {len(rows)} entries (TTL: {ttl}s)")
+
+    def _evict(self):
+        """drop least recently used entries until the budget is met (lock held)"""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        cursor = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed")
+        victims = []
+        for key, size in cursor:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        logger.debug(f"Evicted {evicted} cache entries")
 
     def invalidate(self, key = None):
-        if key is None:
-            # Clear entire cache
-            self.cache = {}
-            logger.info("Invalidated entire cache")
-        elif key in self.cache:
-            del self.cache[key]
-            logger.info(f"Invalidated cache for key: {key}")
-        self.save()
+        try:
+            with self._lock:
+                if key is None:
+                    # Clear entire cache
+                    self._conn.execute("DELETE FROM entries")
+                    logger.info("Invalidated entire cache")
+                elif self._conn.execute(
+                    "DELETE FROM entries WHERE key = ?", (key,)
+                ).rowcount:
+                    logger.info(f"Invalidated cache for key: {key}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to invalidate cache: {e}")
 
     def cleanup_expired(self):
-        current_time = time.time()
-        expired_keys = []
-        for key, entry in self.cache.items():
-            timestamp = entry.get("timestamp", 0)
-            ttl = entry.get("ttl", DEFAULT_TTL)
-            if current_time - timestamp > ttl:
-                expired_keys.append(key)
-        for key in expired_keys:
-            del self.cache[key]
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
-            self.save()
+        try:
+            with self._lock:
+                removed = self._conn.execute(
+                    "DELETE FROM entries WHERE expires < ?", (time.time(),)
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Failed to clean up cache: {e}")
+            return
+        if removed:
+            logger.info(f"Cleaned up {removed} expired cache entries")
+
+    def stats(self):
+        """entry count, stored vs uncompressed bytes, and this session's hit ratio"""
+        with self._lock:
+            entries, stored, raw, compressed = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0),"
+                " COALESCE(SUM(substr(data, 1, 1) = ?), 0) FROM entries",
+                (_TAG_ZLIB,),
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "compressed_entries": compressed,
+            "stored_bytes": stored,
+            "raw_bytes": raw,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _cleanup_loop(cache):
+    while True:
+        cache.cleanup_expired()
+        time.sleep(CLEANUP_INTERVAL)
 
 
 _cache_instance = None
+_cache_lock = threading.Lock()
 
 
 def get_cache():
     global _cache_instance
-    if _cache_instance is None:
-        _cache_instance = APICache()
-    return _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = APICache()
+            threading.Thread(
+                target=_cleanup_loop, args=(_cache_instance,),
+                name="api-cache-cleanup", daemon=True,
+            ).start()
+        return _cache_instance
+
+
+def _report(path = None):
+    """
+    python -m sff.cache [db] — stored size vs. the old JSON encoding,
+    and read time for every entry
+    """
+    from pathlib import Path
+
+    cache = APICache(Path(path) if path else CACHE_FILE)
+    with cache._lock:
+        keys = [k for (k,) in cache._conn.execute("SELECT key FROM entries")]
+    json_bytes = 0
+    start = time.perf_counter()
+    for key in keys:
+        value = cache.get(key)
+        if value is not None:
+            json_bytes += len(json.dumps(value, default=str))
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"entries:           {stats['entries']} ({stats['compressed_entries']} compressed)")
+    print(f"as JSON (before):  {json_bytes / 1024:.1f} KiB")
+    print(f"msgpack raw:       {stats['raw_bytes'] / 1024:.1f} KiB")
+    print(f"stored (after):    {stats['stored_bytes'] / 1024:.1f} KiB")
+    print(f"read all entries:  {elapsed * 1000:.1f} ms")
+    print(f"hit ratio:         {stats['hit_ratio']:.1%} ({stats['hits']}/{stats['hits'] + stats['misses']})")
+    cache.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    _report(sys.argv[1] if len(sys.argv) > 1 else None)
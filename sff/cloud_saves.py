@@ -20,53 +20,36 @@
 Cloud saves — local backup and restore for game save files.
 
 Scans common save locations, backs up to %APPDATA%/SteaMidra/save_backups/,
-and provides timestamped restore points.
+and provides timestamped restore points. Snapshots are stored in a shared
+content-addressed chunk store, so unchanged files cost nothing.
 """
 
 import os
-import sys
 import shutil
+import hashlib
 import logging
 import json
+import threading
 import time
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 
-logger = logging.getLogger(__name__)
+import msgpack  # type: ignore
+
+from sff.file_copy import copy_tree, scan_tree
+from sff.integrity import IntegrityVerifier
+from sff.save_archive import ARCHIVE_SUFFIX, export_archive, import_archive, read_manifest
+from sff.save_detection import AhoCorasick, get_save_detection_cache, save_search_terms
+from sff.storage.chunk_store import (
+    SNAPSHOT_SUFFIX,
+    ChunkStore,
+    read_snapshot,
+    snapshot_digests,
+    store_lock,
+    write_snapshot,
+)
 
-# module-level cache for all_games.txt — parsed once per session
-_ALL_GAMES_CACHE = None
-
-
-def _load_all_games_cache():
-    """Parse all_games.txt into {app_id: name}. Returns cached dict after first call."""
-    global _ALL_GAMES_CACHE
-    if _ALL_GAMES_CACHE is not None:
-        return _ALL_GAMES_CACHE
-    _ALL_GAMES_CACHE = {}
-    try:
-        if getattr(sys, "frozen", False):
-            base = Path(sys._MEIPASS)  # type: ignore[attr-defined]
-        else:
-            base = Path(__file__).parent.parent
-        txt = base / "all_games.txt"
-        if not txt.exists():
-            return _ALL_GAMES_CACHE
-        with txt.open(encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                # format: Game Name [ID=12345]
-                if "[ID=" in line and line.endswith("]"):
-                    idx = line.rfind("[ID=")
-                    name = line[:idx].strip()
-                    appid_str = line[idx + 4 : -1]
-                    if appid_str.isdigit() and name:
-                        _ALL_GAMES_CACHE[int(appid_str)] = name
-    except Exception as e:
-        logger.debug("all_games.txt load failed: %s", e)
-    return _ALL_GAMES_CACHE
+logger = logging.getLogger(__name__)
 
 # common save file locations to scan
 SAVE_LOCATIONS = [
@@ -84,6 +67,17 @@ SAVE_LOCATIONS = [
     Path(r"C:\Program Files (x86)\Steam\userdata"),
 ]
 
+# snapshots kept per game; older ones are dropped and their chunks collected
+MAX_SNAPSHOTS = 30
+MAX_SAFETY_SNAPSHOTS = 5
+
+# per-game {snapshot name: metadata}, so listing backups never opens them
+INDEX_FILE = "snapshots.idx"
+INDEX_VERSION = 1
+_index_lock = threading.Lock()
+# games whose index was checked against the folder in this session
+_reconciled: set[int] = set()
+
 # folder names that often contain game saves
 SAVE_FOLDER_HINTS = [
     "save", "saves", "savegame", "savegames",
@@ -98,9 +92,9 @@ class SaveInfo:
     app_id: int
     game_name: str
     save_path: str
-    file_count = 0
-    total_size = 0
-    last_modified = 0.0
+    file_count: int = 0
+    total_size: int = 0
+    last_modified: float = 0.0
 
 
 @dataclass
@@ -112,6 +106,7 @@ class BackupInfo:
     timestamp: float = 0.0
     file_count: int = 0
     total_size: int = 0
+    files_hash: str = ""
 
     def to_dict(self):
         return asdict(self)
@@ -121,6 +116,34 @@ class BackupInfo:
         return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
 
 
+def _files_hash(rows):
+    """fingerprint of a snapshot's file list: same hash, same contents"""
+    return hashlib.sha256(msgpack.packb(sorted(rows))).hexdigest()  # type: ignore
+
+
+def _backup_kind(name):
+    for kind in ("backup", "pre_restore"):
+        if name.startswith(kind + "_"):
+            return kind
+    return None
+
+
+def _snapshot_order(path):
+    """sort key for <kind>_<YYYYmmdd_HHMMSS>[_n].snapshot across kinds: (time, n)"""
+    parts = path.stem[len(_backup_kind(path.name) or "") + 1:].split("_")
+    return "_".join(parts[:2]), int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+
+
+def _folder_stats(path):
+    """(file_count, total_size, newest mtime) of everything under path"""
+    entries = scan_tree(path)
+    return (
+        len(entries),
+        sum(e.size for e in entries),
+        max((e.mtime_ns for e in entries), default=0) / 1e9,
+    )
+
+
 def _get_backup_dir():
     """get the save backup root directory"""
     base = Path(os.environ.get("APPDATA", os.path.expanduser("~")))
@@ -138,81 +161,81 @@ class CloudSaves:
 
     Structure:
         save_backups/
+        ├── chunks/                     (file contents, shared by all games)
         ├── {appid}/
         │   ├── manifest.json
-        │   ├── backup_20260413_120000/
-        │   │   └── (save files)
-        │   └── backup_20260413_130000/
+        │   ├── backup_20260413_120000.snapshot
+        │   ├── pre_restore_20260413_130000.snapshot
+        │   └── backup_20260401_090000/  (made by older versions)
         │       └── (save files)
         └── ...
     """
 
     def __init__(self):
         self.backup_dir = _get_backup_dir()
+        self.store = ChunkStore(self.backup_dir)
 
-    def detect_saves(self, app_id, game_name = ""):
+    def detect_saves(self, app_id, game_name = "", refresh = True):
         """
         Try to detect save files for a game.
         Searches common locations for folders matching the app ID or game name.
         """
-        results = []
-        search_terms = [str(app_id)]
-        if game_name:
-            # add cleaned game name variants
-            clean_name = game_name.replace(":", "").replace("'", "").strip()
-            search_terms.extend([
-                clean_name,
-                clean_name.replace(" ", ""),
-                clean_name.replace(" ", "_"),
-            ])
-        for base_path in SAVE_LOCATIONS:
-            if not base_path.exists():
-                continue
+        return self.detect_saves_many([(app_id, game_name)], refresh=refresh).get(app_id, [])
+
+    def detect_saves_many(self, games, refresh = True):
+        """
+        Detect saves for many games with one pass over each save location.
+        games is [(app_id, game_name)]; returns {app_id: [SaveInfo]}.
+        Folder listings are cached by mtime. Matched folders are rescanned
+        unless refresh=False, which reuses their file counts and sizes while
+        the folder's own mtime is unchanged; saves rewritten in a sub-folder
+        don't change it, so only pass False when the counts needn't be current.
+        """
+        matcher = AhoCorasick()
+        names = {}
+        for app_id, game_name in games:
+            names[app_id] = game_name
+            for term in save_search_terms(app_id, game_name):
+                matcher.add(term, app_id)
+        results = {app_id: [] for app_id in names}
+        cache = get_save_detection_cache()
+        for base_path in dict.fromkeys(SAVE_LOCATIONS):
             try:
-                for item in base_path.iterdir():
-                    if not item.is_dir():
-                        continue
-                    name_lower = item.name.lower()
-                    for term in search_terms:
-                        if term.lower() in name_lower:
-                            info = self._scan_save_dir(item, app_id, game_name)
-                            if info and info.file_count > 0:
-                                results.append(info)
-                            break
-            except PermissionError:
+                subfolders = cache.subfolders(base_path)
+            except OSError:
                 continue
+            for name in subfolders:
+                matched = matcher.matches(name.lower())
+                if not matched:
+                    continue
+                folder = base_path / name
+                try:
+                    file_count, total_size, last_modified = cache.folder_stats(
+                        folder, _folder_stats, refresh=refresh,
+                    )
+                except Exception as e:
+                    logger.warning("Failed to scan %s: %s", folder, e)
+                    continue
+                if file_count == 0:
+                    continue
+                for app_id in matched:
+                    results[app_id].append(SaveInfo(
+                        app_id=app_id,
+                        game_name=names[app_id],
+                        save_path=str(folder),
+                        file_count=file_count,
+                        total_size=total_size,
+                        last_modified=last_modified,
+                    ))
+        cache.flush()
         return results
 
-    def _scan_save_dir(self, path, app_id, game_name):
-        """scan a directory for save files"""
-        try:
-            file_count = 0
-            total_size = 0
-            last_modified = 0.0
-            for f in path.rglob("*"):
-                if f.is_file():
-                    file_count += 1
-                    stat = f.stat()
-                    total_size += stat.st_size
-                    last_modified = max(last_modified, stat.st_mtime)
-            if file_count == 0:
-                return None
-            return SaveInfo(
-                app_id=app_id,
-                game_name=game_name,
-                save_path=str(path),
-                file_count=file_count,
-                total_size=total_size,
-                last_modified=last_modified,
-            )
-        except Exception as e:
-            logger.warning("Failed to scan %s: %s", path, e)
-            return None
-
-    def backup(self, app_id, save_path, game_name = "", log_func=None):
+    def backup(self, app_id, save_path, game_name = "", log_func=None, only_if_changed=False):
         """
         Create a timestamped backup of save files.
-        Returns BackupInfo on success, None on failure.
+        Returns BackupInfo on success, None on failure. With only_if_changed,
+        nothing is written (and None returned) if the contents match the
+        last snapshot of the same folder.
         """
         def log(msg):
             if log_func:
@@ -222,38 +245,20 @@ class CloudSaves:
         if not src.exists():
             log(f"Save path not found: {save_path}")
             return None
-        # create timestamped backup folder
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / str(app_id) / f"backup_{timestamp}"
-        backup_path.mkdir(parents=True, exist_ok=True)
         try:
-            # copy all files
-            file_count = 0
-            total_size = 0
-            if src.is_file():
-                shutil.copy2(src, backup_path / src.name)
-                file_count = 1
-                total_size = src.stat().st_size
-            else:
-                for f in src.rglob("*"):
-                    if f.is_file():
-                        rel = f.relative_to(src)
-                        dest = backup_path / rel
-                        dest.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(f, dest)
-                        file_count += 1
-                        total_size += f.stat().st_size
-            info = BackupInfo(
-                app_id=app_id,
-                game_name=game_name,
-                backup_path=str(backup_path),
-                timestamp=time.time(),
-                file_count=file_count,
-                total_size=total_size,
+            info, new_bytes = self._take_snapshot(
+                app_id, src, game_name, "backup", only_if_changed=only_if_changed,
             )
+            if info is None:
+                log("No changes since the last backup")
+                return None
             # save manifest
-            self._save_manifest(app_id, game_name, save_path, info)
-            log(f"✓ Backed up {file_count} files ({self._format_size(total_size)})")
+            self._save_manifest(app_id, game_name, str(save_path), info)
+            log(
+                f"✓ Backed up {info.file_count} files ({self._format_size(info.total_size)}, "
+                f"{self._format_size(new_bytes)} new)"
+            )
+            self._apply_retention(app_id)
             return info
         except Exception as e:
             logger.error("Backup failed: %s", e)
@@ -277,60 +282,260 @@ class CloudSaves:
         try:
             # create a safety backup of current saves first
             if dest.exists():
-                safety_ts = time.strftime("%Y%m%d_%H%M%S")
-                safety_path = self.backup_dir / str(app_id) / f"pre_restore_{safety_ts}"
-                shutil.copytree(dest, safety_path, dirs_exist_ok=True)
+                self._take_snapshot(app_id, dest, "", "pre_restore")
                 log("Created safety backup before restore")
             # restore
             dest.mkdir(parents=True, exist_ok=True)
-            restored = 0
-            for f in src.rglob("*"):
-                if f.is_file():
-                    rel = f.relative_to(src)
-                    target = dest / rel
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(f, target)
-                    restored += 1
+            if src.is_file():
+                restored = self.store.restore(read_snapshot(src)["files"], dest)
+            else:
+                result = copy_tree(src, dest)
+                if not result.ok:
+                    raise OSError(f"{len(result.errors)} file(s) failed, first: {result.errors[0][1]}")
+                self._verify_copy(src, dest)
+                restored = result.file_count
             log(f"✓ Restored {restored} files")
+            self._apply_retention(app_id)
             return True
         except Exception as e:
             logger.error("Restore failed: %s", e)
             log(f"Restore failed: {e}")
             return False
 
-    def get_backups(self, app_id):
-        """get all backups for a game, newest first"""
+    def get_backups(self, app_id, on_reconciled=None):
+        """
+        Get all backups for a game, newest first, from the snapshot index.
+        The first call per game starts a background pass that indexes
+        backups made by older versions; on_reconciled() is called if that
+        changed anything.
+        """
         app_dir = self.backup_dir / str(app_id)
         if not app_dir.exists():
             return []
-        backups = []
+        if app_id not in _reconciled:
+            _reconciled.add(app_id)
+            threading.Thread(
+                target=self._reconcile_index, args=(app_id, on_reconciled),
+                name=f"cloud-saves-index-{app_id}", daemon=True,
+            ).start()
         manifest = self._load_manifest(app_id)
-        for d in sorted(app_dir.iterdir(), reverse=True):
-            if d.is_dir() and d.name.startswith("backup_"):
-                # count files
-                files = list(d.rglob("*"))
-                file_count = sum(1 for f in files if f.is_file())
-                total_size = sum(f.stat().st_size for f in files if f.is_file())
-                backups.append(BackupInfo(
-                    app_id=app_id,
-                    game_name=manifest.get("game_name", ""),
-                    backup_path=str(d),
-                    timestamp=d.stat().st_mtime,
-                    file_count=file_count,
-                    total_size=total_size,
-                ))
+        backups = []
+        for name, meta in self._load_index(app_id).items():
+            if meta.get("kind") != "backup":
+                continue
+            backups.append(BackupInfo(
+                app_id=app_id,
+                game_name=meta.get("game_name") or manifest.get("game_name", ""),
+                backup_path=str(app_dir / name),
+                timestamp=meta.get("timestamp", 0.0),
+                file_count=meta.get("file_count", 0),
+                total_size=meta.get("total_size", 0),
+                files_hash=meta.get("files_hash", ""),
+            ))
+        backups.sort(key=lambda b: b.timestamp, reverse=True)
         return backups
 
+    def _load_index(self, app_id):
+        path = self.backup_dir / str(app_id) / INDEX_FILE
+        try:
+            if path.exists():
+                data = msgpack.unpackb(path.read_bytes())
+                if data.get("version") == INDEX_VERSION:
+                    return data.get("snapshots", {})
+        except Exception as e:
+            logger.warning("Failed to load snapshot index for %s: %s", app_id, e)
+        return {}
+
+    def _update_index(self, app_id, add=None, remove=()):
+        """add {name: meta} / drop names in the per-game snapshot index"""
+        app_dir = self.backup_dir / str(app_id)
+        with _index_lock:
+            index = self._load_index(app_id)
+            index.update(add or {})
+            for name in remove:
+                index.pop(name, None)
+            tmp = app_dir / (INDEX_FILE + ".tmp")
+            tmp.write_bytes(msgpack.packb({  # type: ignore
+                "version": INDEX_VERSION,
+                "snapshots": index,
+            }))
+            os.replace(tmp, app_dir / INDEX_FILE)
+
+    def _describe_backup(self, path):
+        """index metadata for a snapshot or an old-style backup folder"""
+        if path.is_file():
+            data = read_snapshot(path)
+            return {
+                "kind": _backup_kind(path.name),
+                "game_name": data.get("game_name", ""),
+                "timestamp": data.get("timestamp", 0.0),
+                "file_count": data.get("file_count", 0),
+                "total_size": data.get("total_size", 0),
+                "files_hash": _files_hash([[r[0], r[1], r[3]] for r in data.get("files", [])]),
+            }
+        rows = [[e.rel, e.size, e.mtime_ns] for e in scan_tree(path)]
+        return {
+            "kind": _backup_kind(path.name),
+            "game_name": "",
+            "timestamp": path.stat().st_mtime,
+            "file_count": len(rows),
+            "total_size": sum(r[1] for r in rows),
+            "files_hash": _files_hash(rows),
+        }
+
+    def _reconcile_index(self, app_id, on_reconciled=None):
+        """index backups the index doesn't know about and forget deleted ones"""
+        app_dir = self.backup_dir / str(app_id)
+        try:
+            index = self._load_index(app_id)
+            on_disk = {
+                p.name: p for p in app_dir.iterdir()
+                if _backup_kind(p.name) and (p.is_dir() or p.suffix == SNAPSHOT_SUFFIX)
+            }
+            added = {}
+            for name, path in on_disk.items():
+                if name in index:
+                    continue
+                try:
+                    added[name] = self._describe_backup(path)
+                except Exception as e:
+                    logger.warning("Failed to index backup %s: %s", path, e)
+            stale = [name for name in index if name not in on_disk]
+            if not added and not stale:
+                return
+            self._update_index(app_id, add=added, remove=stale)
+            logger.debug("Snapshot index for %s: %d added, %d removed", app_id, len(added), len(stale))
+        except Exception as e:
+            logger.warning("Failed to reconcile snapshot index for %s: %s", app_id, e)
+            return
+        if on_reconciled:
+            on_reconciled()
+
     def delete_backup(self, backup_path):
         """delete a specific backup"""
         try:
-            shutil.rmtree(backup_path)
+            path = Path(backup_path)
+            if path.is_file():
+                path.unlink()
+                self.collect_garbage()
+            else:
+                shutil.rmtree(path)
+            if path.parent.name.isdigit():
+                self._update_index(int(path.parent.name), remove=[path.name])
             logger.info("Deleted backup: %s", backup_path)
             return True
         except Exception as e:
             logger.error("Failed to delete backup: %s", e)
             return False
 
+    def _snapshots(self, app_id, prefix):
+        """snapshot files of one kind, oldest first"""
+        app_dir = self.backup_dir / str(app_id)
+        if not app_dir.exists():
+            return []
+        return sorted(
+            p for p in app_dir.iterdir()
+            if p.name.startswith(prefix + "_") and p.suffix == SNAPSHOT_SUFFIX
+        )
+
+    def _take_snapshot(self, app_id, src, game_name, kind, only_if_changed=False):
+        """
+        chunk src into a new <kind>_<timestamp>.snapshot; returns
+        (BackupInfo, new bytes), or (None, 0) if only_if_changed and the
+        contents match the previous snapshot
+        """
+        previous = None
+        src_key = str(Path(src).resolve())
+        # reuse the file list of the newest snapshot of the same folder, of either kind
+        candidates = self._snapshots(app_id, "backup") + self._snapshots(app_id, "pre_restore")
+        for old in sorted(candidates, key=_snapshot_order, reverse=True):
+            try:
+                data = read_snapshot(old)
+            except Exception:
+                continue
+            if data.get("source") == src_key:
+                previous = data
+                break
+        app_dir = self.backup_dir / str(app_id)
+        app_dir.mkdir(parents=True, exist_ok=True)
+        result = self.store.snapshot(src, previous)
+        with store_lock:
+            # a gc for another game may have swept chunks we wrote: store them again first
+            self.store.fill_missing(result)
+            bad = self.store.verify(result.new_digests)
+            if bad:
+                # drop them so the next snapshot writes them again
+                self.store.discard(bad)
+                raise OSError(f"{len(bad)} chunk(s) failed verification after writing")
+            files_hash = _files_hash([[r[0], r[1], r[3]] for r in result.files])
+            if only_if_changed and previous is not None and files_hash == _files_hash(
+                [[r[0], r[1], r[3]] for r in previous.get("files", [])]
+            ):
+                return None, 0
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = app_dir / f"{kind}_{stamp}{SNAPSHOT_SUFFIX}"
+            n = 1
+            while path.exists():
+                path = app_dir / f"{kind}_{stamp}_{n}{SNAPSHOT_SUFFIX}"
+                n += 1
+            now = time.time()
+            write_snapshot(path, {
+                "app_id": app_id,
+                "game_name": game_name,
+                "source": src_key,
+                "timestamp": now,
+                "file_count": result.file_count,
+                "total_size": result.total_size,
+                "files": result.files,
+            })
+        info = BackupInfo(
+            app_id=app_id,
+            game_name=game_name,
+            backup_path=str(path),
+            timestamp=now,
+            file_count=result.file_count,
+            total_size=result.total_size,
+            files_hash=files_hash,
+        )
+        self._update_index(app_id, add={path.name: {
+            "kind": kind,
+            "game_name": game_name,
+            "timestamp": now,
+            "file_count": info.file_count,
+            "total_size": info.total_size,
+            "files_hash": info.files_hash,
+        }})
+        return info, result.new_bytes
+
+    def _apply_retention(self, app_id):
+        """drop the oldest snapshots past the limits, then their chunks"""
+        expired = self._snapshots(app_id, "backup")[:-MAX_SNAPSHOTS]
+        expired += self._snapshots(app_id, "pre_restore")[:-MAX_SAFETY_SNAPSHOTS]
+        removed = []
+        for path in expired:
+            try:
+                path.unlink()
+                removed.append(path.name)
+            except OSError as e:
+                logger.warning("Failed to remove old snapshot %s: %s", path, e)
+        if removed:
+            self._update_index(app_id, remove=removed)
+        if expired:
+            self.collect_garbage()
+
+    def collect_garbage(self):
+        """remove chunks that no snapshot of any game refers to"""
+        with store_lock:
+            live = set()
+            for path in self.backup_dir.glob(f"*/*{SNAPSHOT_SUFFIX}"):
+                try:
+                    live |= snapshot_digests(read_snapshot(path))
+                except Exception as e:
+                    # keep everything rather than lose chunks a damaged snapshot might need
+                    logger.warning("Skipping garbage collection, unreadable snapshot %s: %s", path, e)
+                    return 0, 0
+            return self.store.gc(live)
+
     def _save_manifest(self, app_id, game_name, save_path, latest):
         """save per-game manifest with metadata"""
         manifest_path = self.backup_dir / str(app_id) / "manifest.json"
@@ -359,10 +564,11 @@ class CloudSaves:
         """
         Enumerate games in Steam userdata for the given Steam32 ID.
         Returns a list of (app_id, game_name) sorted by game name.
-        Name resolution — three layers, in order:
+        Name resolution — four layers, in order:
           1. appmanifest_*.acf across all Steam library folders (installed games)
           2. SteaMidra fix_game_cache CachedAppInfo (previously fixed games)
-          3. Batch Steam Store API call for anything still unresolved (uninstalled games)
+          3. local app catalog (app_catalog.bin, built from all_games.txt)
+          4. AppNameResolver (name table, then rate-limited Store API) for the rest
         """
         userdata_dir = Path(steam_path) / "userdata" / str(steam32_id)
         if not userdata_dir.exists():
@@ -383,31 +589,13 @@ class CloudSaves:
         if not app_ids:
             return []
         name_map = {}
-        # --- Layer 1: ACF files via get_steam_libs (same as main menu) ---
+        # --- Layer 1: ACF files across all Steam libraries (same as main menu) ---
         try:
-            from sff.storage.vdf import get_steam_libs, vdf_load
-            steam_root = Path(steam_path)
-            libs = get_steam_libs(steam_root)
-            if steam_root not in libs:
-                libs = [steam_root] + list(libs)
-            for lib in libs:
-                steamapps = lib / "steamapps"
-                if not steamapps.exists():
-                    continue
-                for acf in steamapps.glob("appmanifest_*.acf"):
-                    try:
-                        appid_str = acf.stem.split("_", 1)[1]
-                        if not appid_str.isdigit():
-                            continue
-                        appid = int(appid_str)
-                        if appid in name_map:
-                            continue
-                        data = vdf_load(acf)
-                        name = data.get("AppState", {}).get("name", "")
-                        if name:
-                            name_map[appid] = name
-                    except Exception:
-                        pass
+            from sff.steam_library import get_library_service
+            for _, entries in get_library_service(steam_path).scan():
+                for acf in entries:
+                    if acf.app_id and acf.name and acf.app_id not in name_map:
+                        name_map[acf.app_id] = acf.name
         except Exception:
             pass
         # --- Layer 2: SteaMidra fix_game_cache (previously fixed games) ---
@@ -422,42 +610,25 @@ class CloudSaves:
                         name_map[appid] = info.name
             except Exception:
                 pass
-        # --- Layer 3: all_games.txt local lookup (instant, offline) ---
+        # --- Layer 3: local app catalog lookup (instant, offline) ---
         unresolved_3 = [a for a in app_ids if a not in name_map]
         if unresolved_3:
-            games_db = _load_all_games_cache()
-            for appid in unresolved_3:
-                n = games_db.get(appid)
-                if n:
-                    name_map[appid] = n
-        # --- Layer 4: Parallel Steam Store API (last resort for unlisted games) ---
+            try:
+                from sff.storage.app_catalog import get_app_catalog
+                catalog = get_app_catalog()
+                if catalog is not None:
+                    for appid in unresolved_3:
+                        n = catalog.get_name(appid)
+                        if n:
+                            name_map[appid] = n
+            except Exception as e:
+                logger.debug("App catalog lookup failed: %s", e)
+        # --- Layer 4: name table, then the Steam Store API (last resort for unlisted games) ---
         still_unresolved = [a for a in app_ids if a not in name_map]
         if still_unresolved:
             try:
-                import httpx
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-                def _fetch_name(appid):
-                    try:
-                        r = httpx.get(
-                            "https://store.steampowered.com/api/appdetails",
-                            params={"appids": appid, "filters": "basic"},
-                            timeout=10.0,
-                        )
-                        if r.status_code == 200:
-                            info = r.json().get(str(appid), {})
-                            if info.get("success"):
-                                name = info.get("data", {}).get("name", "")
-                                if name:
-                                    return appid, name
-                    except Exception:
-                        pass
-                    return appid, ""
-                with ThreadPoolExecutor(max_workers=5) as pool:
-                    futures = {pool.submit(_fetch_name, a): a for a in still_unresolved}
-                    for future in as_completed(futures):
-                        appid, name = future.result()
-                        if name:
-                            name_map[appid] = name
+                from sff.app_names import get_name_resolver
+                name_map.update(get_name_resolver().resolve_many(still_unresolved))
             except Exception:
                 pass
         results = [
@@ -476,10 +647,13 @@ class CloudSaves:
         game_name: str,
         dest_folder: str,
         log_func=None,
+        progress=None,
     ):
         """
         Copy <Steam>/userdata/<steam32id>/<app_id>/remote/ to
         <dest_folder>/<game_name> [<app_id>]/remote/.
+        progress(files_done, files_total, bytes_done, bytes_total) is
+        called as files are copied.
         Returns the created backup folder path on success, None on failure.
         """
         def log(msg):
@@ -494,17 +668,11 @@ class CloudSaves:
         dest = Path(dest_folder) / f"{safe_name} [{app_id}]" / "remote"
         dest.mkdir(parents=True, exist_ok=True)
         try:
-            file_count = 0
-            total_size = 0
-            for f in src.rglob("*"):
-                if f.is_file():
-                    rel = f.relative_to(src)
-                    target = dest / rel
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(f, target)
-                    file_count += 1
-                    total_size += f.stat().st_size
-            log(f"✓ Backed up {file_count} file(s) ({self._format_size(total_size)}) → {dest}")
+            result = copy_tree(src, dest, progress=progress)
+            if not result.ok:
+                raise OSError(f"{len(result.errors)} file(s) failed, first: {result.errors[0][1]}")
+            self._verify_copy(src, dest)
+            log(f"✓ Backed up {result.file_count} file(s) ({self._format_size(result.total_size)}) → {dest}")
             return str(dest.parent)
         except Exception as e:
             log(f"Backup failed: {e}")
@@ -517,13 +685,20 @@ class CloudSaves:
         steam32_id: str,
         app_id: int,
         log_func=None,
+        progress=None,
     ):
         """
         Copy <backup_folder>/remote/ back to
         <Steam>/userdata/<steam32id>/<app_id>/remote/.
         Automatically creates a safety backup of current saves first.
+        backup_folder may also be a save archive (see export_steam_save).
         Returns True on success.
         """
+        if Path(backup_folder).is_file():
+            return self.import_steam_save(
+                backup_folder, steam_path, steam32_id, app_id,
+                log_func=log_func, progress=progress,
+            )
         def log(msg):
             if log_func:
                 log_func(msg)
@@ -533,31 +708,114 @@ class CloudSaves:
             log(f"Backup remote/ folder not found at {src}")
             return False
         dest = Path(steam_path) / "userdata" / str(steam32_id) / str(app_id) / "remote"
-        # safety backup of current saves
-        if dest.exists():
-            safety_ts = time.strftime("%Y%m%d_%H%M%S")
-            safety = self.backup_dir / str(app_id) / f"pre_restore_{safety_ts}"
-            try:
-                shutil.copytree(dest, safety, dirs_exist_ok=True)
-                log(f"Safety backup of current saves → {safety}")
-            except Exception as e:
-                log(f"Warning: safety backup failed ({e}), proceeding anyway")
+        self._safety_snapshot(app_id, dest, log)
         try:
             dest.mkdir(parents=True, exist_ok=True)
-            restored = 0
-            for f in src.rglob("*"):
-                if f.is_file():
-                    rel = f.relative_to(src)
-                    target = dest / rel
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(f, target)
-                    restored += 1
-            log(f"✓ Restored {restored} file(s) to {dest}")
+            result = copy_tree(src, dest, progress=progress)
+            if not result.ok:
+                raise OSError(f"{len(result.errors)} file(s) failed, first: {result.errors[0][1]}")
+            self._verify_copy(src, dest)
+            log(f"✓ Restored {result.file_count} file(s) to {dest}")
             return True
         except Exception as e:
             log(f"Restore failed: {e}")
             return False
 
+    def export_steam_save(
+        self,
+        steam_path: str,
+        steam32_id: str,
+        app_id: int,
+        game_name: str,
+        dest_folder: str,
+        log_func=None,
+        progress=None,
+    ):
+        """
+        Pack <Steam>/userdata/<steam32id>/<app_id>/remote/ into
+        <dest_folder>/<game_name> [<app_id>].sffsave.zip.
+        progress(files_done, files_total, bytes_done, bytes_total) is
+        called as files are compressed.
+        Returns the archive path on success, None on failure.
+        """
+        def log(msg):
+            if log_func:
+                log_func(msg)
+            logger.info(msg)
+        src = Path(steam_path) / "userdata" / str(steam32_id) / str(app_id) / "remote"
+        if not src.exists():
+            log(f"No remote/ folder found at {src}")
+            return None
+        safe_name = "".join(c if c not in r'\/:*?"<>|' else "_" for c in game_name)
+        archive = Path(dest_folder) / f"{safe_name} [{app_id}]{ARCHIVE_SUFFIX}"
+        try:
+            archive.parent.mkdir(parents=True, exist_ok=True)
+            manifest = export_archive(src, archive, app_id, game_name, progress=progress)
+            total = sum(f["size"] for f in manifest["files"].values())
+            log(
+                f"✓ Exported {len(manifest['files'])} file(s) ({self._format_size(total)}, "
+                f"{self._format_size(archive.stat().st_size)} compressed) → {archive}"
+            )
+            return str(archive)
+        except Exception as e:
+            log(f"Export failed: {e}")
+            return None
+
+    def import_steam_save(
+        self,
+        archive: str,
+        steam_path: str,
+        steam32_id: str,
+        app_id: int,
+        members=None,
+        log_func=None,
+        progress=None,
+    ):
+        """
+        Extract a save archive into <Steam>/userdata/<steam32id>/<app_id>/remote/.
+        members restricts it to some files (paths relative to remote/).
+        Automatically creates a safety backup of current saves first.
+        Returns True on success.
+        """
+        def log(msg):
+            if log_func:
+                log_func(msg)
+            logger.info(msg)
+        try:
+            manifest = read_manifest(archive)
+        except Exception as e:
+            log(f"Not a valid save archive: {e}")
+            return False
+        if manifest.get("app_id") not in (None, app_id):
+            log(f"Warning: archive is for app {manifest['app_id']}, importing into {app_id}")
+        dest = Path(steam_path) / "userdata" / str(steam32_id) / str(app_id) / "remote"
+        self._safety_snapshot(app_id, dest, log)
+        try:
+            count = import_archive(archive, dest, members=members, progress=progress)
+            log(f"✓ Restored {count} file(s) to {dest}")
+            return True
+        except Exception as e:
+            log(f"Import failed: {e}")
+            return False
+
+    @staticmethod
+    def _verify_copy(src, dest):
+        """raise if any file copied from src differs from its copy under dest"""
+        pairs = [(e.path, Path(dest) / e.rel) for e in scan_tree(src)]
+        failed = IntegrityVerifier.verify_copies(pairs)
+        if failed:
+            raise OSError(f"{len(failed)} file(s) failed verification after copying, first: {failed[0]}")
+
+    def _safety_snapshot(self, app_id, dest, log):
+        if not dest.exists():
+            return
+        try:
+            safety, _ = self._take_snapshot(app_id, dest, "", "pre_restore")
+            log(f"Safety backup of current saves → {safety.backup_path}")
+            self._apply_retention(app_id)
+        except Exception as e:
+            log(f"Warning: safety backup failed ({e}), proceeding anyway")
+
     @staticmethod
     def _format_size(size_bytes):
         for unit in ["B", "KB", "MB", "GB"]:
@@ -16,13 +16,27 @@
 # You should have received a copy of the GNU General Public License
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
-"""Download manager — queue, retry, and persistent history (500 cap)."""
+"""
+Download manager — prioritized queue, concurrent slots, retry, and
+persistent history (500 cap).
+
+Queued items sit in a heap ordered by priority (higher first), then by a
+per-host round number so hosts take turns at equal priority, then by
+arrival. Up to max_concurrent items download at once, and at most
+per_host_limit of them from the same host. Items can be re-prioritized,
+paused and resumed while queued, and cancelled or retried one at a time.
+Callbacks run on the download threads, one at a time and never while the
+manager's lock is held, so they may call back into the manager.
+"""
 
 import os
+import heapq
+import itertools
 import json
 import time
 import logging
 import threading
+from collections import defaultdict
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from enum import Enum
@@ -30,15 +44,23 @@ from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT = 3
+PER_HOST_LIMIT = 2
+
 
 class DownloadStatus(Enum):
     QUEUED = "queued"
     ACTIVE = "active"
+    PAUSED = "paused"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
 
 
+class DownloadCancelled(Exception):
+    """raised by the progress callback once the download has been cancelled"""
+
+
 class DownloadMode(Enum):
     GREENLUMA = "GreenLuma"
 
@@ -58,6 +80,9 @@ class DownloadItem:
     completed_at: float = 0.0
     retry_count: int = 0
     max_retries: int = 3
+    priority: int = 0  # higher runs first
+    host: str = ""  # for per-host limits; "" means no limit
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
 
 
 @dataclass
@@ -87,6 +112,8 @@ class DownloadHistory:
     def __init__(self):
         self._path = self._get_history_path()
         self._entries: list[HistoryEntry] = []
+        # downloads finish on several threads
+        self._lock = threading.Lock()
         self._load()
 
     @staticmethod
@@ -113,34 +140,55 @@ class DownloadHistory:
             logger.error("Failed to save download history: %s", e)
 
     def add(self, entry):
-        self._entries.append(entry)
-        while len(self._entries) > self.MAX_ENTRIES:
-            self._entries.pop(0)
-        self._save()
+        with self._lock:
+            self._entries.append(entry)
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.pop(0)
+            self._save()
 
     def get_all(self):
-        return list(self._entries)
+        with self._lock:
+            return list(self._entries)
 
     def clear(self):
-        self._entries.clear()
-        self._save()
+        with self._lock:
+            self._entries.clear()
+            self._save()
 
     @property
     def count(self):
         return len(self._entries)
 
 
-class DownloadManager:
-    """Queue-based download manager with retry and persistent history."""
+def _remove(items, item):
+    """list.remove by identity; DownloadItems with equal fields aren't the same download"""
+    for i, other in enumerate(items):
+        if other is item:
+            del items[i]
+            return
 
-    def __init__(self):
-        self._queue: list[DownloadItem] = []
-        self._active: Optional[DownloadItem] = None
+
+class DownloadManager:
+    """Prioritized, concurrent download queue with retry and persistent history."""
+
+    def __init__(self, max_concurrent = MAX_CONCURRENT, per_host_limit = PER_HOST_LIMIT):
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_host_limit = max(1, per_host_limit)
+        # heap of (-priority, host round, seq); _pending maps seq -> item,
+        # entries whose seq is gone (cancelled, paused, re-prioritized) are skipped
+        self._heap: list[tuple[int, int, int]] = []
+        self._pending: dict[int, DownloadItem] = {}
+        self._seq = itertools.count()
+        self._host_active: dict[str, int] = defaultdict(int)
+        self._paused: list[DownloadItem] = []
+        self._queue_paused = False
+        self._running: list[DownloadItem] = []
+        self._external: list[DownloadItem] = []
         self._completed: list[DownloadItem] = []
         self._failed: list[DownloadItem] = []
         self._lock = threading.Lock()
-        self._cancel_event = threading.Event()
-        self._worker_thread: Optional[threading.Thread] = None
+        # callbacks are delivered one at a time, in the order they happen
+        self._callback_lock = threading.RLock()
         self.history = DownloadHistory()
         # callbacks
         self.on_progress: Optional[Callable[[DownloadItem], None]] = None
@@ -148,6 +196,15 @@ class DownloadManager:
         self.on_failed: Optional[Callable[[DownloadItem], None]] = None
         self.on_queue_changed: Optional[Callable[[], None]] = None
 
+    def _emit(self, callback, *args):
+        if callback is None:
+            return
+        with self._callback_lock:
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error("Download manager callback failed: %s", e, exc_info=True)
+
     def queue_download(
         self,
         app_id: int,
@@ -155,117 +212,145 @@ class DownloadManager:
         dest_path: str,
         mode = DownloadMode.GREENLUMA,
         download_func = None,
+        priority = 0,
+        host = "",
     ):
-        # download_func(app_id, dest_path, progress_callback) -> bool
+        # download_func(app_id, dest_path, progress_callback) -> bool.
+        # progress_callback(current, total) raises DownloadCancelled after
+        # cancel_download(); progress_callback.cancelled() can be polled too.
         item = DownloadItem(
             app_id=app_id,
             game_name=game_name,
             dest_path=dest_path,
             mode=mode,
+            priority=priority,
+            host=host,
         )
         item._download_func = download_func
         with self._lock:
-            self._queue.append(item)
-        if self.on_queue_changed:
-            self.on_queue_changed()
-        self._start_worker()
+            self._push(item, new_round=True)
+        self._emit(self.on_queue_changed)
+        self._dispatch()
         return item
 
-    def cancel_download(self, app_id):
-        with self._lock:
-            # remove from queue
-            self._queue = [d for d in self._queue if d.app_id != app_id]
-            # cancel active
-            if self._active and self._active.app_id == app_id:
-                self._cancel_event.set()
-                self._active.status = DownloadStatus.CANCELLED
-        if self.on_queue_changed:
-            self.on_queue_changed()
-
-    def retry_download(self, app_id):
+    def _push(self, item, new_round = False):
+        """queue item; called with the lock held"""
+        if new_round or not hasattr(item, "_round"):
+            # round n when the host already has n items queued or running, so at
+            # equal priority hosts alternate; finished downloads don't count
+            queued = sum(1 for i in self._pending.values() if i.host == item.host)
+            item._round = self._host_active[item.host] + queued
+        item.status = DownloadStatus.QUEUED
+        seq = next(self._seq)
+        item._seq = seq
+        self._pending[seq] = item
+        heapq.heappush(self._heap, (-item.priority, item._round, seq))
+
+    def _unqueue(self, item):
+        """called with the lock held; the heap entry goes stale"""
+        self._pending.pop(getattr(item, "_seq", None), None)
+
+    def _pending_items(self, app_id = None):
+        return [i for i in self._pending.values() if app_id is None or i.app_id == app_id]
+
+    # --- scheduling ---
+
+    def _dispatch(self):
+        """start queued items while slots are free"""
+        started = []
         with self._lock:
-            for i, item in enumerate(self._failed):
-                if item.app_id == app_id:
-                    item.status = DownloadStatus.QUEUED
-                    item.error = ""
-                    item.retry_count = 0
-                    self._queue.append(item)
-                    self._failed.pop(i)
-                    break
-        self._start_worker()
-        if self.on_queue_changed:
-            self.on_queue_changed()
-
-    def _start_worker(self):
-        if self._worker_thread and self._worker_thread.is_alive():
-            return
-        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-        self._worker_thread.start()
-
-    def _worker_loop(self):
-        while True:
-            with self._lock:
-                if not self._queue:
-                    self._active = None
-                    return
-                item = self._queue.pop(0)
-                self._active = item
-            self._cancel_event.clear()
-            item.status = DownloadStatus.ACTIVE
-            item.started_at = time.time()
-            if self.on_queue_changed:
-                self.on_queue_changed()
+            skipped = []
+            while (
+                not self._queue_paused
+                and len(self._running) < self.max_concurrent
+                and self._heap
+            ):
+                entry = heapq.heappop(self._heap)
+                item = self._pending.get(entry[2])
+                if item is None:
+                    continue
+                if item.host and self._host_active[item.host] >= self.per_host_limit:
+                    skipped.append(entry)
+                    continue
+                del self._pending[entry[2]]
+                item._cancel_event.clear()
+                item.status = DownloadStatus.ACTIVE
+                item.started_at = time.time()
+                self._running.append(item)
+                self._host_active[item.host] += 1
+                started.append(item)
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+        for item in started:
+            threading.Thread(
+                target=self._run_item, args=(item,), name=f"download-{item.app_id}", daemon=True,
+            ).start()
+        if started:
+            self._emit(self.on_queue_changed)
+
+    def _run_item(self, item):
+        try:
             success = self._execute_download(item)
+        except Exception as e:
+            item.error = str(e)
+            success = False
+        with self._lock:
+            _remove(self._running, item)
+            self._host_active[item.host] -= 1
+            # cancelled while active: whatever download_func returned, it isn't a completion
+            if item.status == DownloadStatus.CANCELLED or item._cancel_event.is_set():
+                item.status = DownloadStatus.CANCELLED
+                success = False
             if success:
                 item.status = DownloadStatus.COMPLETED
                 item.completed_at = time.time()
                 item.progress = 100
-                with self._lock:
-                    self._completed.append(item)
-                self.history.add(HistoryEntry(
-                    app_id=item.app_id,
-                    game_name=item.game_name,
-                    status="completed",
-                    mode=item.mode.value,
-                    size=item.total_bytes,
-                    dest_path=item.dest_path,
-                    timestamp=item.completed_at,
-                ))
-                if self.on_completed:
-                    self.on_completed(item)
-            else:
-                if item.status != DownloadStatus.CANCELLED:
-                    item.status = DownloadStatus.FAILED
-                    item.completed_at = time.time()
-                    with self._lock:
-                        self._failed.append(item)
-                    self.history.add(HistoryEntry(
-                        app_id=item.app_id,
-                        game_name=item.game_name,
-                        status="failed",
-                        mode=item.mode.value,
-                        error=item.error,
-                        timestamp=item.completed_at,
-                    ))
-                    if self.on_failed:
-                        self.on_failed(item)
-            if self.on_queue_changed:
-                self.on_queue_changed()
+                self._completed.append(item)
+            elif item.status != DownloadStatus.CANCELLED:
+                item.status = DownloadStatus.FAILED
+                item.completed_at = time.time()
+                self._failed.append(item)
+        if success:
+            self.history.add(HistoryEntry(
+                app_id=item.app_id,
+                game_name=item.game_name,
+                status="completed",
+                mode=item.mode.value,
+                size=item.total_bytes,
+                dest_path=item.dest_path,
+                timestamp=item.completed_at,
+            ))
+            self._emit(self.on_completed, item)
+        elif item.status == DownloadStatus.FAILED:
+            self.history.add(HistoryEntry(
+                app_id=item.app_id,
+                game_name=item.game_name,
+                status="failed",
+                mode=item.mode.value,
+                error=item.error,
+                timestamp=item.completed_at,
+            ))
+            self._emit(self.on_failed, item)
+        self._emit(self.on_queue_changed)
+        self._dispatch()
 
     def _execute_download(self, item):
+        cancel = item._cancel_event
         backoff = 2
         for attempt in range(item.max_retries + 1):
-            if self._cancel_event.is_set():
+            if cancel.is_set():
                 return False
             try:
                 if hasattr(item, '_download_func') and item._download_func:
                     def progress_cb(current, total):
+                        if cancel.is_set():
+                            raise DownloadCancelled()
                         item.downloaded_bytes = current
                         item.total_bytes = total
                         if total > 0:
                             item.progress = int((current / total) * 100)
-                        if self.on_progress:
-                            self.on_progress(item)
+                        self._emit(self.on_progress, item)
+                    progress_cb.cancelled = cancel.is_set
                     result = item._download_func(item.app_id, item.dest_path, progress_cb)
                     if result:
                         return True
@@ -274,6 +359,8 @@ class DownloadManager:
                 else:
                     item.error = "No download function provided"
                     return False
+            except DownloadCancelled:
+                return False
             except Exception as e:
                 item.error = str(e)
                 logger.warning(
@@ -283,21 +370,112 @@ class DownloadManager:
             item.retry_count = attempt + 1
             if attempt < item.max_retries:
                 logger.info("Retrying in %ds...", backoff)
-                for _ in range(backoff * 10):
-                    if self._cancel_event.is_set():
-                        return False
-                    time.sleep(0.1)
+                if cancel.wait(backoff):
+                    return False
                 backoff *= 2
         return False
 
+    # --- per-item control ---
+
+    def cancel_download(self, app_id):
+        with self._lock:
+            for item in self._pending_items(app_id):
+                self._unqueue(item)
+                item.status = DownloadStatus.CANCELLED
+            for item in [i for i in self._paused if i.app_id == app_id]:
+                _remove(self._paused, item)
+                item.status = DownloadStatus.CANCELLED
+            # active downloads stop at the next attempt or retry wait
+            for item in self._running:
+                if item.app_id == app_id:
+                    item.status = DownloadStatus.CANCELLED
+                    item._cancel_event.set()
+        self._emit(self.on_queue_changed)
+
+    def retry_download(self, app_id):
+        with self._lock:
+            for item in [i for i in self._failed if i.app_id == app_id]:
+                _remove(self._failed, item)
+                item.error = ""
+                item.retry_count = 0
+                item.progress = 0
+                self._push(item, new_round=True)
+        self._emit(self.on_queue_changed)
+        self._dispatch()
+
+    def set_priority(self, app_id, priority):
+        """re-prioritize queued (or paused) downloads of app_id"""
+        with self._lock:
+            for item in self._pending_items(app_id):
+                self._unqueue(item)
+                item.priority = priority
+                self._push(item)
+            for item in self._paused:
+                if item.app_id == app_id:
+                    item.priority = priority
+        self._emit(self.on_queue_changed)
+        self._dispatch()
+
+    def move_to_top(self, app_id):
+        with self._lock:
+            top = max((i.priority for i in self._pending.values()), default=0)
+        self.set_priority(app_id, top + 1)
+
+    def pause_download(self, app_id):
+        """keep a queued download from starting until resume_download()"""
+        with self._lock:
+            for item in self._pending_items(app_id):
+                self._unqueue(item)
+                item.status = DownloadStatus.PAUSED
+                self._paused.append(item)
+        self._emit(self.on_queue_changed)
+
+    def resume_download(self, app_id):
+        with self._lock:
+            for item in [i for i in self._paused if i.app_id == app_id]:
+                _remove(self._paused, item)
+                self._push(item)
+        self._emit(self.on_queue_changed)
+        self._dispatch()
+
+    def pause_queue(self):
+        """stop starting new downloads; active ones finish"""
+        with self._lock:
+            self._queue_paused = True
+        self._emit(self.on_queue_changed)
+
+    def resume_queue(self):
+        with self._lock:
+            self._queue_paused = False
+        self._emit(self.on_queue_changed)
+        self._dispatch()
+
+    @property
+    def queue_paused(self):
+        return self._queue_paused
+
+    def set_max_concurrent(self, max_concurrent):
+        with self._lock:
+            self.max_concurrent = max(1, max_concurrent)
+        self._dispatch()
+
     # --- status queries ---
 
     def get_queue(self):
+        """queued downloads in the order they'll start, then paused ones"""
         with self._lock:
-            return list(self._queue)
+            queued = sorted(self._pending.values(), key=lambda i: (-i.priority, i._round, i._seq))
+            return queued + list(self._paused)
 
     def get_active(self):
-        return self._active
+        """the earliest started active download (see get_active_all)"""
+        with self._lock:
+            active = self._running + self._external
+        return min(active, key=lambda i: i.started_at) if active else None
+
+    def get_active_all(self):
+        with self._lock:
+            return sorted(self._running + self._external, key=lambda i: i.started_at)
 
     def get_completed(self):
         with self._lock:
@@ -309,19 +487,18 @@ class DownloadManager:
 
     @property
     def active_count(self):
-        return (1 if self._active else 0) + len(self._queue)
+        with self._lock:
+            return len(self._running) + len(self._external) + len(self._pending) + len(self._paused)
 
     def clear_completed(self):
         with self._lock:
             self._completed.clear()
-        if self.on_queue_changed:
-            self.on_queue_changed()
+        self._emit(self.on_queue_changed)
 
     def clear_failed(self):
         with self._lock:
             self._failed.clear()
-        if self.on_queue_changed:
-            self.on_queue_changed()
+        self._emit(self.on_queue_changed)
 
     # --- external tracking (for flows that manage their own download) ---
 
@@ -336,9 +513,8 @@ class DownloadManager:
             started_at=time.time(),
         )
         with self._lock:
-            self._active = item
-        if self.on_queue_changed:
-            self.on_queue_changed()
+            self._external.append(item)
+        self._emit(self.on_queue_changed)
         return item
 
     def complete_external(self, item, success = True, error = ""):
@@ -348,8 +524,7 @@ class DownloadManager:
             item.progress = 100
             with self._lock:
                 self._completed.append(item)
-                if self._active is item:
-                    self._active = None
+                _remove(self._external, item)
             self.history.add(HistoryEntry(
                 app_id=item.app_id,
                 game_name=item.game_name,
@@ -359,15 +534,13 @@ class DownloadManager:
                 dest_path=item.dest_path,
                 timestamp=item.completed_at,
             ))
-            if self.on_completed:
-                self.on_completed(item)
+            self._emit(self.on_completed, item)
         else:
             item.status = DownloadStatus.FAILED
             item.error = error
             with self._lock:
                 self._failed.append(item)
-                if self._active is item:
-                    self._active = None
+                _remove(self._external, item)
             self.history.add(HistoryEntry(
                 app_id=item.app_id,
                 game_name=item.game_name,
@@ -376,7 +549,5 @@ class DownloadManager:
                 error=error,
                 timestamp=item.completed_at,
             ))
-            if self.on_failed:
-                self.on_failed(item)
-        if self.on_queue_changed:
-            self.on_queue_changed()
+            self._emit(self.on_failed, item)
+        self._emit(self.on_queue_changed)
@@ -0,0 +1,202 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Parallel file copying for save backups.
+
+scan_tree() walks a folder with os.scandir and keeps the size/mtime from
+the directory entries, so nothing is stat'ed twice. copy_tree() copies the
+files on a small thread pool and recreates empty folders, like
+shutil.copytree; each copy goes through copy_file_range
+(reflinks on btrfs/XFS), then sendfile, then shutil's buffered copy,
+whichever the platform has.
+"""
+
+import errno
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Copies are mostly waiting on the disk, so a few more threads than cores
+MAX_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+_KERNEL_COPY_CHUNK = 64 * 1024 * 1024
+
+
+@dataclass
+class FileEntry:
+    rel: str  # POSIX-style path relative to the scanned root
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class CopyResult:
+    file_count: int = 0
+    total_size: int = 0
+    errors: list = field(default_factory=list)  # [(path, error message)]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def _scan(root, follow_symlinks):
+    """(files as FileEntry, relative paths of every sub-folder) under root"""
+    root = Path(root)
+    if root.is_file():
+        st = root.stat()
+        return [FileEntry(root.name, root, st.st_size, st.st_mtime_ns)], []
+    entries, folders = [], []
+    stack = [(root, "")]
+    # followed links can loop back up the tree
+    seen = set()
+    if follow_symlinks:
+        st = root.stat()
+        seen.add((st.st_dev, st.st_ino))
+    while stack:
+        folder, prefix = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    rel = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False) or (
+                        follow_symlinks and entry.is_symlink() and entry.is_dir()
+                    ):
+                        if follow_symlinks:
+                            st = os.stat(entry.path)
+                            if (st.st_dev, st.st_ino) in seen:
+                                continue
+                            seen.add((st.st_dev, st.st_ino))
+                        folders.append(rel)
+                        stack.append((Path(entry.path), rel + "/"))
+                    elif entry.is_file():
+                        st = entry.stat()
+                        entries.append(FileEntry(rel, Path(entry.path), st.st_size, st.st_mtime_ns))
+        except PermissionError as e:
+            logger.warning(f"Skipping unreadable folder {folder}: {e}")
+    return entries, folders
+
+
+def scan_tree(root):
+    """every file under root (or root itself if it's a file), as FileEntry"""
+    return _scan(root, follow_symlinks=False)[0]
+
+
+def scan_folder(root):
+    """
+    (files, folders) the way shutil.copytree sees root: symlinked folders
+    are followed, and folders holds every sub-folder's relative path so
+    empty ones can be recreated
+    """
+    return _scan(root, follow_symlinks=True)
+
+
+def _kernel_copy(fsrc, fdst, size):
+    """
+    copy_file_range, then sendfile; False if neither works here. size is
+    only a hint: copying goes on until EOF, so a file that grew since it
+    was scanned is copied whole.
+    """
+    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+    blocksize = min(max(size, 1024 * 1024), _KERNEL_COPY_CHUNK)
+    for name in ("copy_file_range", "sendfile"):
+        func = getattr(os, name, None)
+        if func is None:
+            continue
+        offset = 0
+        try:
+            while True:
+                if name == "copy_file_range":
+                    sent = func(src_fd, dst_fd, blocksize)
+                else:
+                    sent = func(dst_fd, src_fd, offset, blocksize)
+                if sent == 0:
+                    break
+                offset += sent
+            return True
+        except OSError as e:
+            # unsupported between these filesystems: try the next method from the start
+            if offset or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EBADF):
+                raise
+    return False
+
+
+def copy_file(src, dst, size = None):
+    """shutil.copy2 replacement: contents + timestamps/permissions"""
+    if size is None:
+        size = os.stat(src).st_size
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if not (size and _kernel_copy(fsrc, fdst, size)):
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    shutil.copystat(src, dst)
+
+
+def copy_entries(entries, dst_root, progress = None, workers = None, folders = ()):
+    """
+    Copy scanned entries to dst_root/<rel>, and create dst_root/<folder> for
+    each of folders (relative paths, e.g. from scan_folder). progress(files_done,
+    files_total, bytes_done, bytes_total) is called from worker threads, one at a time.
+    """
+    dst_root = Path(dst_root)
+    dst_root.mkdir(parents=True, exist_ok=True)
+    result = CopyResult()
+    total_files = len(entries)
+    total_bytes = sum(e.size for e in entries)
+    # create folders up front so workers don't race on makedirs
+    for folder in {(dst_root / e.rel).parent for e in entries} | {dst_root / f for f in folders}:
+        folder.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+
+    def _copy(entry):
+        try:
+            copy_file(entry.path, dst_root / entry.rel, entry.size)
+        except OSError as e:
+            with lock:
+                result.errors.append((str(entry.path), str(e)))
+            logger.warning(f"Failed to copy {entry.path}: {e}")
+            return
+        with lock:
+            result.file_count += 1
+            result.total_size += entry.size
+            if progress:
+                progress(result.file_count, total_files, result.total_size, total_bytes)
+
+    if len(entries) <= 1:
+        for entry in entries:
+            _copy(entry)
+        return result
+    with ThreadPoolExecutor(max_workers=min(workers or MAX_WORKERS, len(entries))) as pool:
+        # list() so a worker exception isn't swallowed
+        list(pool.map(_copy, entries))
+    return result
+
+
+def copy_tree(src, dst, progress = None, workers = None):
+    """
+    copy a folder into dst (merging with what's there), empty and symlinked
+    sub-folders included like shutil.copytree, or a single file into dst/
+    """
+    files, folders = scan_folder(src)
+    return copy_entries(files, dst, progress=progress, workers=workers, folders=folders)
@@ -41,8 +41,7 @@ import logging
 import shutil
 from pathlib import Path
 
-import httpx
-
+from sff.http_client import PooledSession
 from sff.steam_store import get_dlc_list_from_store, get_dlc_names_from_store
 
 logger = logging.getLogger(__name__)
@@ -625,7 +624,7 @@ Stats_Pos_y=0.0
         url = (f"{STEAM_WEB_API_URL}/ISteamUserStats/GetSchemaForGame/v2/"
                f"?key={self.steam_web_api_key}&appid={app_id}&l=english")
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with PooledSession(timeout=30.0) as client:
                 resp = client.get(url)
                 resp.raise_for_status()
                 data = resp.json()
@@ -650,7 +649,7 @@ Stats_Pos_y=0.0
     def _fetch_languages(self, app_id, settings_dir, log):
         """fetch supported languages from SteamCMD API"""
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(f"{STEAMCMD_API_URL}/{app_id}")
                 resp.raise_for_status()
                 data = resp.json()
@@ -674,7 +673,7 @@ Stats_Pos_y=0.0
     def _fetch_depots(self, app_id, settings_dir, log):
         """fetch depot IDs from SteamCMD API"""
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(f"{STEAMCMD_API_URL}/{app_id}")
                 resp.raise_for_status()
                 data = resp.json()
@@ -702,7 +701,7 @@ Stats_Pos_y=0.0
         # --- Source 1: SteamCMD API (GBE/GSE-identical two-pass DLC collection) ---
         try:
             log(f"  DLC: trying SteamCMD API for {app_id}...")
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(f"{STEAMCMD_API_URL}/{app_id}")
                 resp.raise_for_status()
                 data = resp.json()
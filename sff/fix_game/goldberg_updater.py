@@ -30,7 +30,7 @@ import io
 import logging
 from pathlib import Path
 
-import httpx
+from sff.http_client import PooledSession
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +90,7 @@ class GoldbergUpdater:
         Returns (tag_name, download_url) or None on failure.
         """
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(RELEASES_URL, headers={
                     "Accept": "application/vnd.github.v3+json",
                     "User-Agent": "SteaMidra/1.0",
@@ -198,7 +198,7 @@ class GoldbergUpdater:
         """download the 7z archive and extract needed files"""
         try:
             # download the archive
-            with httpx.Client(timeout=120.0, follow_redirects=True) as client:
+            with PooledSession(timeout=120.0, follow_redirects=True) as client:
                 resp = client.get(url)
                 resp.raise_for_status()
                 archive_data = resp.content
@@ -288,13 +288,12 @@ class GoldbergUpdater:
 
     def _download_7zr(self, log):
         """download standalone 7zr.exe to cache_dir and return its path, or "" on failure"""
-        import httpx
         dest = self.cache_dir / "7zr.exe"
         if dest.exists():
             return str(dest)
         try:
             log("No local archive extractor found — downloading 7zr.exe (~1 MB) as fallback...")
-            with httpx.Client(timeout=60.0, follow_redirects=True) as client:
+            with PooledSession(timeout=60.0, follow_redirects=True) as client:
                 resp = client.get(self._7ZR_URL)
                 resp.raise_for_status()
                 dest.write_bytes(resp.content)
@@ -34,7 +34,7 @@ import shutil
 import zipfile
 from pathlib import Path
 
-import httpx
+from sff.http_client import PooledSession
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +75,7 @@ class GseToolUpdater:
         Returns (tag_name, zip_download_url) or None.
         """
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(
                     RELEASES_URL,
                     headers={
@@ -155,7 +155,7 @@ class GseToolUpdater:
 
     def _download_and_extract(self, tag, url, log):
         try:
-            with httpx.Client(timeout=120.0, follow_redirects=True) as client:
+            with PooledSession(timeout=120.0, follow_redirects=True) as client:
                 resp = client.get(url)
                 resp.raise_for_status()
                 archive_data = resp.content
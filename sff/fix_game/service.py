@@ -38,13 +38,12 @@ import logging
 from pathlib import Path
 from enum import Enum
 
-import httpx
-
 from sff.fix_game.cache import FixGameCache
 from sff.fix_game.goldberg_updater import GoldbergUpdater
 from sff.fix_game.config_generator import GoldbergConfigGenerator
 from sff.fix_game.steamstub_unpacker import SteamStubUnpacker
 from sff.fix_game.goldberg_applier import GoldbergApplier
+from sff.http_client import PooledSession
 
 logger = logging.getLogger(__name__)
 
@@ -281,7 +280,7 @@ class FixGameService:
                 log_func(msg)
             logger.info(msg)
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(
                     f"{STEAM_STORE_API}/appdetails",
                     params={"appids": str(app_id)},
@@ -436,10 +435,11 @@ class FixGameService:
             env["GSE_CFG_PASSWORD"] = password
             log(f"GSE Fork: login as {username}")
             try:
-                from sff.storage.settings import set_setting
+                from sff.storage.settings import set_setting, settings_transaction
                 from sff.structs import Settings
-                set_setting(Settings.STEAM_USER, username)
-                set_setting(Settings.STEAM_PASS, password)
+                with settings_transaction():
+                    set_setting(Settings.STEAM_USER, username)
+                    set_setting(Settings.STEAM_PASS, password)
             except Exception:
                 pass
         else:
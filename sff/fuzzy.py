@@ -0,0 +1,218 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+In-process fuzzy search over game titles (replaces piping to fzf).
+
+Titles are indexed by character trigrams. A query is scored by how many of
+its trigrams each title shares, then the best candidates are re-ranked with
+substring / word-prefix bonuses and a length penalty. While the user types,
+FuzzyIndex.search reuses the trigram counts of the previous query when the
+new one just extends it.
+"""
+
+import logging
+import re
+import threading
+from array import array
+from collections import Counter
+from heapq import nlargest
+
+logger = logging.getLogger(__name__)
+
+# How many trigram-ranked candidates get the finer scoring pass
+RERANK_POOL = 300
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _normalize(text):
+    return " " + _NON_WORD.sub(" ", text.lower()).strip() + " "
+
+
+def _trigrams(normalized):
+    return [normalized[i : i + 3] for i in range(len(normalized) - 2)]
+
+
+class FuzzyIndex:
+    """
+    Trigram index over a list of titles. keys[i] is returned for titles[i]
+    (e.g. the app ID).
+    """
+
+    def __init__(self, keys, titles):
+        self.keys = keys
+        self.titles = titles
+        self._normalized = [_normalize(t) for t in titles]
+        postings: dict[str, array] = {}
+        for i, norm in enumerate(self._normalized):
+            for gram in set(_trigrams(norm)):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    bucket = postings[gram] = array("I")
+                bucket.append(i)
+        self._postings = postings
+        self._lock = threading.Lock()
+        # trigrams and counts of the last query, for as-you-type refinement
+        self._last_grams: set[str] = set()
+        self._last_counts: Counter = Counter()
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _counts(self, grams):
+        """title index -> number of distinct query trigrams it shares"""
+        # the last trigram ends in the trailing pad ("al " in " portal "), which
+        # goes away as soon as the user types another character; keep it out of
+        # the reusable counts so "port" -> "portal" still extends them
+        wanted = set(grams[:-1])
+        tail = grams[-1] if grams[-1] not in wanted else None
+        with self._lock:
+            last_grams, last_counts = self._last_grams, self._last_counts
+        if last_grams and last_grams <= wanted:
+            # the new query only adds trigrams: extend the previous counts
+            counts = last_counts.copy()
+            extra = wanted - last_grams
+        else:
+            counts = Counter()
+            extra = wanted
+        for gram in extra:
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                counts.update(bucket)
+        with self._lock:
+            self._last_grams, self._last_counts = wanted, counts
+        bucket = self._postings.get(tail) if tail is not None else None
+        if bucket is not None:
+            counts = counts.copy()
+            counts.update(bucket)
+        return counts
+
+    def _score(self, i, query, words, shared, total):
+        norm = self._normalized[i]
+        score = shared / total
+        pos = norm.find(query)
+        if pos != -1:
+            score += 1.0
+            if pos == 0:
+                score += 0.5
+        score += 0.2 * sum(1 for w in words if (" " + w) in norm)
+        # prefer "Portal" over "Portal 2 - Soundtrack" for the same hits
+        score -= 0.002 * len(norm)
+        return score
+
+    def _search_short(self, query, limit):
+        """
+        One or two characters: too short for trigrams, so take titles that
+        start with the query (shortest first), topped up with word prefixes.
+        """
+        title_start = " " + query
+        hits = []
+        for i, norm in enumerate(self._normalized):
+            if norm.startswith(title_start):
+                hits.append(i)
+                if len(hits) >= RERANK_POOL:
+                    break
+        hits.sort(key=lambda i: len(self._normalized[i]))
+        if len(hits) < limit:
+            seen = set(hits)
+            for i, norm in enumerate(self._normalized):
+                if i not in seen and title_start in norm:
+                    hits.append(i)
+                    if len(hits) >= limit:
+                        break
+        return [(self.keys[i], self.titles[i]) for i in hits[:limit]]
+
+    def search(self, query, limit = 20):
+        """[(key, title)] best matches first"""
+        norm_query = _normalize(query)
+        words = norm_query.split()
+        if not words:
+            return []
+        grams = _trigrams(norm_query)
+        stripped = norm_query.strip()
+        if len(stripped) < 3:
+            return self._search_short(stripped, limit)
+        counts = self._counts(grams)
+        total = len(grams)
+        # need at least half the trigrams to be a plausible match
+        floor = max(1, total // 2)
+        pool = nlargest(RERANK_POOL, (item for item in counts.items() if item[1] >= floor),
+                        key=lambda item: item[1])
+        ranked = nlargest(
+            limit, pool, key=lambda item: self._score(item[0], stripped, words, item[1], total)
+        )
+        return [(self.keys[i], self.titles[i]) for i, _ in ranked]
+
+
+_catalog_index = None
+_catalog_index_stamp = None
+_catalog_index_lock = threading.Lock()
+
+
+def get_catalog_index():
+    """FuzzyIndex over the local app catalog (None if there's no catalog)"""
+    global _catalog_index, _catalog_index_stamp
+    from sff.storage.app_catalog import get_app_catalog
+
+    catalog = get_app_catalog()
+    if catalog is None:
+        return None
+    with _catalog_index_lock:
+        if _catalog_index is None or _catalog_index_stamp != catalog.mtime_ns:
+            keys, titles = [], []
+            for app_id, name in catalog.iter_entries():
+                keys.append(app_id)
+                titles.append(name)
+            _catalog_index = FuzzyIndex(keys, titles)
+            _catalog_index_stamp = catalog.mtime_ns
+            logger.debug(f"Built fuzzy index over {len(titles)} titles")
+        return _catalog_index
+
+
+def warm_catalog_index():
+    """build the catalog index in the background while the user is busy"""
+    threading.Thread(target=get_catalog_index, name="fuzzy-index", daemon=True).start()
+
+
+def _benchmark():
+    """python -m sff.fuzzy — build time and per-keystroke latency over 160k titles"""
+    import random
+    import string
+    import time
+
+    rnd = random.Random(0)
+    words = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9))) for _ in range(8000)]
+    titles = [" ".join(rnd.choices(words, k=rnd.randint(1, 5))).title() for _ in range(160_000)]
+    titles[1234] = "Portal 2"
+    start = time.perf_counter()
+    index = FuzzyIndex(list(range(len(titles))), titles)
+    print(f"index build: {time.perf_counter() - start:.2f}s for {len(titles)} titles")
+    typed = "portal 2"
+    for n in range(1, len(typed) + 1):
+        start = time.perf_counter()
+        results = index.search(typed[:n], limit=10)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{typed[:n]!r:>12}: {elapsed:6.1f} ms  top={results[0][1] if results else None}")
+    for query in ("protal", "portl 2", words[0] + " " + words[1]):
+        start = time.perf_counter()
+        results = index.search(query, limit=3)
+        print(f"{query!r:>12}: {(time.perf_counter() - start) * 1000:6.1f} ms  {results}")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -53,7 +53,9 @@ from sff.prompts import (
 )
 
 from sff.steam_client import SteamInfoProvider, get_product_info
+from sff.steam_library import get_library_service
 from sff.steam_store import get_app_details_from_store
+from sff.storage.library_index import get_library_index
 from sff.storage.settings import get_setting, set_setting
 from sff.storage.vdf import vdf_load
 from sff.structs import (
@@ -98,69 +100,33 @@ class GameHandler:
         seen_app_ids = set()
         # Get all Steam libraries (including from all drives)
         try:
-            from sff.storage.vdf import get_steam_libs
-            steam_libs = get_steam_libs(self.steam_root)
-            # Also scan all drives for additional libraries
-            if os.name == 'nt':  # Windows
-                from string import ascii_uppercase
-                for drive_letter in ascii_uppercase:
-                    drive = Path(f"{drive_letter}:/")
-                    if not drive.exists():
-                        continue
-                    potential_paths = [
-                        drive / "SteamLibrary",
-                        drive / "Steam",
-                        drive / "Program Files (x86)" / "Steam",
-                        drive / "Program Files" / "Steam",
-                        drive / "Games" / "Steam",
-                    ]
-                    for path in potential_paths:
-                        steamapps = path / "steamapps"
-                        if steamapps.exists() and path not in steam_libs:
-                            steam_libs.append(path)
-            for lib in steam_libs:
+            service = get_library_service(self.steam_root)
+            for lib, entries in service.scan_parallel(all_drives=True):
                 steamapps = lib / "steamapps"
-                if not steamapps.exists():
-                    continue
-                for acf_path in steamapps.glob("*.acf"):
-                    try:
-                        app_acf = vdf_load(acf_path)
-                        app_state = app_acf.get("AppState", {})
-                        name = app_state.get("name")
-                        installdir = app_state.get("installdir")
-                        app_id = app_state.get("appid")
-                        if not app_id or not installdir:
-                            logger.warning(f"Skipping {acf_path.name}: missing appid or installdir")
-                            continue
-                        if app_id in seen_app_ids:
-                            continue
-                        seen_app_ids.add(app_id)
-                        game_path = steamapps / "common" / installdir
-                        if not game_path.exists():
-                            continue
-                        games.append(
-                            (name, ACFInfo(app_id, game_path))
-                        )
-                    except Exception as e:
-                        logger.debug(f"Failed to parse {acf_path}: {e}")
-        except Exception as e:
-            logger.error(f"Failed to scan Steam libraries: {e}")
-            # Fallback to original behavior
-            for path in self.steamapps_path.glob("*.acf"):
-                try:
-                    app_acf = vdf_load(path)
-                    app_state = app_acf.get("AppState", {})
-                    name = app_state.get("name")
-                    installdir = app_state.get("installdir")
-                    app_id = app_state.get("appid")
-                    if not app_id or not installdir:
-                        logger.warning(f"Skipping {path.name}: missing appid or installdir")
+                for acf in entries:
+                    if not acf.app_id or not acf.install_dir:
+                        logger.warning(f"Skipping {acf.acf_path.name}: missing appid or installdir")
+                        continue
+                    app_id = str(acf.app_id)
+                    if app_id in seen_app_ids:
+                        continue
+                    seen_app_ids.add(app_id)
+                    game_path = steamapps / "common" / acf.install_dir
+                    if not game_path.exists():
                         continue
                     games.append(
-                        (name, ACFInfo(app_id, self.steamapps_path / "common" / installdir))
+                        (acf.name, ACFInfo(app_id, game_path))
                     )
-                except Exception as e:
-                    logger.debug(f"Failed to parse {path}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to scan Steam libraries: {e}")
+            # Fallback to original behavior
+            for acf in get_library_index().scan_library(self.steamapps_path.parent):
+                if not acf.app_id or not acf.install_dir:
+                    logger.warning(f"Skipping {acf.acf_path.name}: missing appid or installdir")
+                    continue
+                games.append(
+                    (acf.name, ACFInfo(str(acf.app_id), self.steamapps_path / "common" / acf.install_dir))
+                )
         return games
 
     def get_game_list(self):
@@ -554,7 +520,7 @@ class GameHandler:
         from sff.dlc_unlockers.downloader import GitHubReleaseDownloader
         from sff.dlc_unlockers.base import Platform, UnlockerType
         from sff.storage.settings import get_setting, set_setting
-        import asyncio
+        from sff.http_client import run_async
         # Resolve settings with defaults (CreamInstaller: UseSmokeAPI=True, Proxy=optional)
         use_smokeapi = get_setting(Settings.USE_SMOKEAPI)
         if use_smokeapi is None or isinstance(use_smokeapi, str):
@@ -639,7 +605,7 @@ class GameHandler:
                 continue
             print(f"  {utype.value}...", end=" ")
             try:
-                dll_dir = asyncio.run(downloader.download_latest(utype))
+                dll_dir = run_async(downloader.download_latest(utype))
                 if dll_dir:
                     unlocker_dirs[utype] = dll_dir
                     print(Fore.GREEN + "✓" + Style.RESET_ALL)
@@ -59,7 +59,7 @@ class _BackupWorker(QObject):
     def run(self):
         mgr = CloudSaves()
         if self.mode == "backup":
-            result = mgr.backup_steam_save(
+            result = mgr.export_steam_save(
                 self.steam_path,
                 self.steam32_id,
                 self.app_id,
@@ -146,7 +146,7 @@ class CloudSavesTab(QWidget):
         backup_layout = QVBoxLayout(backup_group)
         backup_layout.addWidget(QLabel(
             "Select a game above, then choose where to save the backup.\n"
-            "Creates: <destination>/<Game Name> [AppID]/remote/"
+            "Creates: <destination>/<Game Name> [AppID].sffsave.zip"
         ))
         dest_row = QHBoxLayout()
         dest_row.addWidget(QLabel("Backup Destination:"))
@@ -165,18 +165,21 @@ class CloudSavesTab(QWidget):
         restore_group = QGroupBox("Import (Restore) Saves")
         restore_layout = QVBoxLayout(restore_group)
         restore_layout.addWidget(QLabel(
-            "Select a game above, then browse to the backup folder\n"
-            "(the '<Game Name> [AppID]' folder created during backup).\n"
+            "Select a game above, then browse to the backup archive\n"
+            "(<Game Name> [AppID].sffsave.zip) or an older backup folder.\n"
             "Current saves are automatically backed up before overwrite."
         ))
         import_row = QHBoxLayout()
-        import_row.addWidget(QLabel("Backup Folder:"))
+        import_row.addWidget(QLabel("Backup:"))
         self._import_edit = QLineEdit()
-        self._import_edit.setPlaceholderText("Browse to <Game Name> [AppID] folder…")
+        self._import_edit.setPlaceholderText("Browse to a .sffsave.zip or <Game Name> [AppID] folder…")
         import_row.addWidget(self._import_edit)
         browse_import = QPushButton("Browse")
         browse_import.clicked.connect(self._browse_import)
         import_row.addWidget(browse_import)
+        browse_import_dir = QPushButton("Folder…")
+        browse_import_dir.clicked.connect(self._browse_import_folder)
+        import_row.addWidget(browse_import_dir)
         restore_layout.addLayout(import_row)
         self._restore_btn = QPushButton("Import Saves → Steam")
         self._restore_btn.clicked.connect(self._do_restore)
@@ -210,6 +213,13 @@ class CloudSavesTab(QWidget):
             self._dest_edit.setText(path)
 
     def _browse_import(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Save Archive", "", "Save archives (*.sffsave.zip *.zip);;All files (*)",
+        )
+        if path:
+            self._import_edit.setText(path)
+
+    def _browse_import_folder(self):
         path = QFileDialog.getExistingDirectory(self, "Select Backup Folder (the '<Game Name> [AppID]' folder)")
         if path:
             self._import_edit.setText(path)
@@ -280,7 +290,7 @@ class CloudSavesTab(QWidget):
         app_id, game_name = game
         backup_folder = self._import_edit.text().strip()
         if not backup_folder:
-            QMessageBox.warning(self, "No Backup Folder", "Please browse to the backup folder.")
+            QMessageBox.warning(self, "No Backup Selected", "Please browse to the backup archive or folder.")
             return
         reply = QMessageBox.question(
             self, "Confirm Import",
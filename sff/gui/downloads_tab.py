@@ -62,12 +62,24 @@ class DownloadsTab(QWidget):
         queue_group = QGroupBox("Queue")
         queue_layout = QVBoxLayout(queue_group)
         self._queue_table = QTableWidget()
-        self._queue_table.setColumnCount(3)
-        self._queue_table.setHorizontalHeaderLabels(["App ID", "Game", "Mode"])
+        self._queue_table.setColumnCount(4)
+        self._queue_table.setHorizontalHeaderLabels(["App ID", "Game", "Mode", "Status"])
         self._queue_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self._queue_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self._queue_table.setMaximumHeight(150)
         queue_layout.addWidget(self._queue_table)
+        queue_btn_layout = QHBoxLayout()
+        top_btn = QPushButton("Move to Top")
+        top_btn.clicked.connect(lambda: self._queue_action(self._dm.move_to_top))
+        queue_btn_layout.addWidget(top_btn)
+        pause_btn = QPushButton("Pause / Resume")
+        pause_btn.clicked.connect(self._toggle_pause_selected)
+        queue_btn_layout.addWidget(pause_btn)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(lambda: self._queue_action(self._dm.cancel_download))
+        queue_btn_layout.addWidget(cancel_btn)
+        queue_btn_layout.addStretch()
+        queue_layout.addLayout(queue_btn_layout)
         layout.addWidget(queue_group)
         # completed
         done_group = QGroupBox("Completed")
@@ -121,9 +133,11 @@ class DownloadsTab(QWidget):
 
     def _refresh(self):
         # active
-        active = self._dm.get_active()
+        active_all = self._dm.get_active_all()
+        active = active_all[0] if active_all else None
         if active:
-            self._active_label.setText(f"{active.game_name} ({active.app_id})")
+            more = f"  (+{len(active_all) - 1} more)" if len(active_all) > 1 else ""
+            self._active_label.setText(f"{active.game_name} ({active.app_id}){more}")
             self._progress_bar.setValue(active.progress)
             if active.total_bytes > 0:
                 mb = active.downloaded_bytes / (1024 * 1024)
@@ -142,6 +156,7 @@ class DownloadsTab(QWidget):
             self._queue_table.setItem(i, 0, QTableWidgetItem(str(item.app_id)))
             self._queue_table.setItem(i, 1, QTableWidgetItem(item.game_name))
             self._queue_table.setItem(i, 2, QTableWidgetItem(item.mode.value))
+            self._queue_table.setItem(i, 3, QTableWidgetItem(item.status.value))
         # completed
         completed = self._dm.get_completed()
         self._done_table.setRowCount(len(completed))
@@ -170,6 +185,27 @@ class DownloadsTab(QWidget):
             self._hist_table.setItem(i, 3, QTableWidgetItem(t))
         self._hist_group.setTitle(f"Download History ({len(entries)} entries)")
 
+    def _selected_queue_app(self):
+        row = self._queue_table.currentRow()
+        item = self._queue_table.item(row, 0) if row >= 0 else None
+        return int(item.text()) if item else None
+
+    def _queue_action(self, action):
+        app_id = self._selected_queue_app()
+        if app_id is not None:
+            action(app_id)
+            self._refresh()
+
+    def _toggle_pause_selected(self):
+        app_id = self._selected_queue_app()
+        if app_id is None:
+            return
+        if any(i.app_id == app_id and i.status == DownloadStatus.PAUSED for i in self._dm.get_queue()):
+            self._dm.resume_download(app_id)
+        else:
+            self._dm.pause_download(app_id)
+        self._refresh()
+
     def _clear_completed(self):
         self._dm.clear_completed()
 
@@ -57,45 +57,29 @@ def _scan_installed_games(steam_path = None):
         except Exception:
             pass
 
-    # Extend with all drives
-    if os.name == "nt":
-        from string import ascii_uppercase
-        for dl in ascii_uppercase:
-            for sub in ("SteamLibrary", "Steam", "Games/Steam"):
-                p = Path(f"{dl}:/{sub}")
-                if p.exists() and p not in candidates:
-                    candidates.append(p)
-
-    # Read libraryfolders.vdf from each root
-    try:
-        from sff.storage.vdf import get_steam_libs
-        if candidates:
-            for root in list(candidates):
-                for lib in get_steam_libs(root):
-                    if lib not in candidates:
-                        candidates.append(lib)
-    except Exception:
-        pass
-
-    for lib in candidates:
+    # Libraries from each root's libraryfolders.vdf, plus all drives
+    from sff.steam_library import find_drive_libraries, get_library_service
+    from sff.storage.library_index import get_library_index
+    libraries = []
+    for root in candidates:
+        try:
+            libraries.extend(get_library_service(root).get_libraries())
+        except Exception:
+            pass
+    libraries.extend(find_drive_libraries())
+
+    index = get_library_index()
+    for lib in dict.fromkeys(libraries):
         steamapps = lib / "steamapps"
-        if not steamapps.exists():
-            continue
-        for acf in steamapps.glob("appmanifest_*.acf"):
-            try:
-                from sff.storage.vdf import vdf_load
-                data = vdf_load(acf).get("AppState", {})
-                app_id = data.get("appid", "")
-                name = data.get("name", "")
-                installdir = data.get("installdir", "")
-                if not app_id or not installdir or app_id in seen:
-                    continue
-                game_path = steamapps / "common" / installdir
-                if game_path.exists():
-                    seen.add(app_id)
-                    results.append((name or f"App {app_id}", app_id, game_path))
-            except Exception:
-                pass
+        for acf in index.scan_library(lib):
+            app_id = str(acf.app_id) if acf.app_id else ""
+            if not app_id or not acf.install_dir or app_id in seen:
+                continue
+            game_path = steamapps / "common" / acf.install_dir
+            if game_path.exists():
+                seen.add(app_id)
+                results.append((acf.name or f"App {app_id}", app_id, game_path))
+    index.flush()
 
     results.sort(key=lambda t: t[0].lower())
     return results
@@ -142,6 +142,47 @@ class GUIPromptBackend:
             return cur.data(Qt.ItemDataRole.UserRole) if cur else None
         return _on_gui_thread(_show)
 
+    def prompt_search(self, msg, search, cancellable=False):
+        parent = self._parent
+        def _show():
+            dlg = QDialog(parent)
+            dlg.setWindowTitle("Search")
+            dlg.setMinimumWidth(520)
+            dlg.setMinimumHeight(400)
+            layout = QVBoxLayout(dlg)
+            layout.addWidget(QLabel(msg))
+            edit = QLineEdit()
+            edit.setPlaceholderText("Start typing...")
+            layout.addWidget(edit)
+            lw = QListWidget()
+            layout.addWidget(lw)
+            def _refresh(text):
+                lw.clear()
+                if not text.strip():
+                    return
+                for display, value in search(text):
+                    item = QListWidgetItem(display)
+                    item.setData(Qt.ItemDataRole.UserRole, value)
+                    lw.addItem(item)
+                if lw.count() > 0:
+                    lw.setCurrentRow(0)
+            # searching is fast enough to run on every keystroke
+            edit.textChanged.connect(_refresh)
+            edit.returnPressed.connect(dlg.accept)
+            std = QDialogButtonBox.StandardButton.Ok
+            if cancellable:
+                std |= QDialogButtonBox.StandardButton.Cancel
+            btns = QDialogButtonBox(std)
+            btns.accepted.connect(dlg.accept)
+            btns.rejected.connect(dlg.reject)
+            layout.addWidget(btns)
+            lw.itemDoubleClicked.connect(dlg.accept)
+            if dlg.exec() != QDialog.DialogCode.Accepted:
+                return None
+            cur = lw.currentItem()
+            return cur.data(Qt.ItemDataRole.UserRole) if cur else None
+        return _on_gui_thread(_show)
+
     def prompt_confirm(
         self,
         msg,
@@ -374,14 +374,14 @@ class SFFMainWindow(QMainWindow):
 
     def _refresh_game_list(self):
         from sff.game_specific import GameHandler
-        from sff.storage.vdf import get_steam_libs
+        from sff.steam_library import get_library_service
         self.game_combo.clear()
         self._game_list = []
         injection = self.ui.app_list_man or self.ui.sls_man
         if not injection:
             self.game_combo.addItem("(Unsupported on this OS)", None)
             return
-        steam_libs = get_steam_libs(self.steam_path)
+        steam_libs = get_library_service(self.steam_path).get_libraries()
         lib_path = steam_libs[0] if steam_libs else self.steam_path
         handler = GameHandler(self.steam_path, lib_path, self.ui.provider, injection)
         self._game_list = handler.get_game_list()
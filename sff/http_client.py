@@ -0,0 +1,335 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Shared, pooled httpx clients.
+
+Use get_client() instead of httpx.get()/httpx.Client() so connections (DNS,
+TCP, TLS) are kept alive and reused across the whole process. Per-request
+options (timeout, headers, follow_redirects, params) work as usual.
+
+Async clients can't be shared between event loops, so get_async_client()
+keeps one per running loop. Proxy, HTTP/2 and limits are set in one place
+with configure(); HTTP/2 is only used when the optional h2 package is
+installed. Environment proxies (HTTPS_PROXY etc.) are honoured as before.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import urllib.request
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=10.0)
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0
+# Concurrent requests to one host; extra requests wait for a free slot
+MAX_PER_HOST = 8
+
+_config = {
+    "proxy": None,
+    "http2": importlib.util.find_spec("h2") is not None,
+    "max_per_host": MAX_PER_HOST,
+}
+_lock = threading.Lock()
+_client = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """gives the host slot back once the response body is closed"""
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+
+class _HostLimitedTransport(httpx.BaseTransport):
+    """per_host concurrent requests to one host; transports built with share= count together"""
+
+    def __init__(self, transport, per_host, share = None):
+        self._transport = transport
+        self._per_host = per_host
+        if share is not None:
+            self._slots, self._slots_lock = share._slots, share._slots_lock
+        else:
+            self._slots: dict[str, threading.BoundedSemaphore] = {}
+            self._slots_lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._slots_lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self._per_host)
+            return slot
+
+    def handle_request(self, request):
+        slot = self._slot(request.url.host)
+        slot.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, slot.release)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+
+class _AsyncHostLimitedTransport(httpx.AsyncBaseTransport):
+
+    def __init__(self, transport, per_host, share = None):
+        self._transport = transport
+        self._per_host = per_host
+        self._slots: dict[str, asyncio.Semaphore] = share._slots if share is not None else {}
+
+    async def handle_async_request(self, request):
+        slot = self._slots.get(request.url.host)
+        if slot is None:
+            slot = self._slots[request.url.host] = asyncio.Semaphore(self._per_host)
+        await slot.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        response.stream = _AsyncReleasingStream(response.stream, slot.release)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def _build_client():
+    transport = _HostLimitedTransport(
+        httpx.HTTPTransport(http2=_config["http2"], limits=_limits(), proxy=_config["proxy"]),
+        _config["max_per_host"],
+    )
+    return httpx.Client(
+        transport=transport,
+        timeout=DEFAULT_TIMEOUT,
+        # a custom transport disables env proxies, so mount them back
+        mounts=_env_mounts(lambda proxy: _HostLimitedTransport(
+            httpx.HTTPTransport(http2=_config["http2"], limits=_limits(), proxy=proxy),
+            _config["max_per_host"], share=transport,
+        )),
+    )
+
+
+def _build_async_client():
+    transport = _AsyncHostLimitedTransport(
+        httpx.AsyncHTTPTransport(http2=_config["http2"], limits=_limits(), proxy=_config["proxy"]),
+        _config["max_per_host"],
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=DEFAULT_TIMEOUT,
+        mounts=_env_mounts(lambda proxy: _AsyncHostLimitedTransport(
+            httpx.AsyncHTTPTransport(http2=_config["http2"], limits=_limits(), proxy=proxy),
+            _config["max_per_host"], share=transport,
+        )),
+    )
+
+
+def _no_proxy_pattern(host):
+    """httpx mount pattern for one NO_PROXY entry"""
+    if "://" in host:
+        return host
+    if host == "localhost" or host[0].isdigit():
+        return f"all://{host}"
+    if ":" in host:
+        return f"all://[{host}]"
+    # "example.com" and ".example.com" both cover the domain and its subdomains
+    return f"all://*{host.lstrip('.')}"
+
+
+def _env_mounts(make_transport):
+    """
+    mounts for the system proxy settings (HTTP(S)_PROXY/ALL_PROXY/NO_PROXY,
+    or the registry on Windows); make_transport(proxy url) builds each one.
+    Not used when a proxy was configured explicitly.
+    """
+    if _config["proxy"] is not None:
+        return None
+    proxies = urllib.request.getproxies()
+    no_proxy = [h.strip() for h in proxies.pop("no", "").split(",") if h.strip()]
+    if "*" in no_proxy:
+        return None
+    mounts = {}
+    for scheme in ("all", "http", "https"):
+        url = proxies.get(scheme)
+        if url:
+            if "://" not in url:
+                url = "http://" + url
+            mounts[f"{scheme}://"] = make_transport(url)
+    if not mounts:
+        return None
+    for host in no_proxy:
+        mounts[_no_proxy_pattern(host)] = None
+    return mounts
+
+
+def get_client():
+    """the process-wide httpx.Client; don't close it"""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = _build_client()
+            logger.debug(f"Created shared HTTP client (http2={_config['http2']})")
+        return _client
+
+
+def get_async_client():
+    """httpx.AsyncClient for the running event loop; don't close it"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = _async_clients[loop] = _build_async_client()
+        return client
+
+
+async def close_async_client():
+    """close the running loop's AsyncClient, if it made one"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def run_async(coro):
+    """
+    asyncio.run(coro), closing the loop's AsyncClient before the loop ends;
+    use it instead of asyncio.run for anything that goes through get_async_client.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_async_client()
+
+    return asyncio.run(main())
+
+
+class PooledSession:
+    """
+    Drop-in for `with httpx.Client(timeout=..., follow_redirects=...) as client:`
+    that sends through the shared client; the defaults apply to every request.
+    """
+
+    def __init__(self, **defaults):
+        self._defaults = defaults
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def request(self, method, url, **kwargs):
+        return get_client().request(method, url, **{**self._defaults, **kwargs})
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stream(self, method, url, **kwargs):
+        return get_client().stream(method, url, **{**self._defaults, **kwargs})
+
+
+def configure(proxy = None, http2 = None, max_per_host = None):
+    """
+    Change proxy / HTTP/2 / per-host limit. Clients created afterwards use
+    the new settings; the current shared client is closed.
+    """
+    global _client
+    with _lock:
+        _config["proxy"] = proxy
+        if http2 is not None:
+            if http2 and importlib.util.find_spec("h2") is None:
+                logger.warning("HTTP/2 requested but h2 is not installed")
+                http2 = False
+            _config["http2"] = http2
+        if max_per_host is not None:
+            _config["max_per_host"] = max_per_host
+        old, _client = _client, None
+        _async_clients.clear()
+    if old is not None:
+        old.close()
+
+
+def close():
+    global _client
+    with _lock:
+        old, _client = _client, None
+    if old is not None:
+        old.close()
@@ -17,18 +17,30 @@
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
 import asyncio
+import hashlib
 import logging
+import os
+import re
+import shutil
 import sys
+import threading
+import time
 from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from tempfile import TemporaryFile
 from pathlib import Path
 from urllib.parse import urlparse
 
 import httpx
+import msgpack  # type: ignore
 from tqdm import tqdm  # type: ignore
 
+from sff.app_names import get_name_resolver
+from sff.http_client import get_async_client, get_client
 from sff.prompts import prompt_confirm, prompt_text
 from sff.secret_store import b64_decrypt
+from sff.utils import root_folder
 from typing import Literal, Union, overload
 
 if sys.platform == "win32":
@@ -71,9 +83,8 @@ async def get_request(
     headers = None,
 ):
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            logger.debug(f"Making request to {url}")
-            response = await client.get(url, headers=headers)
+        logger.debug(f"Making request to {url}")
+        response = await get_async_client().get(url, headers=headers, timeout=timeout)
         if response.status_code == 200:
             try:
                 logger.debug(f"Received {response.content}")
@@ -91,7 +102,7 @@ def get_request_raw(url):
     resp = None
     while True:
         try:
-            resp = httpx.get(url, timeout=None)
+            resp = get_client().get(url, timeout=None)
         except httpx.HTTPError as e:
             print(f"Network error: {repr(e)}")
             if prompt_confirm("Try again?"):
@@ -101,6 +112,245 @@ def get_request_raw(url):
         return resp.content
 
 
+HTTP_CACHE_DIR = Path(os.environ.get("APPDATA", os.path.expanduser("~"))) / "SteaMidra" / "http_cache"
+# where older versions kept it, with API keys in some of the stored URLs
+_LEGACY_CACHE_DIR = root_folder(outside_internal=True) / "http_cache"
+# entries not used for this long are dropped, then the least recently used
+# ones until the rest fit the budget
+HTTP_CACHE_MAX_AGE = 14 * 24 * 3600
+HTTP_CACHE_BUDGET = 128 * 1024 * 1024
+_SWEEP_INTERVAL = 3600
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass
+class CachePolicy:
+    """
+    How cached_get treats one endpoint.
+    ttl: seconds a stored response is served without asking the server;
+        None means use the response's Cache-Control/Expires.
+    store: False disables caching for the endpoint entirely.
+    stale_if_error: serve an expired copy when the request fails.
+    ignore_params: query parameters (API keys and the like) left out of the
+        cache key and never written to disk.
+    """
+    ttl: Union[float, None] = None
+    store: bool = True
+    stale_if_error: bool = True
+    ignore_params: tuple[str, ...] = ()
+
+
+DEFAULT_CACHE_POLICY = CachePolicy()
+
+# (url prefix, policy); first match wins, so add specific prefixes first
+HTTP_CACHE_POLICIES: list[tuple[str, CachePolicy]] = [
+    # GitHub sends max-age=60; 304s don't count against the API rate limit
+    ("https://api.github.com/repos/Midrags/SFF/releases", CachePolicy(ttl=15 * 60)),
+    ("https://store.steampowered.com/api/appdetails", CachePolicy(ttl=24 * 3600)),
+    (
+        "https://api.steampowered.com/IStoreService/GetAppList/",
+        CachePolicy(ttl=24 * 3600, ignore_params=("key",)),
+    ),
+]
+_sweep_lock = threading.Lock()
+_last_sweep = None
+
+
+def set_cache_policy(url_prefix, policy):
+    """override the cache policy for every URL starting with url_prefix"""
+    for i, (prefix, _) in enumerate(HTTP_CACHE_POLICIES):
+        if prefix == url_prefix:
+            HTTP_CACHE_POLICIES[i] = (url_prefix, policy)
+            return
+    HTTP_CACHE_POLICIES.insert(0, (url_prefix, policy))
+
+
+def _policy_for(url):
+    for prefix, policy in HTTP_CACHE_POLICIES:
+        if url.startswith(prefix):
+            return policy
+    return DEFAULT_CACHE_POLICY
+
+
+def _max_age(headers):
+    """freshness lifetime the server asked for, in seconds"""
+    cache_control = headers.get("Cache-Control", "")
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    if (match := _MAX_AGE_RE.search(cache_control)) is not None:
+        return int(match.group(1))
+    if (expires := headers.get("Expires")) is not None:
+        try:
+            return max(0, parsedate_to_datetime(expires).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0
+    return 0
+
+
+def _cache_key(url, policy):
+    """url without the policy's ignored params"""
+    if not policy.ignore_params:
+        return str(url)
+    params = [(k, v) for k, v in url.params.multi_items() if k not in policy.ignore_params]
+    return str(url.copy_with(params=params))
+
+
+def _sweep_cache():
+    """
+    Evict expired and least recently used entries; runs on first use and
+    then at most every _SWEEP_INTERVAL. An entry's mtime is its last use.
+    """
+    global _last_sweep
+    with _sweep_lock:
+        now = time.monotonic()
+        if _last_sweep is not None and now - _last_sweep < _SWEEP_INTERVAL:
+            return
+        first, _last_sweep = _last_sweep is None, now
+    if first and _LEGACY_CACHE_DIR.exists():
+        shutil.rmtree(_LEGACY_CACHE_DIR, ignore_errors=True)
+    entries = []
+    for path in HTTP_CACHE_DIR.glob("*.bin"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    cutoff = time.time() - HTTP_CACHE_MAX_AGE
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in sorted(entries, key=lambda e: e[0]):
+        if mtime >= cutoff and total <= HTTP_CACHE_BUDGET:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    if removed:
+        logger.debug(f"Evicted {removed} HTTP cache entries")
+
+
+def _cache_path(url):
+    return HTTP_CACHE_DIR / (hashlib.sha256(url.encode()).hexdigest() + ".bin")
+
+
+def _load_cached(url):
+    path = _cache_path(url)
+    try:
+        entry = msgpack.unpackb(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Dropping unreadable HTTP cache entry for {url}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+    if entry.get("url") != url:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry
+
+
+def _store_cached(url, entry):
+    path = _cache_path(url)
+    try:
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(msgpack.packb(entry))  # type: ignore
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Could not write HTTP cache entry for {url}: {e}")
+
+
+def _storable_headers(headers):
+    # httpx already decoded the body, so don't replay the transfer headers
+    return [
+        (k, v) for k, v in headers.multi_items()
+        if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+    ]
+
+
+def _cached_response(entry):
+    return httpx.Response(
+        entry["status"],
+        headers=entry["headers"],
+        content=entry["body"],
+        request=httpx.Request("GET", entry["url"]),
+    )
+
+
+def _is_fresh(entry, policy):
+    ttl = policy.ttl if policy.ttl is not None else entry["max_age"]
+    return time.time() - entry["stored_at"] < ttl
+
+
+def cached_get(url, params = None, headers = None, timeout = 10, policy = None):
+    """
+    GET through the on-disk HTTP cache. Fresh entries are returned without a
+    request; stale ones are revalidated with If-None-Match/If-Modified-Since.
+    Returns an httpx.Response (status 200 when served from cache), or None
+    if the request failed and there's nothing usable on disk.
+    """
+    full_url = httpx.URL(url, params=params)
+    policy = policy or _policy_for(str(full_url))
+    key = _cache_key(full_url, policy)
+    if policy.store:
+        _sweep_cache()
+    entry = _load_cached(key) if policy.store else None
+    if entry is not None and _is_fresh(entry, policy):
+        logger.debug(f"HTTP cache hit: {url}")
+        return _cached_response(entry)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        stored = httpx.Headers(entry["headers"])
+        if (etag := stored.get("ETag")) is not None:
+            request_headers["If-None-Match"] = etag
+        if (last_modified := stored.get("Last-Modified")) is not None:
+            request_headers["If-Modified-Since"] = last_modified
+    try:
+        response = get_client().get(
+            full_url, headers=request_headers, timeout=timeout, follow_redirects=True
+        )
+    except httpx.HTTPError as e:
+        logger.debug(f"Request error: {repr(e)}")
+        if entry is not None and policy.stale_if_error:
+            logger.debug(f"Serving stale HTTP cache entry for {url}")
+            return _cached_response(entry)
+        return None
+
+    if response.status_code == 304 and entry is not None:
+        logger.debug(f"HTTP cache revalidated: {url}")
+        merged = httpx.Headers(entry["headers"])
+        merged.update(response.headers)
+        entry["headers"] = _storable_headers(merged)
+        entry["stored_at"] = time.time()
+        entry["max_age"] = _max_age(merged)
+        _store_cached(key, entry)
+        return _cached_response(entry)
+
+    cacheable = (
+        policy.store
+        and response.status_code == 200
+        and (policy.ttl is not None or "no-store" not in response.headers.get("Cache-Control", ""))
+    )
+    if cacheable:
+        _store_cached(key, {
+            "url": key,
+            "status": response.status_code,
+            "headers": _storable_headers(response.headers),
+            "body": response.content,
+            "stored_at": time.time(),
+            "max_age": _max_age(response.headers),
+        })
+    return response
+
+
+def clear_http_cache():
+    for path in HTTP_CACHE_DIR.glob("*.bin"):
+        path.unlink(missing_ok=True)
+
+
 async def _wait_for_enter():
     print(
         "If it takes too long, press Enter to cancel the request "
@@ -254,22 +504,15 @@ async def get_gmrc(manifest_id: Union[str, int], silent: bool = False, try_tor:
     return code or None
 
 
+def prompt_game_name():
+    """ask the user for a name no lookup could find"""
+    return prompt_text("Couldn't find the name of the game. Type the name of it: ")
+
+
 def get_game_name(app_id):
-    official_info = asyncio.run(
-        get_request(
-            f"https://store.steampowered.com/api/appdetails/?appids={app_id}",
-            "json",
-        )
-    )
-    if official_info:
-        app_name = official_info.get(app_id, {}).get("data", {}).get("name")
-        if app_name is None:
-            app_name = prompt_text(
-                "Request succeeded but couldn't find the game name. "
-                "Type the name of it: "
-            )
-    else:
-        app_name = prompt_text("Request failed. Type the name of the game: ")
+    app_name = get_name_resolver().resolve(app_id) if str(app_id).isdigit() else None
+    if app_name is None:
+        app_name = prompt_game_name()
     return app_name
 
 
@@ -282,7 +525,7 @@ def download_to_tempfile(
 ):
     temp_f = TemporaryFile()
     try:
-        with httpx.stream(
+        with get_client().stream(
             "GET",
             url,
             headers=headers,
@@ -325,7 +568,7 @@ def download_to_path(
     try:
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with httpx.stream(
+        with get_client().stream(
             "GET",
             url,
             headers=headers or {},
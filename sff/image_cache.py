@@ -30,7 +30,7 @@ import hashlib
 from pathlib import Path
 from collections import OrderedDict
 
-import httpx
+from sff.http_client import PooledSession
 
 logger = logging.getLogger(__name__)
 
@@ -122,7 +122,7 @@ class ImageCache:
             return cache_path
         url = STEAM_CDN_URL.format(appid=app_id)
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(url)
                 resp.raise_for_status()
                 cache_path.write_bytes(resp.content)
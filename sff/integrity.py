@@ -16,18 +16,150 @@
 # You should have received a copy of the GNU General Public License
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
-"""Integrity Verification for SteaMidra"""
+"""
+Integrity Verification for SteaMidra
 
+Checksums are computed with large reads (mmap for big files) and cached in
+%APPDATA%/SteaMidra/checksums.bin by (path, size, mtime_ns), so verifying
+an unchanged file again doesn't read it. New digests are written out at most
+every FLUSH_INTERVAL seconds and at exit. verify_many() hashes files on a
+thread pool; hashlib releases the GIL while it works.
+"""
+
+import atexit
 import hashlib
 import logging
+import mmap
+import os
 import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import msgpack  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 # Steam manifest magic bytes
 MANIFEST_MAGIC = b'\x27\x44\x56\x01'  # Steam depot manifest signature
 
+HASH_BUFFER = 4 * 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# Hashing is mostly waiting on the disk for cold files, on the CPU for warm ones
+HASH_WORKERS = min(8, os.cpu_count() or 2)
+CACHE_VERSION = 1
+CACHE_MAX_ENTRIES = 200_000
+FLUSH_INTERVAL = 30.0
+
+
+def _hash_file(path, algorithm):
+    hash_obj = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hash_obj.update(mapped)
+        else:
+            buf = bytearray(min(HASH_BUFFER, max(size, 1)))
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                hash_obj.update(view[:n])
+    return hash_obj.hexdigest()
+
+
+def _get_cache_path():
+    base = Path(os.environ.get("APPDATA", os.path.expanduser("~")))
+    path = base / "SteaMidra" / "checksums.bin"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class ChecksumCache:
+
+    def __init__(self, path = None):
+        self.path = path or _get_cache_path()
+        # {"algorithm:path": [size, mtime_ns, hexdigest]}, oldest first
+        self._entries: dict[str, list] = {}
+        self._loaded = False
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if self.path.exists():
+                data = msgpack.unpackb(self.path.read_bytes())
+                if data.get("version") == CACHE_VERSION:
+                    self._entries = data.get("entries", {})
+        except Exception as e:
+            logger.warning(f"Failed to load checksum cache, rebuilding: {e}")
+            self._entries = {}
+
+    @staticmethod
+    def _key(path, algorithm):
+        return f"{algorithm}:{os.path.abspath(path)}"
+
+    def get(self, path, algorithm, st):
+        with self._lock:
+            self._load()
+            cached = self._entries.get(self._key(path, algorithm))
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        return None
+
+    def put(self, path, algorithm, st, digest):
+        key = self._key(path, algorithm)
+        with self._lock:
+            self._load()
+            self._entries.pop(key, None)
+            self._entries[key] = [st.st_size, st.st_mtime_ns, digest]
+            while len(self._entries) > CACHE_MAX_ENTRIES:
+                del self._entries[next(iter(self._entries))]
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._last_flush = time.monotonic()
+            tmp = self.path.with_suffix(".tmp")
+            try:
+                tmp.write_bytes(msgpack.packb({  # type: ignore
+                    "version": CACHE_VERSION,
+                    "entries": self._entries,
+                }))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.error(f"Failed to save checksum cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._loaded = True
+            self._dirty = True
+            self.flush()
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_checksum_cache():
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = ChecksumCache()
+            # compute_checksum() callers don't flush; don't lose what they hashed
+            atexit.register(_cache_instance.flush)
+        return _cache_instance
+
 
 class IntegrityVerifier:
 
@@ -65,17 +197,87 @@ class IntegrityVerifier:
             return False
 
     @staticmethod
-    def compute_checksum(file_path, algorithm = "sha256"):
+    def compute_checksum(file_path, algorithm = "sha256", use_cache = True):
+        """
+        Hex digest of file_path. With use_cache, a digest computed earlier for
+        the same path, size and mtime is returned without reading the file.
+        """
         try:
-            hash_obj = hashlib.new(algorithm)
-            with file_path.open("rb") as f:
-                while chunk := f.read(8192):
-                    hash_obj.update(chunk)
-            return hash_obj.hexdigest()
+            st = os.stat(file_path)
+            cache = get_checksum_cache() if use_cache else None
+            if cache is not None:
+                digest = cache.get(file_path, algorithm, st)
+                if digest is not None:
+                    return digest
+            digest = _hash_file(file_path, algorithm)
+            if cache is not None:
+                cache.put(file_path, algorithm, st, digest)
+            return digest
         except Exception as e:
             logger.error(f"Failed to compute checksum: {e}")
             return None
 
+    @staticmethod
+    def compute_many(files, algorithm = "sha256", use_cache = True, workers = None):
+        """{path: hex digest or None} for many files, hashed in parallel"""
+        files = list(files)
+        if not files:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(workers or HASH_WORKERS, len(files))) as pool:
+            digests = list(pool.map(
+                lambda p: IntegrityVerifier.compute_checksum(p, algorithm, use_cache), files,
+            ))
+        if use_cache:
+            get_checksum_cache().flush()
+        return dict(zip(files, digests))
+
+    @staticmethod
+    def verify_many(
+        expected,
+        algorithm = "sha256",
+        use_cache = True,
+        workers = None,
+    ):
+        """
+        expected is {path: hex digest}. Returns the paths that are missing,
+        unreadable or don't match; an empty list means everything verified.
+        """
+        actual = IntegrityVerifier.compute_many(expected, algorithm, use_cache, workers)
+        failed = []
+        for path, digest in actual.items():
+            if digest is None or digest.lower() != expected[path].lower():
+                logger.error(f"Checksum mismatch for {path}: expected {expected[path]}, got {digest}")
+                failed.append(path)
+        return failed
+
+    @staticmethod
+    def verify_copies(pairs, algorithm = "sha256", workers = None):
+        """
+        pairs is [(source, copy)]. Returns the copies whose contents differ
+        from their source. Source digests come from the cache when the source
+        is unchanged; copies are always read.
+        """
+        pairs = list(pairs)
+        sources = IntegrityVerifier.compute_many([s for s, _ in pairs], algorithm, True, workers)
+        expected = {}
+        failed = []
+        for src, dst in pairs:
+            if sources[src] is None:
+                failed.append(dst)
+            else:
+                expected[dst] = sources[src]
+        failed.extend(IntegrityVerifier.verify_many(expected, algorithm, False, workers))
+        # remember the copies' digests for later verifications
+        cache = get_checksum_cache()
+        for dst, digest in expected.items():
+            if dst not in failed:
+                try:
+                    cache.put(dst, algorithm, os.stat(dst), digest)
+                except OSError:
+                    pass
+        cache.flush()
+        return failed
+
     @staticmethod
     def verify_checksum(
         file_path: Path,
@@ -20,14 +20,13 @@
 
 import json
 import logging
-import os
 from dataclasses import dataclass
 from pathlib import Path
 
 from colorama import Fore, Style
 
-from sff.storage.acf import ACFParser
-from sff.storage.vdf import get_steam_libs
+from sff.steam_library import get_library_service
+from sff.storage.library_index import get_library_index
 from sff.progress import create_progress_bar
 from typing import List
 
@@ -72,51 +71,30 @@ class LibraryScanner:
             logger.error(f"Failed to scan AppList folder: {e}")
         return app_ids
 
-    def _scan_all_drives(self):
-        steam_libs = []
-        try:
-            configured_libs = get_steam_libs(self.steam_path)
-            steam_libs.extend(configured_libs)
-            logger.info(f"Found {len(configured_libs)} configured Steam libraries")
-        except Exception as e:
-            logger.warning(f"Failed to read Steam library config: {e}")
-        # Scan all drives for additional Steam libraries
-        if os.name == 'nt':  # Windows
-            from string import ascii_uppercase
-            for drive_letter in ascii_uppercase:
-                drive = Path(f"{drive_letter}:/")
-                if not drive.exists():
-                    continue
-                # Common Steam library locations
-                potential_paths = [
-                    drive / "SteamLibrary",
-                    drive / "Steam",
-                    drive / "Program Files (x86)" / "Steam",
-                    drive / "Program Files" / "Steam",
-                    drive / "Games" / "Steam",
-                ]
-                for path in potential_paths:
-                    steamapps = path / "steamapps"
-                    if steamapps.exists() and path not in steam_libs:
-                        steam_libs.append(path)
-                        logger.info(f"Discovered Steam library: {path}")
-        return steam_libs
-
-    def scan_all_games(self, scan_all_drives = True):
+    def scan_all_games(self, scan_all_drives = True, parallel = False):
         logger.info("Starting comprehensive library scan...")
         applist_ids = self._get_applist_ids()
-        if scan_all_drives:
-            steam_libs = self._scan_all_drives()
-        else:
-            steam_libs = get_steam_libs(self.steam_path)
-        steam_libs = list(set(steam_libs))
+        service = get_library_service(self.steam_path)
+        steam_libs = service.get_libraries(all_drives=scan_all_drives)
         all_games = []
         seen_app_ids = set()
         print(Fore.CYAN + f"\nScanning {len(steam_libs)} Steam libraries across all drives..." + Style.RESET_ALL)
-        for lib in steam_libs:
-            print(Fore.LIGHTBLACK_EX + f"  Scanning: {lib}" + Style.RESET_ALL)
-            games = self._scan_library(lib, applist_ids, seen_app_ids)
-            all_games.extend(games)
+        if parallel:
+            # Libraries are read concurrently; de-duplication still runs in library order
+            scanned = service.scan_parallel(
+                all_drives=scan_all_drives,
+                on_scanned=lambda lib, _: print(
+                    Fore.LIGHTBLACK_EX + f"  Scanned: {lib}" + Style.RESET_ALL
+                ),
+            )
+            for lib, entries in scanned:
+                all_games.extend(self._collect_games(lib, entries, applist_ids, seen_app_ids))
+        else:
+            for lib in steam_libs:
+                print(Fore.LIGHTBLACK_EX + f"  Scanning: {lib}" + Style.RESET_ALL)
+                games = self._scan_library(lib, applist_ids, seen_app_ids)
+                all_games.extend(games)
+            get_library_index().flush()
         # Also check for games in AppList that might not have ACF files
         orphaned_games = self._check_orphaned_applist_ids(applist_ids, seen_app_ids)
         all_games.extend(orphaned_games)
@@ -125,20 +103,23 @@ class LibraryScanner:
         return all_games
 
     def _scan_library(self, library_path, applist_ids, seen_app_ids):
-        games = []
         steamapps = library_path / "steamapps"
         if not steamapps.exists():
             logger.warning(f"Steamapps folder not found: {steamapps}")
-            return games
-        acf_files = list(steamapps.glob("appmanifest_*.acf"))
-        for acf_file in acf_files:
+            return []
+        entries = get_library_service(self.steam_path).scan_library(library_path)
+        return self._collect_games(library_path, entries, applist_ids, seen_app_ids)
+
+    def _collect_games(self, library_path, entries, applist_ids, seen_app_ids):
+        games = []
+        steamapps = library_path / "steamapps"
+        for acf in entries:
             try:
-                acf = ACFParser(acf_file)
-                app_id = acf.id
+                app_id = acf.app_id
                 app_name = acf.name
                 app_install_dir = acf.install_dir
                 if not app_id or not app_name:
-                    logger.warning(f"Skipping {acf_file}: missing app_id or name")
+                    logger.warning(f"Skipping {acf.acf_path}: missing app_id or name")
                     continue
                 if app_id in seen_app_ids:
                     logger.debug(f"Skipping duplicate app_id {app_id} in {library_path}")
@@ -164,7 +145,7 @@ class LibraryScanner:
                 )
                 games.append(game_info)
             except Exception as e:
-                logger.error(f"Failed to parse {acf_file}: {e}")
+                logger.error(f"Failed to scan {acf.acf_path}: {e}")
         return games
 
     def _check_orphaned_applist_ids(self, applist_ids, seen_app_ids):
@@ -17,10 +17,10 @@
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
 
-import json
-
 import re
 
+import time
+
 from datetime import datetime
 
 from pathlib import Path
@@ -29,13 +29,27 @@ from pathlib import Path
 from colorama import Fore, Style
 
 
-from sff.fzf import run_fzf
+from sff.fuzzy import get_catalog_index, warm_catalog_index
 
-from sff.http_utils import download_to_tempfile
+from sff.http_utils import CachePolicy, cached_get
 
 from sff.lua.endpoints import get_hubcap, get_oureverday
 
-from sff.prompts import prompt_confirm, prompt_file, prompt_select, prompt_text
+from sff.prompts import (
+
+    prompt_confirm,
+
+    prompt_file,
+
+    prompt_search,
+
+    prompt_select,
+
+    prompt_text,
+
+)
+
+from sff.storage.app_catalog import get_app_catalog, merge_catalog, write_catalog
 
 from sff.storage.settings import get_setting, set_setting
 
@@ -53,13 +67,11 @@ from sff.structs import (
 
     NamedIDs,
 
-    OSType,
-
     Settings,
 
 )
 
-from sff.utils import enter_path, root_folder
+from sff.utils import enter_path
 
 from sff.zip import read_lua_from_zip
 
@@ -114,17 +126,70 @@ def add_new_lua(file = None):
     return LuaResult(lua_path, None, LuaChoiceReturnCode.LOOP)
 
 
-def search_game(os_type):
-
-    all_games_file = (root_folder() / "all_games.txt")
+APP_LIST_URL = "https://api.steampowered.com/IStoreService/GetAppList/v1/"
+SEARCH_RESULTS = 30
+# failed GetAppList pages are retried this many times before asking
+FETCH_ATTEMPTS = 3
 
-    if all_games_file.exists():
 
-        mtime = all_games_file.stat().st_mtime
+def _fetch_app_list(api_key, since = None):
+    """
+    Every app from GetAppList, or only apps changed after `since` (unix
+    time). Paged with last_appid, 50k apps per page. Returns None if a
+    page keeps failing and the user gives up.
+    """
+    params = {"key": api_key, "max_results": "50000"}
+    policy = None
+    if since:
+        params["if_modified_since"] = str(int(since))
+        # one-off query, not worth keeping in the HTTP cache
+        policy = CachePolicy(store=False)
+    games = []
+    attempt = 0
+    while True:
+        # full pages are kept in the HTTP cache, so re-running this within a
+        # day (or after an interrupted download) doesn't fetch them again
+        page = cached_get(APP_LIST_URL, params=params, timeout=None, policy=policy)
+        if page is None or page.status_code != 200:
+            attempt += 1
+            status = "network error" if page is None else f"HTTP {page.status_code}"
+            if page is not None and page.status_code == 403:
+                print(Fore.RED + "Steam rejected the Web API key (HTTP 403). "
+                      "Check it in settings." + Style.RESET_ALL)
+                return None
+            if attempt < FETCH_ATTEMPTS:
+                print(f"Game list request failed ({status}), retrying in {2 ** attempt}s...")
+                time.sleep(2 ** attempt)
+                continue
+            print(Fore.RED + f"Couldn't download the game list ({status})." + Style.RESET_ALL)
+            if not prompt_confirm("Try again?"):
+                return None
+            attempt = 0
+            continue
+        attempt = 0
+        resp = page.json()
+        games.extend(enter_path(resp, "response", "apps"))
+        more = enter_path(resp, "response", "have_more_results")
+        if not more:
+            break
+        params['last_appid'] = enter_path(resp, "response", "last_appid")
+    return games
+
+
+def search_game():
+
+    catalog = get_app_catalog()
+
+    if catalog is not None:
+
+        # indexing takes a couple of seconds, so start while the user answers
+        warm_catalog_index()
+
+        mtime = catalog.synced_at or catalog.path.stat().st_mtime
         mtime_str = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %I:%M %p")
         download = prompt_confirm(
             "Do you want to update the list of every Game ID? "
-            f"(Last Modified: {mtime_str})",
+            f"(Last Updated: {mtime_str})",
             default=False,
         )
 
@@ -141,42 +206,49 @@ def search_game(os_type):
                   "You can change this later with your own in settings if you'd like.")
             api_key = STEAM_WEB_API_KEY
             set_setting(Settings.STEAM_WEB_API_KEY, api_key)
-        params = {"key": api_key, "max_results": "50000"}
-        games = []
-        print("Steam has limited this endpoint to 50k IDs per requests, so "
-              "it'll be downloading a couple times. Don't be alarmed.")
-        while True:
-            with download_to_tempfile(
-                "https://api.steampowered.com/IStoreService/GetAppList/v1/",
-                params=params
-            ) as tf:
-                if tf is None:
-                    continue
-                resp = json.load(tf)
-            games.extend(enter_path(resp, "response", "apps"))
-            more = enter_path(resp, "response", "have_more_results")
-            if not more:
-                break
-            params['last_appid'] = enter_path(resp, "response", "last_appid")
-        games_str = [
-            x.get("name", "UNKNOWN GAME") + f" [ID={x.get('appid')}]" for x in games
+        # stamp before the request so nothing changed mid-download is missed
+        started_at = time.time()
+        if catalog is not None and catalog.synced_at:
+            print("Fetching games changed since the last update...")
+            changes = _fetch_app_list(api_key, since=catalog.synced_at)
+            if changes is None:
+                print("Keeping the current list of games.")
+            else:
+                before, after = merge_catalog(
+                    ((x.get("appid"), x.get("name", "UNKNOWN GAME")) for x in changes),
+                    synced_at=started_at,
+                )
+                print(f"{len(changes)} changed, {after - before} new ({after} games).")
+        else:
+            print("Steam has limited this endpoint to 50k IDs per requests, so "
+                  "it'll be downloading a couple times. Don't be alarmed.")
+            games = _fetch_app_list(api_key)
+            if games is None:
+                return None
+            write_catalog(
+                ((x.get("appid"), x.get("name", "UNKNOWN GAME")) for x in games),
+                synced_at=started_at,
+            )
+        catalog = get_app_catalog()
+        assert catalog is not None
+
+    index = get_catalog_index()
+    assert index is not None
+
+    def search(query):
+
+        return [
+            (f"{name} [ID={app_id}]", (app_id, name))
+            for app_id, name in index.search(query, limit=SEARCH_RESULTS)
         ]
-        with all_games_file.open("w", encoding="utf=-8") as f:
-            f.write('\n'.join(games_str))
 
-    else:
-
-        games_str = all_games_file
-
-    selection = run_fzf(games_str, os_type)
+    selection = prompt_search("Search for a game:", search, cancellable=True)
 
     if selection:
 
-        match = re.search(r"(?<=\[ID=)\d+(?=\]$)", selection)
-        assert match is not None
-        res = match.group()
-        print(f"{Fore.YELLOW + selection + Style.RESET_ALL} has been selected")
-        return res
+        app_id, name = selection
+        print(f"{Fore.YELLOW}{name} [ID={app_id}]{Style.RESET_ALL} has been selected")
+        return str(app_id)
 
 
 def download_lua(dest, os_type):
@@ -216,7 +288,7 @@ def download_lua(dest, os_type):
 
     if not app_id:
 
-        if x := search_game(os_type):
+        if x := search_game():
             app_id = x
         else:
             return LuaResult(None, None, LuaChoiceReturnCode.LOOP)
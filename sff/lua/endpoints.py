@@ -28,6 +28,7 @@ import httpx
 
 from colorama import Fore, Style
 
+from sff.http_client import get_client
 from sff.http_utils import download_to_tempfile, get_request
 from sff.prompts import prompt_confirm, prompt_secret
 from sff.storage.settings import get_setting, set_setting
@@ -39,13 +40,12 @@ logger = logging.getLogger(__name__)
 
 def get_oureverday(dest, app_id):
     import json
-    import httpx as _httpx
     from sff.steam_client import create_provider_for_current_thread
 
     # Step 1: The Original GitHub source (Primary)
     print(Fore.CYAN + f"\n[Step 1] Attempting to download Lua for {app_id} from SteamAutoCracks GitHub..." + Style.RESET_ALL)
     try:
-        resp = _httpx.get(
+        resp = get_client().get(
             f"https://raw.githubusercontent.com/SteamAutoCracks/ManifestHub/refs/heads/{app_id}/{app_id}.lua",
             timeout=15,
             follow_redirects=True,
@@ -100,7 +100,7 @@ def get_oureverday(dest, app_id):
         else:
             print(Fore.CYAN + f"[Step 4] {len(missing_depots)} depot(s) missing locally — supplementing from GitLab..." + Style.RESET_ALL)
         try:
-            resp = _httpx.get(
+            resp = get_client().get(
                 "https://gitlab.com/SteamAutoCracks/ManifestHub/-/raw/main/depotkeys.json",
                 timeout=25,
                 follow_redirects=True,
@@ -174,7 +174,7 @@ def get_hubcap(dest, app_id, depotcache = None):
             "Authorization": f"Bearer {hubcap_key}",
         }
         try:
-            stats_resp = httpx.get(
+            stats_resp = get_client().get(
                 "https://hubcapmanifest.com/api/v1/user/stats",
                 headers=headers,
                 timeout=15,
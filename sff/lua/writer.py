@@ -33,7 +33,7 @@ from sff.http_utils import get_game_name
 
 from sff.prompts import prompt_confirm
 
-from sff.storage.vdf import VDFLoadAndDumper, vdf_dump, vdf_load
+from sff.storage.vdf import IndexedVDFDict, VDFLoadAndDumper, vdf_dump, vdf_load
 
 from sff.structs import LuaParsedInfo
 
@@ -246,7 +246,7 @@ class ConfigVDFWriter:
     def ids_in_config(self, ids: list[int]):
 
         vdf_file = self.steam_path / "config/config.vdf"
-        data = vdf_load(vdf_file)
+        data = vdf_load(vdf_file, mapper=IndexedVDFDict)
         depots = enter_path(
             data,
             "InstallConfigStore",
@@ -22,6 +22,8 @@ import logging
 
 import httpx
 
+from sff.http_client import PooledSession
+
 logger = logging.getLogger(__name__)
 
 GET_COLLECTION_DETAILS_URL = (
@@ -39,7 +41,7 @@ def get_collection_children(
         return []
 
     try:
-        with httpx.Client(timeout=timeout) as client:
+        with PooledSession(timeout=timeout) as client:
             resp = client.post(
                 GET_COLLECTION_DETAILS_URL,
                 data={
@@ -31,6 +31,8 @@ from pathlib import Path
 
 import httpx
 
+from sff.http_client import get_client
+
 logger = logging.getLogger(__name__)
 
 _MIRROR_OWNER = "qwe213312"
@@ -257,7 +259,7 @@ def _get_mirror_tree():
             pass
     url = f"{_GH_API}/repos/{_MIRROR_OWNER}/{_MIRROR_REPO}/git/trees/main?recursive=1"
     try:
-        resp = httpx.get(url, headers=_gh_headers(), timeout=30, follow_redirects=True)
+        resp = get_client().get(url, headers=_gh_headers(), timeout=30, follow_redirects=True)
         _update_rate_limit(resp)
         if resp.status_code == 200:
             _TREE = resp.json().get("tree", [])
@@ -294,7 +296,7 @@ def _fetch_file_date(filename):
         return "N/A"
     url = f"{_GH_API}/repos/{_MIRROR_OWNER}/{_MIRROR_REPO}/commits"
     try:
-        resp = httpx.get(
+        resp = get_client().get(
             url,
             params={"path": filename, "per_page": 1},
             headers=_gh_headers(),
@@ -396,7 +398,7 @@ def _fetch_steam_cm_entries(app_id):
 def _fetch_hubcap_depots(app_id):
     """Get depot IDs from Hubcap/SteamCMD API."""
     try:
-        resp = httpx.get(
+        resp = get_client().get(
             f"https://steamcmd.morrenus.net/api/{app_id}",
             timeout=10, follow_redirects=True,
         )
@@ -781,7 +783,7 @@ def _fetch_steamdb(depot_id):
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
     try:
-        resp = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
+        resp = get_client().get(url, headers=headers, timeout=10, follow_redirects=True)
         if resp.status_code == 200:
             entries = _parse_steamdb_html(resp.text)
             if entries:
@@ -16,19 +16,18 @@
 # You should have received a copy of the GNU General Public License
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
-import asyncio
 import logging
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from urllib.parse import urljoin
 
-import httpx
 import gevent
 from colorama import Fore, Style
 from steam.client.cdn import CDNClient, ContentServer  # type: ignore
 from tqdm import tqdm  # type: ignore
 
+from sff.http_client import get_client, run_async
 from sff.http_utils import get_gmrc, get_request_raw
 from sff.manifest.manifesthub_key import get_manifesthub_api_key
 from sff.manifest.crypto import decrypt_and_save_manifest
@@ -199,7 +198,7 @@ class ManifestDownloader:
             f"?depot_id={depot_id}&manifest_id={manifest_id}"
         )
         try:
-            resp = httpx.get(
+            resp = get_client().get(
                 url,
                 headers={"Authorization": f"Bearer {api_key}"},
                 timeout=60,
@@ -236,7 +235,7 @@ class ManifestDownloader:
             f"/main/{depot_id}_{manifest_id}.manifest"
         )
         try:
-            resp = httpx.get(url, timeout=30, follow_redirects=True)
+            resp = get_client().get(url, timeout=30, follow_redirects=True)
             if resp.status_code == 200 and resp.content:
                 target.write_bytes(resp.content)
                 print(
@@ -261,7 +260,7 @@ class ManifestDownloader:
             f"/main/{depot_id}_{manifest_id}.manifest"
         )
         try:
-            resp = httpx.get(url, timeout=30, follow_redirects=True)
+            resp = get_client().get(url, timeout=30, follow_redirects=True)
             if resp.status_code == 200 and resp.content:
                 print(
                     Fore.GREEN
@@ -314,7 +313,7 @@ class ManifestDownloader:
         """
         needed = {f"{d}_{m}.manifest" for d, m in depot_manifest_pairs}
         try:
-            resp = httpx.get(
+            resp = get_client().get(
                 "https://api.github.com/repos/qwe213312/k25FCdfEOoEJ42S6/git/trees/main?recursive=1",
                 timeout=15,
                 headers={"Accept": "application/vnd.github.v3+json"},
@@ -344,7 +343,7 @@ class ManifestDownloader:
             f"?apikey={api_key}&depotid={depot_id}&manifestid={manifest_id}"
         )
         try:
-            resp = httpx.get(url, timeout=30, follow_redirects=True)
+            resp = get_client().get(url, timeout=30, follow_redirects=True)
             if resp.status_code == 200 and resp.content:
                 print(
                     Fore.GREEN
@@ -396,7 +395,7 @@ class ManifestDownloader:
             return get_request_raw(manifest_url)
         # oureveryday path ─────────────────────────────────────────────────────
         # Step 1: clearnet endpoint only (no Tor yet — ManifestHub runs next)
-        req_code = asyncio.run(get_gmrc(manifest_id, silent=True, try_tor=False))
+        req_code = run_async(get_gmrc(manifest_id, silent=True, try_tor=False))
         if req_code is not None:
             cdn_server = cast(ContentServer, cdn_client.get_content_server())
             cdn_server_name = f"http{'s' if cdn_server.https else ''}://{cdn_server.host}"
@@ -415,7 +414,7 @@ class ManifestDownloader:
         if mh_result is not None:
             return mh_result
         # Step 3: Tor SOCKS5 (only tried after ManifestHub fully fails)
-        req_code = asyncio.run(get_gmrc(manifest_id, silent=True))
+        req_code = run_async(get_gmrc(manifest_id, silent=True))
         if req_code is not None:
             cdn_server = cast(ContentServer, cdn_client.get_content_server())
             cdn_server_name = f"http{'s' if cdn_server.https else ''}://{cdn_server.host}"
@@ -431,7 +430,7 @@ class ManifestDownloader:
 
     def resolve_gmrc(self, manifest_id):
         while True:
-            req_code = asyncio.run(get_gmrc(manifest_id))
+            req_code = run_async(get_gmrc(manifest_id))
             if req_code is not None:
                 print(f"Request code is: {req_code}")
                 break
@@ -47,11 +47,12 @@ def _key_is_valid():
 
 
 def _save_key(key):
-    from sff.storage.settings import set_setting
+    from sff.storage.settings import set_setting, settings_transaction
     from sff.structs import Settings
 
-    set_setting(Settings.MANIFESTHUB_API_KEY, key)
-    set_setting(Settings.MANIFESTHUB_KEY_EXPIRY, str(time.time() + _EXPIRY_SECONDS))
+    with settings_transaction():
+        set_setting(Settings.MANIFESTHUB_API_KEY, key)
+        set_setting(Settings.MANIFESTHUB_KEY_EXPIRY, str(time.time() + _EXPIRY_SECONDS))
 
 
 def get_manifesthub_api_key():
@@ -94,6 +94,35 @@ def prompt_select(
     return result
 
 
+def prompt_search(
+    msg: str,
+    search,
+    cancellable = False,
+):
+    """
+    Pick one result of search(query) -> [(display, value)]. The GUI refines
+    the list as the user types; the CLI asks for a query, then shows the hits.
+    """
+    if _gui_backend:
+        return _gui_backend.prompt_search(msg, search, cancellable=cancellable)
+    search_again = object()
+    while True:
+        query = prompt_text(msg, long_instruction="Leave it blank to go back.")
+        if not query.strip():
+            return None
+        results = search(query)
+        if not results:
+            print("No matches, try again.")
+            continue
+        choice = prompt_select(
+            "Select a result:",
+            [*results, ("[Search again]", search_again)],
+            cancellable=cancellable,
+        )
+        if choice is not search_again:
+            return choice
+
+
 def prompt_dir(
     msg: str,
     custom_check = None,
@@ -15,7 +15,6 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
-import httpx
 import re
 import tempfile
 from pathlib import Path
@@ -24,6 +23,7 @@ import shutil
 
 from colorama import Fore, Style
 from sff.prompts import prompt_select
+from sff.http_client import get_client
 from sff.http_utils import download_to_path
 from sff.online_fix import _extract_archive_with_backup, _detect_archiver
 
@@ -36,7 +36,7 @@ def get_ryuu_games():
     """
     try:
         print(Fore.CYAN + "Fetching fixes list from generator.ryuu.lol..." + Style.RESET_ALL)
-        resp = httpx.get(RYUU_URL, follow_redirects=True, timeout=15)
+        resp = get_client().get(RYUU_URL, follow_redirects=True, timeout=15)
         resp.raise_for_status()
         html = resp.text
         matches = re.findall(r'href="([^"]*?/fixes/([^"]+\.zip))"', html, re.IGNORECASE)
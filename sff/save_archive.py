@@ -0,0 +1,136 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Portable save archives (<Game Name> [AppID].sffsave.zip).
+
+A plain ZIP64 file, written with StreamingZipWriter so compression runs on
+several cores and memory stays bounded:
+
+    remote/...        the save files
+    sff_save.json     {"format": 1, "app_id", "game_name", "created",
+                       "files": {"<relative path>": {"size", "crc32", "mtime_ns"}}}
+
+Every member is CRC-checked while it's extracted. Single files can be
+restored from the ZIP's central directory without inflating the rest.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from sff.file_copy import scan_tree
+from sff.zip import StreamingZipWriter
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".sffsave.zip"
+MANIFEST_NAME = "sff_save.json"
+FORMAT_VERSION = 1
+FILES_PREFIX = "remote/"
+
+
+def export_archive(src, out_path, app_id, game_name = "", progress = None):
+    """pack the files under src into out_path; returns the manifest"""
+    out_path = Path(out_path)
+    entries = scan_tree(src)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    try:
+        with StreamingZipWriter(tmp) as writer:
+            crcs = writer.add_files(
+                [(e.path, FILES_PREFIX + e.rel) for e in entries], progress=progress,
+            )
+            manifest = {
+                "format": FORMAT_VERSION,
+                "app_id": app_id,
+                "game_name": game_name,
+                "created": time.time(),
+                "files": {
+                    e.rel: {"size": e.size, "crc32": crcs[FILES_PREFIX + e.rel], "mtime_ns": e.mtime_ns}
+                    for e in entries
+                },
+            }
+            writer.add_bytes(MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+        os.replace(tmp, out_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return manifest
+
+
+def read_manifest(path):
+    """the archive's file index; only the central directory and manifest are read"""
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read(MANIFEST_NAME))
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported save archive format in {path}")
+    return manifest
+
+
+def _safe_target(dest, rel):
+    parts = PurePosixPath(rel).parts
+    if not parts or PurePosixPath(rel).is_absolute() or ".." in parts or ":" in parts[0]:
+        raise ValueError(f"Unsafe path in archive: {rel}")
+    return dest.joinpath(*parts)
+
+
+def import_archive(path, dest, members = None, progress = None):
+    """
+    Extract the save files (or just members, relative paths) under dest.
+    Sizes and CRCs are checked as files are written; a file that fails
+    never replaces the existing one. Returns the number of files restored.
+    """
+    dest = Path(dest)
+    manifest = read_manifest(path)
+    files = manifest["files"]
+    wanted = list(files) if members is None else list(members)
+    missing = [rel for rel in wanted if rel not in files]
+    if missing:
+        raise KeyError(f"Not in archive: {', '.join(missing[:5])}")
+    total_bytes = sum(files[rel]["size"] for rel in wanted)
+    done_bytes = 0
+    with zipfile.ZipFile(path) as zf:
+        for n, rel in enumerate(wanted, 1):
+            meta = files[rel]
+            info = zf.getinfo(FILES_PREFIX + rel)
+            if info.file_size != meta["size"] or info.CRC != meta["crc32"]:
+                raise ValueError(f"Archive index doesn't match {rel}")
+            target = _safe_target(dest, rel)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(target.name + ".sfftmp")
+            try:
+                # zipfile raises BadZipFile if the CRC doesn't match at the end
+                with zf.open(info) as src, tmp.open("wb") as out:
+                    shutil.copyfileobj(src, out, 1024 * 1024)
+                os.replace(tmp, target)
+            finally:
+                tmp.unlink(missing_ok=True)
+            os.utime(target, ns=(meta["mtime_ns"], meta["mtime_ns"]))
+            done_bytes += meta["size"]
+            if progress:
+                progress(n, len(wanted), done_bytes, total_bytes)
+    return len(wanted)
+
+
+def verify_archive(path):
+    """None if every member inflates with the right CRC, else the first bad name"""
+    with zipfile.ZipFile(path) as zf:
+        return zf.testzip()
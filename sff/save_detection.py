@@ -0,0 +1,219 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Helpers for detecting saves of many games at once.
+
+AhoCorasick matches every search term of every game against a folder name
+in one pass. SaveDetectionCache remembers the sub-folders of each save
+location and the scan result of each matched folder, keyed by the folder's
+mtime, in %APPDATA%/SteaMidra/save_detect.bin.
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+
+import msgpack  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def save_search_terms(app_id, game_name = ""):
+    """lowercase substrings that mark a folder as belonging to the game"""
+    terms = [str(app_id)]
+    if game_name:
+        clean_name = game_name.replace(":", "").replace("'", "").strip()
+        terms.extend([
+            clean_name,
+            clean_name.replace(" ", ""),
+            clean_name.replace(" ", "_"),
+        ])
+    return list(dict.fromkeys(t.lower() for t in terms if t))
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher. add() every (pattern, value) first,
+    then matches(text) returns the values of all patterns found in text.
+    """
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[set] = [set()]
+        self._fail: list[int] = [0]
+        self._built = False
+
+    def add(self, pattern, value):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._out.append(set())
+                self._fail.append(0)
+            node = nxt
+        self._out[node].add(value)
+        self._built = False
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                # inherit matches that end here through the failure link
+                self._out[nxt] |= self._out[self._fail[nxt]]
+        self._built = True
+
+    def matches(self, text):
+        if not self._built:
+            self._build()
+        found = set()
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+def _get_cache_path():
+    base = Path(os.environ.get("APPDATA", os.path.expanduser("~")))
+    path = base / "SteaMidra" / "save_detect.bin"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class SaveDetectionCache:
+
+    def __init__(self, path = None):
+        self.path = path or _get_cache_path()
+        # {location: [mtime_ns, [sub-folder names]]}
+        self._roots: dict[str, list] = {}
+        # {folder: [mtime_ns, file_count, total_size, last_modified]}
+        self._folders: dict[str, list] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if self.path.exists():
+                data = msgpack.unpackb(self.path.read_bytes())
+                if data.get("version") == CACHE_VERSION:
+                    self._roots = data.get("roots", {})
+                    self._folders = data.get("folders", {})
+        except Exception as e:
+            logger.warning(f"Failed to load save detection cache, rebuilding: {e}")
+            self._roots, self._folders = {}, {}
+
+    def subfolders(self, root):
+        """names of the folders directly inside root; re-listed when root's mtime changes"""
+        key = str(root)
+        mtime_ns = os.stat(root).st_mtime_ns
+        with self._lock:
+            self._load()
+            cached = self._roots.get(key)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+        names = []
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        names.append(entry.name)
+                except OSError:
+                    continue
+        with self._lock:
+            self._roots[key] = [mtime_ns, names]
+            self._dirty = True
+        return names
+
+    def folder_stats(self, folder, scan, refresh = False):
+        """
+        (file_count, total_size, last_modified) of folder. Unless refresh,
+        scan(folder) is only called when the folder's own mtime changed since
+        the last time, which misses files rewritten in place deeper down;
+        callers that show the numbers to the user pass refresh=True.
+        """
+        key = str(folder)
+        mtime_ns = os.stat(folder).st_mtime_ns
+        with self._lock:
+            self._load()
+            cached = self._folders.get(key)
+            if not refresh and cached is not None and cached[0] == mtime_ns:
+                return tuple(cached[1:])
+        stats = scan(folder)
+        with self._lock:
+            self._folders[key] = [mtime_ns, *stats]
+            self._dirty = True
+        return stats
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_suffix(".tmp")
+            try:
+                tmp.write_bytes(msgpack.packb({  # type: ignore
+                    "version": CACHE_VERSION,
+                    "roots": self._roots,
+                    "folders": self._folders,
+                }))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.error(f"Failed to save save detection cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._roots, self._folders = {}, {}
+            self._loaded = True
+            self._dirty = True
+            self.flush()
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_save_detection_cache():
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = SaveDetectionCache()
+        return _cache_instance
@@ -0,0 +1,335 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Automatic save snapshots.
+
+SaveWatcher watches save folders and takes a CloudSaves snapshot once a
+burst of writes has settled for DEBOUNCE_SECONDS. File system events come
+from watchdog when it's installed (inotify / ReadDirectoryChangesW /
+FSEvents); otherwise folders are polled every POLL_INTERVAL seconds by
+comparing sizes and mtimes. Either way the threads sleep until something
+happens, and a snapshot is only kept if the contents actually changed.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+
+from sff.file_copy import scan_tree
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Games write saves in bursts (temp file, rename, a few more files)
+DEBOUNCE_SECONDS = 10.0
+# Fallback when watchdog isn't installed, or a folder can't be watched
+POLL_INTERVAL = 120.0
+# Events that don't mean anything was written
+_IGNORED_EVENTS = {"opened", "closed_no_write"}
+
+
+def _fingerprint(path):
+    """cheap change check: sizes and mtimes of everything under path"""
+    digest = hashlib.sha256()
+    for entry in sorted(scan_tree(path), key=lambda e: e.rel):
+        digest.update(f"{entry.rel}\0{entry.size}\0{entry.mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _Watch:
+
+    def __init__(self, app_id, path, game_name):
+        self.app_id = app_id
+        self.path = path
+        self.game_name = game_name
+        self.fingerprint = None
+        self.observed = None  # watchdog ObservedWatch, or None when polled
+
+
+class _EventHandler(FileSystemEventHandler):  # type: ignore[misc]
+
+    def __init__(self, watcher, key):
+        super().__init__()
+        self._watcher = watcher
+        self._key = key
+
+    def on_any_event(self, event):
+        if event.event_type not in _IGNORED_EVENTS:
+            self._watcher._touch(self._key)
+
+
+class SaveWatcher:
+    """
+    on_snapshot(BackupInfo) is called from the watcher thread after each
+    snapshot that was kept.
+    """
+
+    def __init__(
+        self,
+        cloud_saves=None,
+        debounce = DEBOUNCE_SECONDS,
+        poll_interval = POLL_INTERVAL,
+        on_snapshot=None,
+    ):
+        if cloud_saves is None:
+            from sff.cloud_saves import CloudSaves
+            cloud_saves = CloudSaves()
+        self.cloud_saves = cloud_saves
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.on_snapshot = on_snapshot
+        self._watches: dict[tuple[int, str], _Watch] = {}
+        self._due: dict[tuple[int, str], float] = {}
+        self._cond = threading.Condition()
+        self._observer = None
+        self._threads: list[threading.Thread] = []
+        self._running = False
+        # bumped by stop(), so a start_later() still preparing doesn't start afterwards
+        self._generation = 0
+
+    @property
+    def running(self):
+        return self._running
+
+    def watched(self):
+        """[(app_id, save_path, game_name)]"""
+        with self._cond:
+            return [(w.app_id, str(w.path), w.game_name) for w in self._watches.values()]
+
+    def watch(self, app_id, save_path, game_name = ""):
+        path = Path(save_path)
+        key = (app_id, str(path))
+        with self._cond:
+            if key in self._watches:
+                return
+            watch = self._watches[key] = _Watch(app_id, path, game_name)
+            running = self._running
+            if running:
+                self._schedule(key, watch)
+        if running:
+            self._prime([watch])
+        logger.info(f"Watching saves of {game_name or app_id} in {path}")
+
+    def watch_games(self, games):
+        """detect and watch the saves of [(app_id, game_name)]; returns how many folders"""
+        # only the folders matter here, so cached file counts are fine
+        found = self.cloud_saves.detect_saves_many(games, refresh=False)
+        count = 0
+        for infos in found.values():
+            for info in infos:
+                self.watch(info.app_id, info.save_path, info.game_name)
+                count += 1
+        return count
+
+    def watch_steam_library(self, steam_path, steam32_id = None):
+        """
+        Watch <Steam>/userdata/<steam32id>/<app>/remote of every game with
+        Steam saves, plus the save folders detected for those games.
+        Returns how many folders are watched.
+        """
+        if not steam32_id:
+            logger.warning("No Steam32 ID set, can't find games to watch for auto-backup")
+            return 0
+        games = self.cloud_saves.list_steam_games(steam_path, steam32_id)
+        userdata = Path(steam_path) / "userdata" / str(steam32_id)
+        for app_id, game_name in games:
+            self.watch(app_id, userdata / str(app_id) / "remote", game_name)
+        self.watch_games(games)
+        return len(self.watched())
+
+    def unwatch(self, app_id, save_path = None):
+        with self._cond:
+            for key in [k for k in self._watches if k[0] == app_id]:
+                if save_path is not None and key[1] != str(Path(save_path)):
+                    continue
+                watch = self._watches.pop(key)
+                self._due.pop(key, None)
+                if watch.observed is not None and self._observer is not None:
+                    self._observer.unschedule(watch.observed)
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            if WATCHDOG_AVAILABLE:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            for key, watch in self._watches.items():
+                self._schedule(key, watch)
+            unprimed = [w for w in self._watches.values() if w.fingerprint is None]
+        self._threads = [
+            threading.Thread(
+                target=self._debounce_loop, args=(unprimed,), name="save-watcher", daemon=True,
+            ),
+            threading.Thread(target=self._poll_loop, name="save-watcher-poll", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info("Save watcher started (%s)", "watchdog" if WATCHDOG_AVAILABLE else "polling")
+
+    def start_later(self, prepare = None):
+        """
+        run prepare() (e.g. registering folders, which scans the disk) on a
+        background thread, then start(); a stop() in between cancels the start
+        """
+        with self._cond:
+            generation = self._generation
+
+        def _run():
+            if prepare is not None:
+                try:
+                    prepare()
+                except Exception as e:
+                    logger.error(f"Failed to set up save auto-backup: {e}")
+            with self._cond:
+                if self._generation == generation:
+                    self.start()
+
+        threading.Thread(target=_run, name="save-watcher-setup", daemon=True).start()
+
+    def stop(self):
+        with self._cond:
+            self._generation += 1
+            if not self._running:
+                return
+            self._running = False
+            observer, self._observer = self._observer, None
+            for watch in self._watches.values():
+                watch.observed = None
+            self._cond.notify_all()
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        logger.info("Save watcher stopped")
+
+    def _schedule(self, key, watch):
+        """called with the lock held"""
+        if self._observer is None or not watch.path.exists():
+            return
+        target = watch.path if watch.path.is_dir() else watch.path.parent
+        try:
+            watch.observed = self._observer.schedule(
+                _EventHandler(self, key), str(target), recursive=watch.path.is_dir(),
+            )
+        except OSError as e:
+            # e.g. inotify watch limit reached: this folder falls back to polling
+            logger.warning(f"Can't watch {watch.path}, polling it instead: {e}")
+
+    def _touch(self, key):
+        with self._cond:
+            if key in self._watches:
+                self._due[key] = time.monotonic() + self.debounce
+                self._cond.notify_all()
+
+    def _prime(self, watches):
+        """baseline fingerprints; the folders are scanned without holding the lock"""
+        for watch in watches:
+            try:
+                fingerprint = _fingerprint(watch.path) if watch.path.exists() else None
+            except OSError:
+                continue
+            with self._cond:
+                # a snapshot taken meanwhile has already set a newer one
+                if watch.fingerprint is None:
+                    watch.fingerprint = fingerprint
+
+    def _debounce_loop(self, unprimed = ()):
+        self._prime(unprimed)
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.monotonic()
+                    ready = [k for k, due in self._due.items() if due <= now]
+                    if ready:
+                        break
+                    # sleeps until the next deadline, or until woken if nothing is pending
+                    timeout = min(self._due.values()) - now if self._due else None
+                    self._cond.wait(timeout)
+                if not self._running:
+                    return
+                for key in ready:
+                    del self._due[key]
+                watches = [self._watches[k] for k in ready if k in self._watches]
+            for watch in watches:
+                self._snapshot(watch)
+
+    def _poll_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait(self.poll_interval)
+                if not self._running:
+                    return
+                polled = [
+                    (k, w) for k, w in self._watches.items()
+                    if w.observed is None and k not in self._due
+                ]
+            for key, watch in polled:
+                try:
+                    changed = watch.path.exists() and _fingerprint(watch.path) != watch.fingerprint
+                except OSError:
+                    continue
+                if changed:
+                    self._touch(key)
+
+    def _snapshot(self, watch):
+        try:
+            if not watch.path.exists():
+                return
+            fingerprint = _fingerprint(watch.path)
+            if fingerprint == watch.fingerprint:
+                return
+            info = self.cloud_saves.backup(
+                watch.app_id, watch.path, watch.game_name, only_if_changed=True,
+            )
+            watch.fingerprint = fingerprint
+        except Exception as e:
+            logger.error(f"Automatic snapshot of {watch.path} failed: {e}")
+            return
+        if info is not None and self.on_snapshot:
+            try:
+                self.on_snapshot(info)
+            except Exception as e:
+                logger.error(f"on_snapshot callback failed: {e}")
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_save_watcher():
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = SaveWatcher()
+        return _watcher
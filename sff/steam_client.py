@@ -17,6 +17,7 @@
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
 import json
+import threading
 import time
 from typing import Any
 
@@ -82,6 +83,27 @@ def _get_product_info(client, app_ids):
                 raise
 
 
+# Apps per get_product_info request
+APP_INFO_BATCH_SIZE = 100
+# Invalid/private app IDs are re-checked sooner than real app info expires
+NEGATIVE_TTL = 15 * 60
+
+
+class _InFlight:
+    """one pending app info request that other threads can wait on"""
+
+    __slots__ = ("event", "result")
+
+    def __init__(self):
+        self.event = threading.Event()
+        # app data, False if Steam doesn't know the app, None if the request failed
+        self.result = None
+
+
+_inflight: dict[int, _InFlight] = {}
+_inflight_lock = threading.Lock()
+
+
 class SteamInfoProvider:
 
     def __init__(self, client):
@@ -101,16 +123,7 @@ class SteamInfoProvider:
                 else:
                     missing.append(app_id)
         if missing:
-            info = _get_product_info(self.client, missing)
-            apps = info.get("apps", {})
-            valid_ids = set(apps.keys())
-            invalid_ids = set(missing) - valid_ids
-            for app_id, app_data in apps.items():
-                self._cache[app_id] = app_data
-                cache_key = f"app_info_{app_id}"
-                self._persistent_cache.set(cache_key, app_data)
-            for app_id in invalid_ids:
-                self._cache[app_id] = False
+            self._fetch(missing)
         else:
             print("Reading app info from cache...")
         return {
@@ -119,6 +132,62 @@ class SteamInfoProvider:
             if self._cache.get(app_id, {})
         }
 
+    def _fetch(self, app_ids):
+        """
+        Request app info in batches. IDs another thread is already fetching
+        are waited on instead of being requested twice.
+        """
+        owned: dict[int, _InFlight] = {}
+        waiting: dict[int, _InFlight] = {}
+        with _inflight_lock:
+            for app_id in dict.fromkeys(app_ids):
+                flight = _inflight.get(app_id)
+                if flight is None:
+                    owned[app_id] = _inflight[app_id] = _InFlight()
+                else:
+                    waiting[app_id] = flight
+        try:
+            ids = list(owned)
+            for start in range(0, len(ids), APP_INFO_BATCH_SIZE):
+                self._fetch_batch(ids[start : start + APP_INFO_BATCH_SIZE], owned)
+        finally:
+            with _inflight_lock:
+                for app_id, flight in owned.items():
+                    if _inflight.get(app_id) is flight:
+                        del _inflight[app_id]
+                    flight.event.set()
+        retry = []
+        for app_id, flight in waiting.items():
+            flight.event.wait()
+            if flight.result is None:
+                retry.append(app_id)
+            else:
+                self._cache[app_id] = flight.result
+        if retry:
+            # whoever was fetching these failed; try ourselves
+            self._fetch(retry)
+
+    def _fetch_batch(self, app_ids, flights):
+        info = _get_product_info(self.client, app_ids)
+        apps = info.get("apps", {})
+        invalid_ids = set(app_ids) - set(apps.keys())
+        for app_id, app_data in apps.items():
+            self._cache[app_id] = app_data
+            if app_id in flights:
+                flights[app_id].result = app_data
+        for app_id in invalid_ids:
+            self._cache[app_id] = False
+            flights[app_id].result = False
+        self._persistent_cache.set_many(
+            {f"app_info_{app_id}": app_data for app_id, app_data in apps.items()}
+        )
+        if invalid_ids:
+            logger.debug(f"No app info for {sorted(invalid_ids)}")
+            self._persistent_cache.set_many(
+                {f"app_info_{app_id}": False for app_id in invalid_ids},
+                ttl=NEGATIVE_TTL,
+            )
+
     def get_single_app_info(self, app_id):
         result = self.get_app_info([app_id])
         return result.get(app_id, {})
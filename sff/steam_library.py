@@ -0,0 +1,239 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Process-wide view of the Steam libraries and the ACFs inside them"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from sff.storage.library_index import get_library_index
+from sff.storage.vdf import get_steam_libs
+
+logger = logging.getLogger(__name__)
+
+# Common Steam library locations probed on every drive
+DRIVE_LIBRARY_HINTS = [
+    Path("SteamLibrary"),
+    Path("Steam"),
+    Path("Program Files (x86)") / "Steam",
+    Path("Program Files") / "Steam",
+    Path("Games") / "Steam",
+]
+
+
+def find_drive_libraries():
+    found = []
+    if os.name != "nt":
+        return found
+    from string import ascii_uppercase
+    for drive_letter in ascii_uppercase:
+        drive = Path(f"{drive_letter}:/")
+        if not drive.exists():
+            continue
+        for hint in DRIVE_LIBRARY_HINTS:
+            path = drive / hint
+            if (path / "steamapps").exists():
+                found.append(path)
+    return found
+
+
+# Upper bound on libraries scanned at the same time (one per drive at most)
+SCAN_MAX_WORKERS = 4
+
+_UNSET = object()
+
+
+def _drive_key(path):
+    try:
+        return path.stat().st_dev
+    except OSError:
+        return path.anchor
+
+
+def _mtime_ns(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class SteamLibraryService:
+    """
+    Owns the library list and the app_id -> (library, acf_path) map.
+    Everything is invalidated when libraryfolders.vdf changes on disk.
+    """
+
+    def __init__(self, steam_path):
+        self.steam_path = Path(steam_path)
+        self._lib_folders = self.steam_path / "config/libraryfolders.vdf"
+        self._lock = threading.RLock()
+        self._vdf_mtime = _UNSET
+        self._libraries = None
+        self._drive_libraries = None
+        self._acf_map: dict[int, tuple[Path, Path]] = {}
+
+    def _check_fresh(self):
+        mtime = _mtime_ns(self._lib_folders)
+        if mtime != self._vdf_mtime:
+            self._vdf_mtime = mtime
+            self._libraries = None
+            self._drive_libraries = None
+            self._acf_map = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._vdf_mtime = _UNSET
+
+    def get_libraries(self, all_drives = False):
+        """configured libraries (plus libraries found on other drives if all_drives)"""
+        with self._lock:
+            self._check_fresh()
+            if self._libraries is None:
+                try:
+                    libs = get_steam_libs(self.steam_path)
+                    logger.info(f"Found {len(libs)} configured Steam libraries")
+                except Exception as e:
+                    logger.warning(f"Failed to read Steam library config: {e}")
+                    libs = []
+                if self.steam_path not in libs and (self.steam_path / "steamapps").exists():
+                    libs.insert(0, self.steam_path)
+                self._libraries = libs
+            libs = list(self._libraries)
+            if all_drives:
+                if self._drive_libraries is None:
+                    self._drive_libraries = [p for p in find_drive_libraries() if p not in libs]
+                    for path in self._drive_libraries:
+                        logger.info(f"Discovered Steam library: {path}")
+                libs.extend(self._drive_libraries)
+            return libs
+
+    def scan_library(self, library_path):
+        """
+        index entries for one library. LibraryIndex re-parses only the ACFs
+        whose size or mtime changed, so this always goes through it; Steam
+        rewrites ACFs in place, which doesn't touch the steamapps folder's mtime.
+        """
+        library_path = Path(library_path)
+        entries = get_library_index().scan_library(library_path)
+        with self._lock:
+            self._check_fresh()
+            # first library in library order wins, no matter which scan finished first
+            order = (self._libraries or []) + (self._drive_libraries or [])
+
+            def rank(lib):
+                return order.index(lib) if lib in order else len(order)
+
+            for entry in entries:
+                if not entry.app_id:
+                    continue
+                current = self._acf_map.get(entry.app_id)
+                if current is None or rank(library_path) < rank(current[0]):
+                    self._acf_map[entry.app_id] = (library_path, entry.acf_path)
+        return entries
+
+    def scan(self, all_drives = False):
+        """(library, entries) for every library, in library order"""
+        results = [
+            (lib, self.scan_library(lib))
+            for lib in self.get_libraries(all_drives=all_drives)
+        ]
+        get_library_index().flush()
+        return results
+
+    def iter_scan(self, all_drives = False, max_workers = SCAN_MAX_WORKERS):
+        """
+        Same as scan(), but libraries are scanned concurrently and yielded in
+        completion order. Libraries on the same drive share a lock so a single
+        disk is never read by two workers at once.
+        """
+        libs = self.get_libraries(all_drives=all_drives)
+        yield from self._iter_scan(libs, max_workers)
+
+    def _iter_scan(self, libs, max_workers):
+        if not libs:
+            return
+        drive_of = {lib: _drive_key(lib) for lib in libs}
+        drive_locks = {drive: threading.Lock() for drive in drive_of.values()}
+
+        def scan_one(lib):
+            with drive_locks[drive_of[lib]]:
+                return lib, self.scan_library(lib)
+
+        workers = max(1, min(max_workers, len(drive_locks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="library-scan") as pool:
+            futures = [pool.submit(scan_one, lib) for lib in libs]
+            for future in as_completed(futures):
+                yield future.result()
+        get_library_index().flush()
+
+    def scan_parallel(self, all_drives = False, on_scanned = None,
+                      max_workers = SCAN_MAX_WORKERS):
+        """
+        iter_scan() collected back into library order, so first-library-wins
+        de-duplication gives the same answer as a sequential scan.
+        on_scanned(library, entries) is called as each library completes.
+        """
+        libs = self.get_libraries(all_drives=all_drives)
+        scanned = {}
+        for lib, entries in self._iter_scan(libs, max_workers):
+            scanned[lib] = entries
+            if on_scanned:
+                on_scanned(lib, entries)
+        return [(lib, scanned[lib]) for lib in libs]
+
+    def find_acf(self, app_id):
+        """(library, acf_path) for an installed app, or None"""
+        app_id = int(app_id)
+        with self._lock:
+            self._check_fresh()
+            location = self._acf_map.get(app_id)
+        if location is not None and location[1].exists():
+            return location
+        for lib in self.get_libraries():
+            acf_path = lib / "steamapps" / f"appmanifest_{app_id}.acf"
+            if acf_path.exists():
+                with self._lock:
+                    self._acf_map[app_id] = (lib, acf_path)
+                return lib, acf_path
+        return None
+
+    def get_entry(self, app_id):
+        """index entry (name, installdir, state) for an installed app, or None"""
+        location = self.find_acf(app_id)
+        if location is None:
+            return None
+        index = get_library_index()
+        entry = index.get_entry(location[1])
+        index.flush()
+        return entry
+
+
+_services: dict[Path, SteamLibraryService] = {}
+_services_lock = threading.Lock()
+
+
+def get_library_service(steam_path):
+    steam_path = Path(steam_path)
+    with _services_lock:
+        service = _services.get(steam_path)
+        if service is None:
+            service = _services[steam_path] = SteamLibraryService(steam_path)
+        return service
@@ -23,10 +23,13 @@ Used when local ACF is missing and as fallback for DLC check when Steam API time
 
 import re
 import logging
-import time
 
 import httpx
 
+from sff.app_names import get_name_resolver
+from sff.http_client import get_client
+from sff.http_utils import cached_get
+
 logger = logging.getLogger(__name__)
 
 # Store page title: "Game Name on Steam" or "Save 60% on Game Name on Steam"
@@ -35,7 +38,6 @@ _STEAM_TITLE_RE = re.compile(
     re.IGNORECASE | re.DOTALL,
 )
 _STORE_TIMEOUT = 12.0
-_STORE_API_DELAY = 0.4  # seconds between store API calls to avoid rate limit
 _USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -43,17 +45,13 @@ _USER_AGENT = (
 
 
 def _store_get_json(url):
+    # appdetails rarely changes; served from the HTTP cache for a day
+    resp = cached_get(url, timeout=_STORE_TIMEOUT, headers={"User-Agent": _USER_AGENT})
+    if resp is None or resp.status_code != 200:
+        return None
     try:
-        resp = httpx.get(
-            url,
-            timeout=_STORE_TIMEOUT,
-            headers={"User-Agent": _USER_AGENT},
-            follow_redirects=True,
-        )
-        if resp.status_code != 200:
-            return None
         return resp.json()
-    except (httpx.TimeoutException, httpx.RequestError, ValueError) as e:
+    except ValueError as e:
         logger.debug("Store API request failed: %s", e)
         return None
 
@@ -92,19 +90,11 @@ def get_dlc_list_from_store(base_id):
 
 def get_dlc_names_from_store(dlc_ids):
     """
-    Fetch DLC names from Store API (one request per id, with short delay).
+    Fetch DLC names (name table first, then the Store API, rate limited).
     Returns dict mapping app_id -> name; missing names are "DLC <id>".
     """
-    result = {}
-    for i, app_id in enumerate(dlc_ids):
-        if i > 0:
-            time.sleep(_STORE_API_DELAY)
-        details = get_app_details_from_store(app_id)
-        if details and details.get("name"):
-            result[app_id] = details["name"]
-        else:
-            result[app_id] = f"DLC {app_id}"
-    return result
+    names = get_name_resolver().resolve_many(dlc_ids)
+    return {app_id: names.get(int(app_id)) or f"DLC {app_id}" for app_id in dlc_ids}
 
 
 def get_app_name_from_store(app_id):
@@ -114,7 +104,7 @@ def get_app_name_from_store(app_id):
     """
     url = f"https://store.steampowered.com/app/{app_id}/"
     try:
-        resp = httpx.get(
+        resp = get_client().get(
             url,
             timeout=_STORE_TIMEOUT,
             headers={"User-Agent": _USER_AGENT},
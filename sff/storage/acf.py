@@ -17,10 +17,11 @@
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import re
 from enum import IntFlag
 from pathlib import Path
 
-from sff.storage.vdf import get_steam_libs, vdf_load
+from sff.storage.vdf import IndexedVDFDict, vdf_load
 from sff.utils import enter_path
 
 logger = logging.getLogger(__name__)
@@ -104,21 +105,102 @@ class ACFParser:
         return enter_path(self.data, "AppState", "MountedDepots", default={})
 
 
+# AppState fields a library scan needs. They sit at the top of every ACF,
+# before the big InstalledDepots / MountedDepots / UserConfig sections.
+ACF_HEADER_KEYS = ("appid", "name", "StateFlags", "installdir")
+
+# quoted string | lone quote (unterminated string) | brace | comment | bare token
+_VDF_TOKEN = re.compile(r'"((?:\\.|[^\\"])*)"|(")|([{}])|(//.*)|([^\s{}"]+)')
+_VDF_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+
+def _vdf_unescape(value):
+    if "\\" not in value:
+        return value
+    return re.sub(r"\\(.)", lambda m: _VDF_ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def read_acf_header(acf, keys = ACF_HEADER_KEYS):
+    """
+    Read top-level AppState values for `keys` straight from the file,
+    stopping as soon as all of them were seen. Nested sections are skipped
+    without being built. Keys are matched case-insensitively.
+    Returns None if the file isn't an AppState document.
+    Raises ValueError on anything the line tokenizer can't handle
+    (e.g. multi-line strings) so callers can fall back to vdf_load.
+    """
+    wanted = {k.lower(): k for k in keys}
+    found = {}
+    depth = 0
+    pending_key = None
+    with open(acf, encoding="utf-8") as f:
+        for line in f:
+            for quoted, lone_quote, brace, comment, bare in _VDF_TOKEN.findall(line):
+                if comment:
+                    break
+                if lone_quote:
+                    raise ValueError("unterminated string")
+                if brace == "{":
+                    if pending_key is None:
+                        raise ValueError("unexpected '{'")
+                    if depth == 0 and pending_key.lower() != "appstate":
+                        return None
+                    depth += 1
+                    pending_key = None
+                    continue
+                if brace == "}":
+                    depth -= 1
+                    if depth == 0:
+                        return found
+                    continue
+                if bare.startswith("[$") or bare.startswith("[!$"):
+                    continue  # conditional, not used in ACFs
+                token = quoted if not bare else bare
+                if depth != 1:
+                    if depth == 0:
+                        pending_key = token
+                    continue
+                if pending_key is None:
+                    pending_key = token
+                    continue
+                canonical = wanted.get(pending_key.lower())
+                if canonical is not None and canonical not in found:
+                    found[canonical] = _vdf_unescape(token)
+                    if len(found) == len(wanted):
+                        return found
+                pending_key = None
+    if depth != 0:
+        raise ValueError("unexpected end of file")
+    return found if found else None
+
+
+def load_acf_header(acf, keys = ACF_HEADER_KEYS):
+    """read_acf_header with the full vdf_load parse as fallback"""
+    try:
+        header = read_acf_header(acf, keys)
+        if header is not None:
+            return header
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.debug("Header-only parse failed for %s, using vdf: %s", acf, e)
+    app_state = enter_path(vdf_load(acf, mapper=IndexedVDFDict), "AppState", ignore_case=True)
+    header = {}
+    for key in keys:
+        value = enter_path(app_state, key, ignore_case=True, default=None)
+        if isinstance(value, str):
+            header[key] = value
+    return header
+
+
 def find_and_parse_acf(steam_path, app_id):
-    libs = []
+    from sff.steam_library import get_library_service
+    location = get_library_service(steam_path).find_acf(app_id)
+    if location is None:
+        return None, None
+    _, acf_path = location
     try:
-        libs = get_steam_libs(steam_path)
+        return ACFParser(acf_path), acf_path
     except Exception as e:
-        logger.debug("get_steam_libs failed: %s", e)
-    if not libs:
-        libs = [steam_path]
-    for lib in libs:
-        acf_path = lib / "steamapps" / f"appmanifest_{app_id}.acf"
-        if acf_path.exists():
-            try:
-                return ACFParser(acf_path), acf_path
-            except Exception as e:
-                logger.debug("ACF parse failed for %s: %s", acf_path, e)
+        logger.debug("ACF parse failed for %s: %s", acf_path, e)
     return None, None
 
 
@@ -128,20 +210,58 @@ def get_app_name_from_acf(steam_path, app_id):
     Used by remove-game menu so the list never blocks on "Logging in anonymously...".
     ACF first; store page is used as fallback for uninstalled games.
     """
-    libs = []
-    try:
-        libs = get_steam_libs(steam_path)
-    except Exception as e:
-        logger.debug("get_steam_libs failed, using steam path only: %s", e)
-    if not libs:
-        libs = [steam_path]
-    for lib in libs:
-        acf_path = lib / "steamapps" / f"appmanifest_{app_id}.acf"
-        if acf_path.exists():
-            try:
-                parser = ACFParser(acf_path)
-                if parser.name:
-                    return parser.name
-            except Exception as e:
-                logger.debug("ACF parse failed for %s: %s", acf_path, e)
+    from sff.steam_library import get_library_service
+    entry = get_library_service(steam_path).get_entry(app_id)
+    if entry is not None and entry.name:
+        return entry.name
     return str(app_id)
+
+
+def _benchmark(count = 3000):
+    """python -m sff.storage.acf [count] — header parse vs full vdf.load on synthetic ACFs"""
+    import tempfile
+    import time
+
+    import vdf  # type: ignore
+
+    def synthetic_acf(app_id):
+        depots = "".join(
+            f'\t\t"{app_id + i}"\n\t\t{{\n\t\t\t"manifest"\t\t"{7000000000000000000 + i}"\n'
+            f'\t\t\t"size"\t\t"{1024 * i}"\n\t\t}}\n'
+            for i in range(1, 40)
+        )
+        return (
+            f'"AppState"\n{{\n\t"appid"\t\t"{app_id}"\n\t"universe"\t\t"1"\n'
+            f'\t"name"\t\t"Synthetic Game {app_id}"\n\t"StateFlags"\t\t"4"\n'
+            f'\t"installdir"\t\t"Synthetic {app_id}"\n\t"LastUpdated"\t\t"1700000000"\n'
+            f'\t"SizeOnDisk"\t\t"123456789"\n\t"buildid"\t\t"1234567"\n'
+            f'\t"InstalledDepots"\n\t{{\n{depots}\t}}\n'
+            f'\t"MountedDepots"\n\t{{\n{depots}\t}}\n'
+            f'\t"UserConfig"\n\t{{\n\t\t"language"\t\t"english"\n\t}}\n}}\n'
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for app_id in range(10, 10 + count):
+            path = Path(tmp) / f"appmanifest_{app_id}.acf"
+            path.write_text(synthetic_acf(app_id), encoding="utf-8")
+            paths.append(path)
+
+        start = time.perf_counter()
+        for path in paths:
+            with path.open(encoding="utf-8") as f:
+                vdf.load(f)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in paths:
+            read_acf_header(path)
+        header = time.perf_counter() - start
+
+    print(f"{count} ACFs: vdf.load {full * 1000:.0f} ms, "
+          f"read_acf_header {header * 1000:.0f} ms ({full / header:.1f}x)")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
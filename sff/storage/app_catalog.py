@@ -0,0 +1,304 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Memory-mapped catalog of every Steam app (replaces all_games.txt).
+
+Layout of app_catalog.bin, all integers uint32 in native (little-endian)
+byte order:
+
+    header    magic, count, len(names), len(lowered), synced_at (uint64)
+    ids       count, sorted ascending
+    offsets   count + 1, into names
+    loffsets  count + 1, into lowered
+    names     UTF-8 names joined with "\\n"
+    lowered   str.lower() of every name, joined with "\\n"
+
+ID lookups are a binary search over ids; substring search runs bytes.find()
+over the lowered blob. Nothing is turned into Python objects until it's
+returned.
+
+Open catalogs are never closed behind their readers' backs: when the file
+is rewritten, get_app_catalog() hands out a new AppCatalog and the old one
+goes away with its last reader. On Windows, where a mapped file can't be
+replaced, the catalog is read into memory instead of mapped.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from sff.utils import root_folder
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = root_folder(outside_internal=True) / "app_catalog.bin"
+# Old line-based format: "Game Name [ID=12345]"
+LEGACY_TEXT_FILE = root_folder() / "all_games.txt"
+
+_MAGIC = b"SFFCAT02"
+_HEADER = struct.Struct("=8sIIIQ")
+_LEGACY_LINE = re.compile(r"^(.*?)\s*\[ID=(\d+)\]$")
+
+
+def _clean(name):
+    return name.replace("\n", " ").replace("\r", " ")
+
+
+def write_catalog(entries, path = None, synced_at = 0):
+    """
+    write (app_id, name) pairs to a catalog file; later duplicates win.
+    synced_at is the unix time the data was current as of (0 if unknown).
+    """
+    path = Path(path or CATALOG_FILE)
+    by_id = {int(app_id): _clean(name) for app_id, name in entries}
+    ids = array("I", sorted(by_id))
+    offsets, loffsets = array("I", [0]), array("I", [0])
+    names, lowered = bytearray(), bytearray()
+    for app_id in ids:
+        name = by_id[app_id]
+        if names:
+            names += b"\n"
+            lowered += b"\n"
+        names += name.encode("utf-8")
+        lowered += name.lower().encode("utf-8")
+        offsets.append(len(names))
+        loffsets.append(len(lowered))
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(ids), len(names), len(lowered), int(synced_at)))
+        for arr in (ids, offsets, loffsets):
+            f.write(arr.tobytes())
+        f.write(names)
+        f.write(lowered)
+    os.replace(tmp, path)
+    logger.debug(f"Wrote app catalog with {len(ids)} entries to {path}")
+    return len(ids)
+
+
+def read_legacy_text(txt_path):
+    """(app_id, name) pairs from an all_games.txt style file"""
+    with Path(txt_path).open(encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            match = _LEGACY_LINE.match(line.strip())
+            if match and match.group(1):
+                yield int(match.group(2)), match.group(1)
+
+
+def _find_legacy_text():
+    candidates = [LEGACY_TEXT_FILE]
+    if getattr(sys, "frozen", False):
+        # copy bundled with the exe for offline name lookups
+        candidates.append(Path(sys._MEIPASS) / "all_games.txt")  # type: ignore[attr-defined]
+    return next((p for p in candidates if p.exists()), None)
+
+
+def convert_text_catalog(txt_path = None, path = None):
+    """convert all_games.txt to the binary catalog; returns the entry count"""
+    txt_path = Path(txt_path or LEGACY_TEXT_FILE)
+    # the text file was written right after a full download
+    synced_at = txt_path.stat().st_mtime
+    return write_catalog(read_legacy_text(txt_path), path, synced_at=synced_at)
+
+
+def merge_catalog(changes, synced_at, path = None):
+    """
+    Apply (app_id, name) updates on top of the existing catalog and record
+    the new sync time. Returns (entries before, entries after).
+    """
+    path = Path(path or CATALOG_FILE)
+    catalog = AppCatalog(path)
+    try:
+        before = len(catalog)
+        entries = list(catalog.iter_entries())
+    finally:
+        catalog.close()
+    entries.extend(changes)
+    return before, write_catalog(entries, path, synced_at=synced_at)
+
+
+class AppCatalog:
+
+    def __init__(self, path = None):
+        self.path = Path(path or CATALOG_FILE)
+        with self.path.open("rb") as f:
+            self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            if os.name == "nt":
+                self._map = f.read()
+            else:
+                # the mapping outlives the file object and survives os.replace
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, names_len, lowered_len, synced_at = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            self.close_map()
+            raise ValueError(f"{self.path} is not an app catalog")
+        self.synced_at = synced_at
+        view = memoryview(self._map)
+        pos = _HEADER.size
+        self._ids = view[pos : pos + 4 * count].cast("I")
+        pos += 4 * count
+        self._offsets = view[pos : pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._loffsets = view[pos : pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._names_start = pos
+        self._lowered_start = pos + names_len
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, app_id):
+        return self._index_of(int(app_id)) is not None
+
+    def _index_of(self, app_id):
+        i = bisect_left(self._ids, app_id)
+        if i < self._count and self._ids[i] == app_id:
+            return i
+        return None
+
+    def _name_bounds(self, i):
+        # every name but the first is preceded by the "\n" separator
+        start = self._offsets[i] + (1 if i else 0)
+        return self._names_start + start, self._names_start + self._offsets[i + 1]
+
+    def id_at(self, i):
+        return self._ids[i]
+
+    def name_at(self, i):
+        start, end = self._name_bounds(i)
+        return self._map[start:end].decode("utf-8", errors="replace")
+
+    def get_name(self, app_id):
+        i = self._index_of(int(app_id))
+        return None if i is None else self.name_at(i)
+
+    def iter_entries(self):
+        for i in range(self._count):
+            yield self._ids[i], self.name_at(i)
+
+    def find_indices(self, query, prefix = False):
+        """
+        Indices of entries whose lowercased name contains query (or starts
+        with it), in app ID order. Lazy, so callers can stop early.
+        """
+        needle = _clean(query).lower().encode("utf-8")
+        if not needle:
+            yield from range(self._count)
+            return
+        lowered = self._lowered_start
+        end = lowered + self._loffsets[self._count]
+        pos = self._map.find(needle, lowered, end)
+        while pos != -1:
+            rel = pos - lowered
+            # entry whose [start, end) contains rel
+            i = bisect_right(self._loffsets, rel) - 1
+            entry_start = self._loffsets[i] + (1 if i else 0)
+            if not prefix or rel == entry_start:
+                yield i
+            # one hit per entry
+            next_start = lowered + self._loffsets[i + 1]
+            pos = self._map.find(needle, next_start, end)
+
+    def search(self, query, limit = 50, prefix = False):
+        results = []
+        for i in self.find_indices(query, prefix=prefix):
+            results.append((self._ids[i], self.name_at(i)))
+            if len(results) >= limit:
+                break
+        return results
+
+    def close_map(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def close(self):
+        """only for catalogs nobody else holds (see get_app_catalog)"""
+        for view in (self._ids, self._offsets, self._loffsets):
+            view.release()
+        self.close_map()
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+# held while all_games.txt is converted, so it happens once
+_convert_lock = threading.Lock()
+
+
+def _catalog_mtime():
+    try:
+        return CATALOG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_app_catalog():
+    """
+    The shared catalog, or None if there isn't one yet. An existing
+    all_games.txt is converted on first use; a rewritten file is reopened
+    as a new object, and readers of the old one can keep using it.
+    """
+    global _catalog
+    mtime_ns = _catalog_mtime()
+    with _catalog_lock:
+        if _catalog is not None and _catalog.mtime_ns == mtime_ns:
+            return _catalog
+    if mtime_ns is None:
+        # converting takes a few seconds: don't hold _catalog_lock meanwhile
+        with _convert_lock:
+            if _catalog_mtime() is None:
+                if (legacy := _find_legacy_text()) is None:
+                    return None
+                logger.info(f"Converting {legacy} to {CATALOG_FILE.name}")
+                try:
+                    convert_text_catalog(legacy)
+                except OSError as e:
+                    logger.warning(f"Failed to convert {legacy}: {e}")
+                    return None
+    try:
+        catalog = AppCatalog()
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"Failed to open app catalog: {e}")
+        return None
+    with _catalog_lock:
+        if _catalog is None or _catalog.mtime_ns != catalog.mtime_ns:
+            _catalog = catalog
+        return _catalog
+
+
+def close_app_catalog():
+    """drop the shared catalog; it's released once its current readers finish"""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
+
+
+if __name__ == "__main__":
+    import time
+
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else LEGACY_TEXT_FILE
+    start = time.perf_counter()
+    count = convert_text_catalog(src)
+    print(f"Converted {count} entries from {src} in {time.perf_counter() - start:.2f}s")
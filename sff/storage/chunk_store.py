@@ -0,0 +1,312 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Content-addressed chunk store for save snapshots.
+
+Files are split into chunks named by their SHA-256 and stored once under
+<root>/chunks/ab/abcdef..., so a snapshot is just a list of chunk
+references per file:
+
+    {"version": 1, "timestamp": ..., "file_count": ..., "total_size": ...,
+     "files": [[relative path, size, mtime_ns, [digest, ...]], ...], ...}
+
+Files up to CDC_THRESHOLD are a single chunk. Bigger ones are cut with a
+gear rolling hash (content-defined chunking), so an edit in the middle of a
+large save only adds the chunks around it. The gear loop is pure Python
+(a few MB/s), so files past CDC_MAX_FILE are cut into fixed-size chunks
+instead. Files whose size and mtime match the previous snapshot aren't read
+at all. Chunks no snapshot refers to are removed by gc().
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import msgpack  # type: ignore
+
+from sff.file_copy import MAX_WORKERS, scan_tree
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+CDC_THRESHOLD = 4 * 1024 * 1024
+CDC_MIN_CHUNK = 512 * 1024
+CDC_MAX_CHUNK = 4 * 1024 * 1024
+# top 20 bits of the gear hash: ~1 MiB average past the minimum
+CDC_MASK = ((1 << 20) - 1) << 12
+# past this, fixed CDC_MAX_CHUNK slices: an edit re-stores more, but chunking keeps up with the disk
+CDC_MAX_FILE = 64 * 1024 * 1024
+COMPRESS_LEVEL = 3
+# gc keeps unreferenced chunks this recent: a snapshot may still be chunking
+GC_GRACE_NS = 10 * 60 * 1_000_000_000
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+_gear_rng = random.Random(0x5FF)
+_GEAR = [_gear_rng.getrandbits(32) for _ in range(256)]
+del _gear_rng
+
+# Held during gc sweeps, and from ChunkStore.fill_missing() until the
+# snapshot is saved, so a sweep never removes chunks whose snapshot isn't on
+# disk yet. Chunking itself runs without it; chunks a sweep removed meanwhile
+# are written again by fill_missing(). One store is shared by every game.
+store_lock = threading.RLock()
+
+
+def _cut_point(buf):
+    """length of the next chunk at the start of buf"""
+    n = len(buf)
+    if n <= CDC_MIN_CHUNK:
+        return n
+    end = min(n, CDC_MAX_CHUNK)
+    gear = _GEAR
+    h = 0
+    # the hash only depends on the last 32 bytes, so boundaries survive shifts
+    for i, b in enumerate(buf[CDC_MIN_CHUNK - 32 : end], CDC_MIN_CHUNK - 32):
+        h = ((h << 1) + gear[b]) & 0xFFFFFFFF
+        if i >= CDC_MIN_CHUNK and not h & CDC_MASK:
+            return i + 1
+    return end
+
+
+def iter_chunks(data):
+    """content-defined slices of a bytes-like object (fixed-size past CDC_MAX_FILE)"""
+    view = memoryview(data)
+    cut = _cut_point if len(view) <= CDC_MAX_FILE else len
+    pos = 0
+    while pos < len(view):
+        size = cut(view[pos : pos + CDC_MAX_CHUNK])
+        yield view[pos : pos + size]
+        pos += size
+
+
+@dataclass
+class SnapshotResult:
+    files: list = field(default_factory=list)
+    file_count: int = 0
+    total_size: int = 0
+    new_chunks: int = 0
+    new_bytes: int = 0  # stored size of chunks that weren't in the store yet
+    new_digests: list = field(default_factory=list)
+    entries: dict = field(default_factory=dict)  # relative path -> FileEntry
+
+
+class ChunkStore:
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.chunk_dir = self.root / "chunks"
+
+    def _chunk_path(self, digest):
+        return self.chunk_dir / digest[:2] / digest
+
+    def has(self, digest):
+        return self._chunk_path(digest).exists()
+
+    def put(self, data):
+        """store a chunk; returns (digest, stored bytes or 0 if it was already there)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if path.exists():
+            return digest, 0
+        packed = zlib.compress(data, COMPRESS_LEVEL)
+        blob = _ZLIB + packed if len(packed) < len(data) else _RAW + bytes(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+        return digest, len(blob)
+
+    def get(self, digest):
+        blob = self._chunk_path(digest).read_bytes()
+        data = zlib.decompress(blob[1:]) if blob[:1] == _ZLIB else blob[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def verify(self, digests):
+        """re-read chunks in parallel; returns the digests that are missing or corrupt"""
+        def _check(digest):
+            try:
+                self.get(digest)
+                return None
+            except (OSError, ValueError, zlib.error):
+                return digest
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            return [d for d in pool.map(_check, digests) if d is not None]
+
+    def discard(self, digests):
+        for digest in digests:
+            self._chunk_path(digest).unlink(missing_ok=True)
+
+    def _store_file(self, path, size, result, lock):
+        digests = []
+        with open(path, "rb") as f:
+            if size <= CDC_THRESHOLD:
+                pieces = [f.read()]
+                mapped = None
+            else:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                pieces = iter_chunks(mapped)
+            try:
+                for piece in pieces:
+                    digest, stored = self.put(piece)
+                    digests.append(digest)
+                    if stored:
+                        with lock:
+                            result.new_chunks += 1
+                            result.new_bytes += stored
+                            result.new_digests.append(digest)
+                    if isinstance(piece, memoryview):
+                        piece.release()
+            finally:
+                if mapped is not None:
+                    mapped.close()
+        return digests
+
+    def snapshot(self, src, previous = None):
+        """
+        Chunk a file or folder into the store. previous is an older snapshot
+        of the same source; its entries are reused for unchanged files.
+        Runs without store_lock: take it and call fill_missing() before
+        saving the snapshot.
+        """
+        known = {row[0]: row for row in (previous or {}).get("files", [])}
+        result = SnapshotResult()
+        lock = threading.Lock()
+        changed = []
+        for entry in scan_tree(src):
+            row = known.get(entry.rel)
+            if (
+                row is None or row[1] != entry.size or row[2] != entry.mtime_ns
+                or not all(self.has(d) for d in row[3])
+            ):
+                row = [entry.rel, entry.size, entry.mtime_ns, None]
+                changed.append((row, entry))
+            result.files.append(row)
+            result.entries[entry.rel] = entry
+            result.file_count += 1
+            result.total_size += entry.size
+        self._store_rows(changed, result, lock)
+        return result
+
+    def _store_rows(self, changed, result, lock):
+        def _store(item):
+            row, entry = item
+            row[3] = self._store_file(entry.path, entry.size, result, lock)
+
+        # hashing and zlib release the GIL, so changed files are chunked in parallel
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            list(pool.map(_store, changed))
+
+    def fill_missing(self, result):
+        """
+        Call with store_lock held, right before the snapshot is saved: files
+        whose chunks a gc swept while snapshot() ran are stored again.
+        Returns the number of files re-stored.
+        """
+        missing = [
+            (row, result.entries[row[0]]) for row in result.files
+            if not all(self.has(d) for d in row[3])
+        ]
+        if missing:
+            logger.info(f"Re-storing {len(missing)} file(s) whose chunks were collected")
+            self._store_rows(missing, result, threading.Lock())
+        return len(missing)
+
+    def restore(self, files, dest):
+        """write snapshot files under dest; returns the number restored"""
+        dest = Path(dest)
+        for folder in {(dest / row[0]).parent for row in files}:
+            folder.mkdir(parents=True, exist_ok=True)
+
+        def _write(row):
+            rel, _size, mtime_ns, digests = row
+            target = dest / rel
+            tmp = target.with_name(target.name + ".sfftmp")
+            with tmp.open("wb") as f:
+                for digest in digests:
+                    f.write(self.get(digest))
+            os.replace(tmp, target)
+            os.utime(target, ns=(mtime_ns, mtime_ns))
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            list(pool.map(_write, files))
+        return len(files)
+
+    def gc(self, live):
+        """
+        delete chunks not in live (a set of digests); returns (count, bytes).
+        Chunks written in the GC_GRACE_NS before the sweep, or during it, and
+        put()'s temp files are left alone: a snapshot may be chunking without
+        store_lock.
+        """
+        removed = freed = 0
+        cutoff = time.time_ns() - GC_GRACE_NS
+        with store_lock:
+            if not self.chunk_dir.exists():
+                return 0, 0
+            for bucket in os.scandir(self.chunk_dir):
+                if not bucket.is_dir():
+                    continue
+                for entry in os.scandir(bucket.path):
+                    if entry.name in live or entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        st = entry.stat()
+                        if st.st_mtime_ns >= cutoff:
+                            continue
+                        size = st.st_size
+                        os.remove(entry.path)
+                    except OSError as e:
+                        logger.debug(f"Failed to remove chunk {entry.name}: {e}")
+                        continue
+                    removed += 1
+                    freed += size
+        if removed:
+            logger.info(f"Removed {removed} unused chunks ({freed} bytes)")
+        return removed, freed
+
+
+def write_snapshot(path, data):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(msgpack.packb({"version": SNAPSHOT_VERSION, **data}))  # type: ignore
+    os.replace(tmp, path)
+
+
+def read_snapshot(path):
+    data = msgpack.unpackb(Path(path).read_bytes())
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version in {path}")
+    return data
+
+
+def snapshot_digests(data):
+    return {d for row in data.get("files", []) for d in row[3]}
@@ -0,0 +1,224 @@
+# SteaMidra - Steam game setup and manifest tool (SFF)
+# Copyright (c) 2025-2026 Midrag (https://github.com/Midrags)
+#
+# This file is part of SteaMidra.
+#
+# SteaMidra is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SteaMidra is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Persistent index of appmanifest_*.acf files.
+
+Only ACFs whose (size, mtime_ns) changed since the last scan get parsed again.
+Stored as msgpack at %APPDATA%/SteaMidra/library_index.bin:
+
+    {"version": 1, "libraries": {"<steamapps dir>": {"<acf name>": [row]}}}
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import msgpack  # type: ignore
+
+from sff.storage.acf import AppState, load_acf_header
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+def _get_index_path():
+    base = Path(os.environ.get("APPDATA", os.path.expanduser("~")))
+    path = base / "SteaMidra" / "library_index.bin"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@dataclass
+class ACFEntry:
+    """what a scan needs from one appmanifest, without re-reading it"""
+    acf_path: Path
+    size: int
+    mtime_ns: int
+    app_id: int = 0
+    name: str = ""
+    install_dir: str = ""
+    state_flags: int = 0
+
+    @property
+    def steamapps(self):
+        return self.acf_path.parent
+
+    @property
+    def library_path(self):
+        return self.acf_path.parent.parent
+
+    @property
+    def state(self):
+        return AppState(self.state_flags)
+
+    def needs_update(self):
+        return AppState.StateUpdateRequired in self.state
+
+    def to_row(self):
+        return [
+            self.size, self.mtime_ns, self.app_id,
+            self.name, self.install_dir, self.state_flags,
+        ]
+
+    @classmethod
+    def from_row(cls, acf_path, row):
+        size, mtime_ns, app_id, name, install_dir, state_flags = row
+        return cls(acf_path, size, mtime_ns, app_id, name, install_dir, state_flags)
+
+
+def _parse_entry(acf_path, st):
+    header = load_acf_header(acf_path)
+    raw_id = header.get("appid", "")
+    raw_state = header.get("StateFlags", "")
+    return ACFEntry(
+        acf_path=acf_path,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        app_id=int(raw_id) if raw_id.isdigit() else 0,
+        name=header.get("name", ""),
+        install_dir=header.get("installdir", ""),
+        state_flags=int(raw_state) if raw_state.isdigit() else 0,
+    )
+
+
+class LibraryIndex:
+
+    def __init__(self, path = None):
+        self.path = path or _get_index_path()
+        self._libraries: dict[str, dict[str, list]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if self.path.exists():
+                data = msgpack.unpackb(self.path.read_bytes())
+                if data.get("version") == INDEX_VERSION:
+                    self._libraries = data.get("libraries", {})
+                    logger.debug(f"Loaded library index with {len(self._libraries)} libraries")
+        except Exception as e:
+            logger.warning(f"Failed to load library index, rebuilding: {e}")
+            self._libraries = {}
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_suffix(".tmp")
+            try:
+                tmp.write_bytes(msgpack.packb({
+                    "version": INDEX_VERSION,
+                    "libraries": self._libraries,
+                }))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"Failed to save library index: {e}")
+
+    def _lookup(self, acf_path, st, row):
+        """cached entry if the file is unchanged, otherwise re-parse it"""
+        if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return ACFEntry.from_row(acf_path, row)
+        return _parse_entry(acf_path, st)
+
+    def _rows(self, steamapps):
+        with self._lock:
+            self._load()
+            return dict(self._libraries.get(str(steamapps), {}))
+
+    def scan_library(self, library_path):
+        """all appmanifests in a library; evicts ACFs that no longer exist"""
+        steamapps = Path(library_path) / "steamapps"
+        key = str(steamapps)
+        # file I/O happens outside the lock so libraries can be scanned concurrently
+        rows = self._rows(steamapps)
+        entries = []
+        try:
+            dir_entries = [
+                e for e in os.scandir(steamapps)
+                if e.name.startswith("appmanifest_") and e.name.endswith(".acf")
+            ]
+        except OSError:
+            with self._lock:
+                if self._libraries.pop(key, None) is not None:
+                    self._dirty = True
+            return entries
+        fresh = {}
+        for dir_entry in dir_entries:
+            acf_path = steamapps / dir_entry.name
+            try:
+                entry = self._lookup(acf_path, dir_entry.stat(), rows.get(dir_entry.name))
+            except Exception as e:
+                logger.error(f"Failed to parse {acf_path}: {e}")
+                continue
+            fresh[dir_entry.name] = entry.to_row()
+            entries.append(entry)
+        with self._lock:
+            if self._libraries.get(key) != fresh:
+                self._libraries[key] = fresh
+                self._dirty = True
+        return entries
+
+    def get_entry(self, acf_path):
+        """index entry for a single ACF, or None if it doesn't exist / can't be parsed"""
+        acf_path = Path(acf_path)
+        row = self._rows(acf_path.parent).get(acf_path.name)
+        try:
+            st = acf_path.stat()
+            entry = self._lookup(acf_path, st, row)
+        except OSError:
+            entry = None
+        except Exception as e:
+            logger.debug(f"ACF parse failed for {acf_path}: {e}")
+            return None
+        with self._lock:
+            rows = self._libraries.setdefault(str(acf_path.parent), {})
+            if entry is None:
+                if rows.pop(acf_path.name, None) is not None:
+                    self._dirty = True
+            elif rows.get(acf_path.name) != entry.to_row():
+                rows[acf_path.name] = entry.to_row()
+                self._dirty = True
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._libraries = {}
+            self._loaded = True
+            self._dirty = True
+            self.flush()
+
+
+_index_instance = None
+_index_lock = threading.Lock()
+
+
+def get_library_index():
+    global _index_instance
+    with _index_lock:
+        if _index_instance is None:
+            _index_instance = LibraryIndex()
+        return _index_instance
@@ -19,7 +19,8 @@
 import json
 from pathlib import Path
 
-from sff.http_utils import get_game_name
+from sff.app_names import get_name_resolver
+from sff.http_utils import prompt_game_name
 from sff.structs import NamedIDs
 
 
@@ -43,13 +44,12 @@ def get_named_ids(folder):
     id_names_file = folder / "names.json"
     named_ids = _load_named_ids(id_names_file)
 
-    new_ids = False
-    saved_ids = [x.stem for x in folder.glob("*.lua")]
-    for saved_id in saved_ids:
-        if saved_id not in named_ids:
-            new_ids = True
-            named_ids[saved_id] = get_game_name(saved_id)
-
+    new_ids = [x.stem for x in folder.glob("*.lua") if x.stem not in named_ids]
     if new_ids:
+        # one batched lookup, online included; IDs it can't name go straight to the prompt
+        resolved = get_name_resolver().resolve_many(x for x in new_ids if x.isdigit())
+        for saved_id in new_ids:
+            name = resolved.get(int(saved_id)) if saved_id.isdigit() else None
+            named_ids[saved_id] = name if name is not None else prompt_game_name()
         _save_named_ids(id_names_file, named_ids)
     return named_ids
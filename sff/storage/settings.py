@@ -18,6 +18,9 @@
 
 import json
 import logging
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 import msgpack  # type: ignore
@@ -32,8 +35,26 @@ logger = logging.getLogger(__name__)
 SETTINGS_FILE = root_folder(outside_internal=True) / "settings.bin"
 SETTINGS_VERSION = "1.0.0"  # For migration tracking
 
+# In-memory copy of settings.bin, reused until the file changes on disk
+_lock = threading.RLock()
+_cache = None
+_cache_stamp = None
+# writes buffered by this thread's open settings_transaction(), None outside one
+_local = threading.local()
+_DELETED = object()
+# ciphertext -> plaintext, so the keyring is only hit once per secret
+_decrypted: dict[bytes, str] = {}
 
-def load_all_settings():
+
+def _file_stamp():
+    try:
+        st = SETTINGS_FILE.stat()
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _read_settings_file():
     SETTINGS_FILE.touch(exist_ok=True)
     with SETTINGS_FILE.open("rb") as f:
         data = f.read()
@@ -45,17 +66,111 @@ def load_all_settings():
         )
     except (ValueError, msgpack.ExcessiveDataError, msgpack.FormatError):
         settings = {}
+    return settings
 
-    settings = migrate_settings(settings)
 
+def _write_settings(settings):
+    """Atomic write: temp file next to settings.bin, then rename over it"""
+    global _cache, _cache_stamp
+    tmp = SETTINGS_FILE.with_name(SETTINGS_FILE.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(msgpack.packb(settings))  # type: ignore
+    os.replace(tmp, SETTINGS_FILE)
+    _cache = settings
+    _cache_stamp = _file_stamp()
+
+
+def _settings():
+    """The cached settings dict (not a copy). Reloads when settings.bin changed."""
+    global _cache, _cache_stamp
+    with _lock:
+        stamp = _file_stamp()
+        if _cache is None or stamp is None or stamp != _cache_stamp:
+            _cache = migrate_settings(_read_settings_file())
+            _cache_stamp = _file_stamp()
+        return _cache
+
+
+def _pending():
+    return getattr(_local, "pending", None)
+
+
+def _apply(settings, pending):
+    """copy of settings with buffered writes applied"""
+    settings = dict(settings)
+    for key, value in pending.items():
+        if value is _DELETED:
+            settings.pop(key, None)
+        else:
+            settings[key] = value
     return settings
 
 
+def _store(key_name, value):
+    """write one setting now, or buffer it inside a transaction"""
+    pending = _pending()
+    if pending is not None:
+        pending[key_name] = value
+        return
+    with _lock:
+        settings = _settings()
+        if value is _DELETED and key_name not in settings:
+            return
+        _write_settings(_apply(settings, {key_name: value}))
+
+
+@contextmanager
+def settings_transaction():
+    """
+    Batch several set_setting/clear_setting calls into one atomic write.
+    Writes are buffered for the calling thread, which sees them in its own
+    reads, and merged into the current settings when the outermost
+    transaction exits; other threads aren't blocked meanwhile. Nothing is
+    written if the block raises.
+    """
+    if _pending() is not None:
+        yield
+        return
+    with _lock:
+        _settings()
+    _local.pending = {}
+    try:
+        yield
+        pending = _local.pending
+    finally:
+        _local.pending = None
+    if pending:
+        with _lock:
+            _write_settings(_apply(_settings(), pending))
+
+
+def load_all_settings():
+    pending = _pending()
+    with _lock:
+        settings = _settings()
+        return _apply(settings, pending) if pending else dict(settings)
+
+
+def _decrypt(value):
+    plain = _decrypted.get(value)
+    if plain is None:
+        plain = keyring_decrypt(value)
+        if plain is not None:
+            _decrypted[value] = plain
+    return plain
+
+
 def get_setting(key):
-    # TODO: don't trigger I/O when last used command was also get_setting
     logger.debug(f"get_setting: {key.clean_name}")
-    value = load_all_settings().get(key.key_name)
-    return keyring_decrypt(value) if (value and key.hidden) else value
+    pending = _pending()
+    if pending and key.key_name in pending:
+        value = pending[key.key_name]
+        if value is _DELETED:
+            value = None
+    else:
+        with _lock:
+            value = _settings().get(key.key_name)
+    return _decrypt(value) if (value and key.hidden) else value
 
 
 def set_setting(key, value):
@@ -65,21 +180,13 @@ def set_setting(key, value):
         raise ValueError("Invalid type used for set_setting")
 
     logger.debug(f"set_setting: {key.clean_name} -> {str(value)}")
-    settings = load_all_settings()
-    settings[key.key_name] = (
-        keyring_encrypt(value) if key.hidden and isinstance(value, str) else value
-    )
-    with SETTINGS_FILE.open("wb") as f:
-        f.write(msgpack.packb(settings))  # type: ignore
+    stored = keyring_encrypt(value) if key.hidden and isinstance(value, str) else value
+    _store(key.key_name, stored)
 
 
 def clear_setting(key):
     logger.debug(f"clear_setting: {key.clean_name}")
-    settings = load_all_settings()
-    if key.key_name in settings:
-        settings.pop(key.key_name)
-        with SETTINGS_FILE.open("wb") as f:
-            f.write(msgpack.packb(settings))  # type: ignore
+    _store(key.key_name, _DELETED)
 
 
 def resolve_advanced_mode():
@@ -106,7 +213,7 @@ def export_settings(export_path, include_sensitive = False):
                 if setting.hidden:
                     if isinstance(value, bytes):
                         try:
-                            value = keyring_decrypt(value)
+                            value = _decrypt(value)
                         except Exception as e:
                             logger.warning(f"Failed to decrypt {key}: {e}")
                             continue
@@ -138,26 +245,27 @@ def import_settings(import_path):
             return False, "Invalid settings file format: settings must be a dictionary"
         imported_count = 0
         errors = []
-        for key, value in import_data["settings"].items():
-            setting = None
-            for s in Settings:
-                if s.key_name == key:
-                    setting = s
-                    break
-            if setting is None:
-                errors.append(f"Unknown setting: {key}")
-                continue
-            if setting.type == bool and not isinstance(value, bool):
-                errors.append(f"{key}: expected bool, got {type(value).__name__}")
-                continue
-            elif setting.type == str and not isinstance(value, str):
-                errors.append(f"{key}: expected str, got {type(value).__name__}")
-                continue
-            try:
-                set_setting(setting, value)
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"{key}: {str(e)}")
+        with settings_transaction():
+            for key, value in import_data["settings"].items():
+                setting = None
+                for s in Settings:
+                    if s.key_name == key:
+                        setting = s
+                        break
+                if setting is None:
+                    errors.append(f"Unknown setting: {key}")
+                    continue
+                if setting.type == bool and not isinstance(value, bool):
+                    errors.append(f"{key}: expected bool, got {type(value).__name__}")
+                    continue
+                elif setting.type == str and not isinstance(value, str):
+                    errors.append(f"{key}: expected str, got {type(value).__name__}")
+                    continue
+                try:
+                    set_setting(setting, value)
+                    imported_count += 1
+                except Exception as e:
+                    errors.append(f"{key}: {str(e)}")
         if errors:
             error_msg = f"Imported {imported_count} settings with errors: " + "; ".join(errors)
             logger.warning(error_msg)
@@ -187,8 +295,7 @@ def migrate_settings(settings):
     #     settings["new_key"] = "default_value"
 
     settings["_version"] = SETTINGS_VERSION
-    with SETTINGS_FILE.open("wb") as f:
-        f.write(msgpack.packb(settings))  # type: ignore
+    _write_settings(settings)
 
     logger.info("Settings migration completed")
     return settings
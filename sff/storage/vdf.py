@@ -26,6 +26,72 @@ from typing import Any, Optional, TypeVar, overload
 _DictType = TypeVar("_DictType", bound=dict[Any, Any])
 
 
+class IndexedVDFDict(dict[Any, Any]):
+    """
+    dict with a lowercase key index for case-insensitive lookups.
+    The index is built on first use and dropped whenever the key set changes,
+    so enter_path(..., ignore_case=True) is a dict lookup instead of a scan.
+    """
+
+    __slots__ = ("_lower",)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._lower = None
+
+    def lower_key(self, key, default = None):
+        """The stored key equal to `key` ignoring case, or `default`"""
+        if self._lower is None:
+            self._lower = {
+                (k.lower() if isinstance(k, str) else k): k for k in self
+            }
+        return self._lower.get(key.lower() if isinstance(key, str) else key, default)
+
+    def _invalidate(self):
+        self._lower = None
+
+    def __setitem__(self, key, value):
+        if self._lower is not None and key not in self:
+            self._lower = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._invalidate()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self._invalidate()
+        return super().__ior__(other)
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._invalidate()
+        return super().popitem()
+
+    def clear(self):
+        self._invalidate()
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        self._invalidate()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default = None):
+        if key not in self:
+            self._invalidate()
+        return super().setdefault(key, default)
+
+
+def to_indexed(obj):
+    """Deep-convert nested dicts (e.g. Steam product info) into IndexedVDFDicts"""
+    if isinstance(obj, dict):
+        return IndexedVDFDict((k, to_indexed(v)) for k, v in obj.items())
+    return obj
+
+
 def vdf_dump(vdf_file, obj):
     with vdf_file.open("w", encoding="utf-8") as f:
         vdf.dump(obj, f, pretty=True)  # type: ignore
@@ -124,3 +190,71 @@ def ensure_library_has_app(steam_path, library_path, app_id):
         return False
     except Exception:
         return False
+
+
+def _benchmark(rounds = 2000):
+    """python -m sff.storage.vdf [rounds] — enter_path on a product-info sized app"""
+    import time
+
+    from sff.utils import enter_path
+
+    def legacy_enter_path(obj, *paths, ignore_case = False):
+        # enter_path before IndexedVDFDict: rebuilds a key map on every step
+        current = obj
+        for key in paths:
+            if ignore_case:
+                key = key.lower()
+            key_map = {}
+            for x in current:
+                key_map[x.lower() if ignore_case and isinstance(x, str) else x] = x
+            if key not in key_map:
+                return type(current)()
+            current = current[key_map[key]]
+        return current
+
+    # Roughly the shape of a big AAA app: hundreds of depots and DLC entries
+    app = {
+        "appid": "1000",
+        "common": {"name": "Synthetic", "type": "Game", "oslist": "windows"},
+        "extended": {"listofdlc": ",".join(str(2000 + i) for i in range(400))},
+        "config": {"launch": {str(i): {"executable": f"game{i}.exe"} for i in range(8)}},
+        "depots": {
+            str(1001 + i): {
+                "config": {"oslist": "windows", "language": "english"},
+                "manifests": {"public": {"gid": str(7000000000000000000 + i), "size": "1"}},
+                "dlcappid": str(2000 + i),
+            }
+            for i in range(600)
+        },
+    }
+    app["depots"]["branches"] = {"public": {"buildid": "1"}}
+    indexed = to_indexed(app)
+    lookups = [
+        ("depots", "1500", "manifests", "public"),
+        ("DEPOTS", "1599", "Manifests", "PUBLIC"),
+        ("Depots", "Branches", "Public"),
+        ("common", "name"),
+        ("extended", "listofdlc"),
+    ]
+
+    def timed(func, data, ignore_case):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for path in lookups:
+                func(data, *path, ignore_case=ignore_case)
+        return (time.perf_counter() - start) * 1000
+
+    for ignore_case in (False, True):
+        legacy = timed(legacy_enter_path, app, ignore_case)
+        plain = timed(enter_path, app, ignore_case)
+        fast = timed(enter_path, indexed, ignore_case)
+        print(
+            f"ignore_case={ignore_case}: legacy {legacy:.0f} ms, "
+            f"dict {plain:.0f} ms, IndexedVDFDict {fast:.0f} ms "
+            f"({rounds * len(lookups)} lookups)"
+        )
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -32,7 +32,7 @@ import logging
 import zipfile
 from pathlib import Path
 
-import httpx
+from sff.http_client import PooledSession
 
 logger = logging.getLogger(__name__)
 
@@ -189,7 +189,7 @@ disable_lan_only=1
         url = (f"{STEAM_WEB_API_URL}/ISteamUserStats/GetSchemaForGame/v2/"
                f"?key={self.api_key}&appid={app_id}&l=english")
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with PooledSession(timeout=30.0) as client:
                 resp = client.get(url)
                 resp.raise_for_status()
                 data = resp.json()
@@ -203,7 +203,7 @@ disable_lan_only=1
         url = (f"{STEAM_WEB_API_URL}/ISteamUserStats/GetSchemaForGame/v2/"
                f"?key={self.api_key}&appid={app_id}&l=english")
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with PooledSession(timeout=30.0) as client:
                 resp = client.get(url)
                 resp.raise_for_status()
                 data = resp.json()
@@ -216,7 +216,7 @@ disable_lan_only=1
         """fetch DLC list + names from SteamCMD API + Steam Store"""
         dlcs = {}
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(f"{STEAMCMD_API_URL}/{app_id}")
                 resp.raise_for_status()
                 data = resp.json()
@@ -225,7 +225,7 @@ disable_lan_only=1
             if dlc_str:
                 dlc_ids = [d.strip() for d in dlc_str.split(",") if d.strip().isdigit()]
                 # try to get names from store API
-                with httpx.Client(timeout=30.0) as client:
+                with PooledSession(timeout=30.0) as client:
                     for dlc_id in dlc_ids:
                         try:
                             resp = client.get(
@@ -246,7 +246,7 @@ disable_lan_only=1
     def _fetch_languages(self, app_id, log):
         """fetch supported languages"""
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(f"{STEAMCMD_API_URL}/{app_id}")
                 resp.raise_for_status()
                 data = resp.json()
@@ -261,7 +261,7 @@ disable_lan_only=1
     def _fetch_depots(self, app_id, log):
         """fetch depot IDs"""
         try:
-            with httpx.Client(timeout=15.0) as client:
+            with PooledSession(timeout=15.0) as client:
                 resp = client.get(f"{STEAMCMD_API_URL}/{app_id}")
                 resp.raise_for_status()
                 data = resp.json()
@@ -277,7 +277,7 @@ disable_lan_only=1
         icons_dir.mkdir(exist_ok=True)
         downloaded = 0
         try:
-            with httpx.Client(timeout=10.0) as client:
+            with PooledSession(timeout=10.0) as client:
                 for ach in achievements:
                     name = ach.get("name", "")
                     icon = ach.get("icon", "")
@@ -20,7 +20,7 @@
 System tray icon for SteaMidra.
 
 Provides minimize-to-tray, notification popups, and quick-access
-context menu (show/hide, recent, downloads, settings, exit).
+context menu (show/hide, recent, downloads, settings, auto-backup, exit).
 """
 
 import logging
@@ -30,6 +30,9 @@ from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QApplication
 from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtCore import pyqtSignal, QObject
 
+from sff.storage.settings import set_setting
+from sff.structs import Settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,10 +43,12 @@ class TrayIcon(QObject):
     Signals:
         show_requested: user clicked "Show"
         exit_requested: user clicked "Exit"
+        save_snapshot_taken: the save watcher backed up a game (name)
     """
 
     show_requested = pyqtSignal()
     exit_requested = pyqtSignal()
+    save_snapshot_taken = pyqtSignal(str)
 
     def __init__(self, parent=None, icon_path = ""):
         super().__init__(parent)
@@ -51,6 +56,12 @@ class TrayIcon(QObject):
         self._menu: Optional[QMenu] = None
         self._icon_path = icon_path
         self._minimize_to_tray = True
+        self._save_watcher = None
+        self._prepare_watcher = None
+        self._auto_backup_action: Optional[QAction] = None
+        self.save_snapshot_taken.connect(
+            lambda name: self.notify("Saves backed up", f"New snapshot of {name}")
+        )
 
     def setup(self, app_icon = None):
         """initialize the tray icon — call this after QApplication is created"""
@@ -79,6 +90,13 @@ class TrayIcon(QObject):
         self._recent_menu = self._menu.addMenu("Recent Games")
         self._recent_menu.addAction("(none)")
         self._menu.addSeparator()
+        self._auto_backup_action = QAction("Auto-backup Saves", self._menu)
+        self._auto_backup_action.setCheckable(True)
+        self._auto_backup_action.setEnabled(self._save_watcher is not None)
+        self._auto_backup_action.setChecked(bool(self._save_watcher and self._save_watcher.running))
+        self._auto_backup_action.toggled.connect(self._toggle_auto_backup)
+        self._menu.addAction(self._auto_backup_action)
+        self._menu.addSeparator()
         exit_action = QAction("Exit", self._menu)
         exit_action.triggered.connect(self.exit_requested.emit)
         self._menu.addAction(exit_action)
@@ -92,6 +110,42 @@ class TrayIcon(QObject):
         elif reason == QSystemTrayIcon.ActivationReason.DoubleClick:
             self.show_requested.emit()
 
+    def attach_save_watcher(self, watcher, start = True, prepare = None):
+        """
+        let the tray menu toggle a SaveWatcher and show its snapshots.
+        prepare() registers the folders to watch; it runs once, in the
+        background, before the watcher first starts.
+        """
+        self._save_watcher = watcher
+        self._prepare_watcher = prepare
+        # called on the watcher thread; the signal hops to the GUI thread
+        watcher.on_snapshot = lambda info: self.save_snapshot_taken.emit(
+            info.game_name or f"App {info.app_id}"
+        )
+        if self._auto_backup_action:
+            self._auto_backup_action.setEnabled(True)
+            self._auto_backup_action.blockSignals(True)
+            self._auto_backup_action.setChecked(start)
+            self._auto_backup_action.blockSignals(False)
+        if start:
+            self._start_watcher()
+
+    def _start_watcher(self):
+        prepare, self._prepare_watcher = self._prepare_watcher, None
+        # detecting save folders scans the disk: keep it off the GUI thread.
+        # Unchecking the action (or quitting) meanwhile calls stop(), which
+        # cancels the pending start.
+        self._save_watcher.start_later(prepare)
+
+    def _toggle_auto_backup(self, enabled):
+        if self._save_watcher is None:
+            return
+        set_setting(Settings.AUTO_BACKUP_SAVES, enabled)
+        if enabled:
+            self._start_watcher()
+        else:
+            self._save_watcher.stop()
+
     def notify(self, title, message, duration_ms = 3000):
         """show a tray notification balloon"""
         if self._tray:
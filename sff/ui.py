@@ -54,9 +54,10 @@ from sff.prompts import (
     prompt_text,
 )
 from sff.recent_files import get_recent_files_manager
-from sff.storage.acf import ACFParser, find_and_parse_acf, get_app_name_from_acf
+from sff.storage.acf import find_and_parse_acf, get_app_name_from_acf
 from sff.storage.vdf import ensure_library_has_app
 from sff.steam_client import create_provider_for_current_thread, get_product_info, SteamInfoProvider
+from sff.steam_library import get_library_service
 from sff.steam_store import get_app_name_from_store
 from sff.steam_tools_compat import install_lua_to_steam, remove_acf_and_manifests, remove_lua_from_steam
 from sff.storage.settings import (
@@ -67,7 +68,7 @@ from sff.storage.settings import (
     load_all_settings,
     set_setting,
 )
-from sff.storage.vdf import get_steam_libs, vdf_dump, vdf_load
+from sff.storage.vdf import vdf_dump, vdf_load
 from sff.strings import LINUX_RELEASE_PREFIX, RELEASE_PAGE_URL, VERSION, WINDOWS_RELEASE_PREFIX
 from sff.structs import (
     ContextMenuOptions,
@@ -586,7 +587,7 @@ class UI:
         return MainReturnCode.LOOP
 
     def select_steam_library(self):
-        steam_libs = get_steam_libs(self.steam_path)
+        steam_libs = get_library_service(self.steam_path).get_libraries()
         if len(steam_libs) == 1:
             return steam_libs[0]
         steam_lib_path = prompt_select(
@@ -613,9 +614,8 @@ class UI:
 
     def run_steamless_direct(self, acf_info, exe_path):
         from sff.game_specific import GameHandler
-        from sff.storage.vdf import get_steam_libs
         injection_manager = self.app_list_man or self.sls_man
-        steam_libs = get_steam_libs(self.steam_path)
+        steam_libs = get_library_service(self.steam_path).get_libraries()
         lib_path = steam_libs[0] if steam_libs else self.steam_path
         provider = self._steam_provider()
         handler = GameHandler(self.steam_path, lib_path, provider, injection_manager)
@@ -628,7 +628,7 @@ class UI:
         if injection_manager is None:
             print("Unsupported OS for this action.")
             return MainReturnCode.LOOP_NO_PROMPT
-        steam_libs = get_steam_libs(self.steam_path)
+        steam_libs = get_library_service(self.steam_path).get_libraries()
         lib_path = steam_libs[0] if steam_libs else self.steam_path
         provider = self._steam_provider()
         handler = GameHandler(
@@ -1221,7 +1221,7 @@ class UI:
         if applist_ids is None:
             print("This OS is not supported for this action.")
             return MainReturnCode.LOOP_NO_PROMPT
-        steam_libs = get_steam_libs(self.steam_path)
+        library_service = get_library_service(self.steam_path)
         lua_manager = LuaManager(self.os_type)
         provider = self._steam_provider()
         downloader = ManifestDownloader(provider, self.steam_path)
@@ -1231,26 +1231,23 @@ class UI:
             else None
         )
         explored_ids = []
-        for lib in steam_libs:
-            steamapps = lib / "steamapps"
-            acf_files = steamapps.glob("*.acf")
-            for acf_file in acf_files:
-                acf = ACFParser(acf_file)
+        for _, entries in library_service.scan():
+            for acf in entries:
                 if not acf.needs_update():
                     continue
-                if acf.id not in applist_ids:
+                if acf.app_id not in applist_ids:
                     continue
-                if acf.id in explored_ids:
+                if acf.app_id in explored_ids:
                     continue
                 print(
                     Fore.YELLOW + f"\n{acf.name} needs an update!\n" + Style.RESET_ALL
                 )
-                explored_ids.append(acf.id)
-                in_backup = str(acf.id) in lua_manager.named_ids
+                explored_ids.append(acf.app_id)
+                in_backup = str(acf.app_id) in lua_manager.named_ids
                 # TODO: DRY this
                 parsed_lua = lua_manager.fetch_lua(
                     LuaChoice.ADD_LUA,
-                    lua_manager.saved_lua / f"{acf.id}.lua" if in_backup else None,
+                    lua_manager.saved_lua / f"{acf.app_id}.lua" if in_backup else None,
                 )
                 if parsed_lua is None:
                     return MainReturnCode.LOOP_NO_PROMPT
@@ -1344,29 +1341,26 @@ class UI:
         if applist_ids is None:
             print(Fore.RED + "This OS is not supported for this action." + Style.RESET_ALL)
             return MainReturnCode.EXIT
-        steam_libs = get_steam_libs(self.steam_path)
+        library_service = get_library_service(self.steam_path)
         lua_manager = LuaManager(self.os_type)
         provider = self._steam_provider()
         downloader = ManifestDownloader(provider, self.steam_path)
         updated_count = 0
         explored_ids = []
-        for lib in steam_libs:
-            steamapps = lib / "steamapps"
-            acf_files = steamapps.glob("*.acf")
-            for acf_file in acf_files:
-                acf = ACFParser(acf_file)
+        for _, entries in library_service.scan():
+            for acf in entries:
                 if not acf.needs_update():
                     continue
-                if acf.id not in applist_ids:
+                if acf.app_id not in applist_ids:
                     continue
-                if acf.id in explored_ids:
+                if acf.app_id in explored_ids:
                     continue
                 print(f"Updating {acf.name}...")
-                explored_ids.append(acf.id)
-                in_backup = str(acf.id) in lua_manager.named_ids
+                explored_ids.append(acf.app_id)
+                in_backup = str(acf.app_id) in lua_manager.named_ids
                 parsed_lua = lua_manager.fetch_lua(
                     LuaChoice.ADD_LUA,
-                    lua_manager.saved_lua / f"{acf.id}.lua" if in_backup else None,
+                    lua_manager.saved_lua / f"{acf.app_id}.lua" if in_backup else None,
                 )
                 if parsed_lua is None:
                     print(Fore.RED + f"✗ Failed to fetch lua for {acf.name}" + Style.RESET_ALL)
@@ -1420,7 +1414,7 @@ class UI:
         lua_manager = LuaManager(self.os_type)
         scanner = LibraryScanner(self.steam_path, lua_manager.saved_lua)
         # Scan all games
-        games = scanner.scan_all_games()
+        games = scanner.scan_all_games(parallel=True)
         if not games:
             print(Fore.YELLOW + "No games found in library." + Style.RESET_ALL)
             return MainReturnCode.LOOP_NO_PROMPT
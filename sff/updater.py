@@ -16,12 +16,10 @@
 # You should have received a copy of the GNU General Public License
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
-import asyncio
 import re
-import httpx
 import json
 
-from sff.http_utils import get_request
+from sff.http_utils import cached_get
 from sff.strings import VERSION
 
 # Hardcoded to ensure updates always fetch from https://github.com/Midrags/SFF/releases
@@ -56,25 +54,24 @@ class Updater:
     _RELEASES_URL = "https://api.github.com/repos/Midrags/SFF/releases"
     _HEADERS = {"Accept": "application/vnd.github.v3+json", "User-Agent": "SteaMidra-Updater"}
 
+    @staticmethod
+    def _get_json(url):
+        # cached on disk and revalidated with ETag, so repeat checks are cheap
+        resp = cached_get(url, headers=Updater._HEADERS)
+        if resp is None or resp.status_code != 200:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
     @staticmethod
     def get_latest_stable():
-        resp = asyncio.run(
-            get_request(
-                Updater._LATEST_URL,
-                "json",
-                headers=Updater._HEADERS,
-            )
-        )
+        resp = Updater._get_json(Updater._LATEST_URL)
         if resp is not None:
             return resp
         # Fallback: /releases/latest can 404 if latest is draft; fetch list and take first non-draft
-        list_resp = asyncio.run(
-            get_request(
-                Updater._RELEASES_URL,
-                "json",
-                headers=Updater._HEADERS,
-            )
-        )
+        list_resp = Updater._get_json(Updater._RELEASES_URL)
         if not isinstance(list_resp, list):
             return None
         for release in list_resp:
@@ -87,7 +84,9 @@ class Updater:
     def get_latest_prerelease():
         url = Updater._RELEASES_URL
         while True:
-            resp = httpx.get(url, headers=Updater._HEADERS)
+            resp = cached_get(url, headers=Updater._HEADERS)
+            if resp is None:
+                return None
             releases = json.loads(resp.text)
             for release in releases:
                 tag = release.get("tag_name")
@@ -55,6 +55,31 @@ def root_folder(outside_internal = False):
         return root
 
 
+_MISSING = object()
+
+
+def _match_key(current, key, ignore_case):
+    """The key actually stored in `current` that `key` refers to, or _MISSING"""
+    if not hasattr(current, "keys"):
+        key_map = {}
+        for x in current:  # pyright: ignore[reportUnknownVariableType]
+            key_map[x.lower() if ignore_case and isinstance(x, str) else x] = x
+        return key_map.get(key.lower() if ignore_case else key, _MISSING)
+    if key in current:
+        return key
+    if not ignore_case:
+        return _MISSING
+    # IndexedVDFDict keeps a cached lowercase index
+    lower_key = getattr(current, "lower_key", None)
+    if lower_key is not None:
+        return lower_key(key, _MISSING)
+    key = key.lower()
+    for x in current:  # pyright: ignore[reportUnknownVariableType]
+        if isinstance(x, str) and x.lower() == key:
+            return x
+    return _MISSING
+
+
 def enter_path(
 
     obj,
@@ -89,25 +114,17 @@ def enter_path(
             except IndexError:
                 return type(current)()
             continue
-        original_key = key
-        if ignore_case:
-            key = key.lower()
-        key_map = {}
-        for x in current:  # pyright: ignore[reportUnknownVariableType]
-            if ignore_case and isinstance(x, str):
-                key_map[x.lower()] = x
-            else:
-                key_map[x] = x
-        if key in key_map:
+        found_key = _match_key(current, key, ignore_case)
+        if found_key is not _MISSING:
             current = current[  # pyright: ignore[reportUnknownVariableType]
-                key_map[key]
+                found_key
             ]
         else:
             if not mutate:
                 return default if default else type(current)()
             # create a new key that's the same type as current
             new_node = type(current)()
-            current[original_key] = new_node
+            current[key] = new_node
             current = new_node
 
     return current  # pyright: ignore[reportUnknownVariableType]
@@ -17,7 +17,13 @@
 # along with SteaMidra.  If not, see <https://www.gnu.org/licenses/>.
 
 from io import BytesIO
+import os
+import struct
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from colorama import Fore, Style
@@ -140,12 +146,320 @@ def read_nth_file_from_zip_bytes(nth, bytes):
         return
 
 
-def zip_folder(folder_path, output_path):
-    tmp = BytesIO()
-    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file in folder_path.rglob('*'):
-            if file.is_file():
-                zipf.write(file, arcname=file.relative_to(folder_path))
-    tmp.seek(0)
-    with output_path.open("wb") as f:
-        f.write(tmp.read())
+# --- streaming writer ---
+
+ZIP64_LIMIT = (1 << 31) - 1
+BLOCK_SIZE = 1024 * 1024
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_END_RECORD64 = struct.Struct("<IQHHIIQQQQ")
+_END_LOCATOR64 = struct.Struct("<IIQI")
+_FLAG_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+
+def _dos_time(mtime):
+    t = time.localtime(max(mtime, 315532800))  # zip can't store dates before 1980
+    return (
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+    )
+
+
+def _deflate_block(data, level, last):
+    # each block is its own raw deflate stream; a sync flush keeps it
+    # byte-aligned and non-final so the blocks can simply be concatenated
+    comp = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return comp.compress(data) + comp.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class StreamingZipWriter:
+    """
+    Writes a ZIP (with ZIP64 where needed) straight to a file. Members are
+    read in BLOCK_SIZE pieces and deflated on a thread pool, so several
+    cores work at once while memory stays around 2 * workers blocks.
+    The result is a normal ZIP that zipfile and any unzip tool can read.
+    """
+
+    def __init__(self, path, level = 6, workers = None):
+        self._file = open(path, "wb")
+        self._level = level
+        self._workers = workers or min(8, os.cpu_count() or 2)
+        # workers=1 deflates inline on the calling thread
+        self._pool = ThreadPoolExecutor(max_workers=self._workers) if self._workers > 1 else None
+        self._central = []
+        self._offset = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def _begin(self, arcname, mtime, method, size):
+        zip64 = size > ZIP64_LIMIT
+        name = arcname.encode("utf-8")
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if zip64 else b""
+        dos_time, dos_date = _dos_time(mtime)
+        member = {
+            "name": name, "method": method, "time": dos_time, "date": dos_date,
+            "offset": self._offset, "zip64": zip64, "crc": 0, "csize": 0, "usize": 0,
+        }
+        self._write(_LOCAL_HEADER.pack(
+            0x04034B50, 45 if zip64 else 20, _FLAG_DESCRIPTOR | _FLAG_UTF8, method,
+            dos_time, dos_date, 0, 0xFFFFFFFF if zip64 else 0, 0xFFFFFFFF if zip64 else 0,
+            len(name), len(extra),
+        ) + name + extra)
+        return member
+
+    def _end(self, member):
+        fmt = "<IIQQ" if member["zip64"] else "<IIII"
+        self._write(struct.pack(fmt, 0x08074B50, member["crc"], member["csize"], member["usize"]))
+        self._central.append(member)
+
+    def add_files(self, files, compress = None, progress = None):
+        """
+        files is [(path, arcname)]. compress(path, size) says whether to
+        deflate a member (default: always); others are stored.
+        progress(files_done, files_total, bytes_done, bytes_total) is called
+        as members finish. Returns {arcname: crc32}.
+        """
+        files = [(Path(p), arcname, os.stat(p)) for p, arcname in files]
+        total_files = len(files)
+        total_bytes = sum(st.st_size for _, _, st in files)
+        done_files = done_bytes = 0
+        crcs = {}
+        # in file order: ("begin", ...), ("block", future or bytes, raw length), ("end", ...)
+        pending = deque()
+        blocks_pending = 0
+        max_blocks = self._workers * 2
+        member = None
+
+        def _write_next():
+            nonlocal member, blocks_pending, done_files, done_bytes
+            kind, *args = pending.popleft()
+            if kind == "begin":
+                member = self._begin(*args)
+            elif kind == "block":
+                data, raw_len = args
+                if not isinstance(data, bytes):
+                    data = data.result()
+                blocks_pending -= 1
+                self._write(data)
+                member["csize"] += len(data)
+                member["usize"] += raw_len
+                done_bytes += raw_len
+            else:
+                arcname, crc = args
+                member["crc"] = crc
+                self._end(member)
+                crcs[arcname] = crc
+                done_files += 1
+                if progress:
+                    progress(done_files, total_files, done_bytes, total_bytes)
+
+        for path, arcname, st in files:
+            deflate = compress(path, st.st_size) if compress else True
+            method = zipfile.ZIP_DEFLATED if deflate else zipfile.ZIP_STORED
+            pending.append(("begin", arcname, st.st_mtime, method, st.st_size))
+            crc = 0
+            with path.open("rb") as f:
+                block = f.read(BLOCK_SIZE)
+                while True:
+                    nxt = f.read(BLOCK_SIZE) if len(block) == BLOCK_SIZE else b""
+                    crc = zlib.crc32(block, crc)
+                    last = not nxt
+                    if deflate and self._pool is not None:
+                        data = self._pool.submit(_deflate_block, block, self._level, last)
+                    elif deflate:
+                        data = _deflate_block(block, self._level, last)
+                    else:
+                        data = block
+                    pending.append(("block", data, len(block)))
+                    blocks_pending += 1
+                    # bounded read-ahead: write out finished blocks in order
+                    while blocks_pending > max_blocks:
+                        _write_next()
+                    if last:
+                        break
+                    block = nxt
+            pending.append(("end", arcname, crc))
+        while pending:
+            _write_next()
+        return crcs
+
+    def add_bytes(self, arcname, data, mtime = None):
+        member = self._begin(arcname, time.time() if mtime is None else mtime, zipfile.ZIP_DEFLATED, len(data))
+        packed = _deflate_block(data, self._level, True)
+        self._write(packed)
+        member.update(crc=zlib.crc32(data), csize=len(packed), usize=len(data))
+        self._end(member)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self._pool is not None:
+            self._pool.shutdown()
+        cd_start = self._offset
+        for m in self._central:
+            extra_fields = []
+            usize, csize, offset = m["usize"], m["csize"], m["offset"]
+            if m["zip64"] or usize > ZIP64_LIMIT:
+                extra_fields.append(usize)
+                usize = 0xFFFFFFFF
+            if m["zip64"] or csize > ZIP64_LIMIT:
+                extra_fields.append(csize)
+                csize = 0xFFFFFFFF
+            if offset > ZIP64_LIMIT:
+                extra_fields.append(offset)
+                offset = 0xFFFFFFFF
+            extra = (
+                struct.pack(f"<HH{len(extra_fields)}Q", 1, 8 * len(extra_fields), *extra_fields)
+                if extra_fields else b""
+            )
+            version = 45 if extra_fields else 20
+            self._write(_CENTRAL_HEADER.pack(
+                0x02014B50, version, version, _FLAG_DESCRIPTOR | _FLAG_UTF8, m["method"],
+                m["time"], m["date"], m["crc"], csize, usize,
+                len(m["name"]), len(extra), 0, 0, 0, 0, offset,
+            ) + m["name"] + extra)
+        cd_size = self._offset - cd_start
+        count = len(self._central)
+        if count >= 0xFFFF or cd_start > ZIP64_LIMIT or cd_size > ZIP64_LIMIT:
+            end64 = self._offset
+            self._write(_END_RECORD64.pack(0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_start))
+            self._write(_END_LOCATOR64.pack(0x07064B50, 0, end64, 1))
+            self._write(_END_RECORD.pack(0x06054B50, 0, 0, 0xFFFF, 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0))
+        else:
+            self._write(_END_RECORD.pack(0x06054B50, 0, 0, count, count, cd_size, cd_start, 0))
+        self._file.close()
+
+    def abort(self):
+        """stop without writing the central directory; the file is left incomplete"""
+        if self._file.closed:
+            return
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        self._file.close()
+
+
+# --- folder archives ---
+
+# Formats that are already compressed; deflating them again only costs time
+STORED_EXTENSIONS = {
+    ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz", ".zst", ".lz4", ".cab",
+    ".jpg", ".jpeg", ".png", ".webp", ".gif", ".mp3", ".ogg", ".opus",
+    ".mp4", ".mkv", ".webm", ".bik", ".bk2", ".usm",
+}
+_SAMPLE_SIZE = 64 * 1024
+# below this ratio on a sample, deflate is worth it
+_MIN_SAVING = 0.95
+
+
+def should_compress(path, size):
+    """
+    False for files that won't shrink: known compressed formats, and files
+    whose first 64 KiB barely compress at zlib level 1 (a cheap entropy test).
+    """
+    if Path(path).suffix.lower() in STORED_EXTENSIONS:
+        return False
+    if size < _SAMPLE_SIZE:
+        return True
+    with open(path, "rb") as f:
+        sample = f.read(_SAMPLE_SIZE)
+    return len(zlib.compress(sample, 1)) < len(sample) * _MIN_SAVING
+
+
+def zip_folder(folder_path, output_path, progress = None, workers = None, store_compressed = True):
+    """
+    Zip everything under folder_path into output_path, streaming to disk.
+    progress(files_done, files_total, bytes_done, bytes_total) is called as
+    members finish; workers=1 compresses on this thread only. With
+    store_compressed, files that don't compress are stored as-is.
+    """
+    folder_path, output_path = Path(folder_path), Path(output_path)
+    tmp = output_path.with_name(output_path.name + ".tmp")
+    skip = {output_path.resolve(), tmp.resolve()}
+    files = [
+        (file, file.relative_to(folder_path).as_posix())
+        for file in sorted(folder_path.rglob("*"))
+        if file.is_file() and file.resolve() not in skip
+    ]
+    try:
+        with StreamingZipWriter(tmp, workers=workers) as writer:
+            writer.add_files(
+                files,
+                compress=should_compress if store_compressed else None,
+                progress=progress,
+            )
+        os.replace(tmp, output_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _benchmark():
+    """python -m sff.zip [GiB] [folder] — old in-memory zip_folder vs the streaming one"""
+    import shutil
+    import sys
+    import tempfile
+    import tracemalloc
+
+    gib = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    work = Path(tempfile.mkdtemp(prefix="sff-zipbench-"))
+    try:
+        if len(sys.argv) > 2:
+            folder = Path(sys.argv[2])
+        else:
+            # half incompressible (like .pak/.bik), half text-like
+            folder = work / "src"
+            folder.mkdir()
+            per_file = 64 * 1024 * 1024
+            words = b" ".join(b"%x" % (i * 2654435761 % 99991) for i in range(200_000))
+            for i in range(max(2, int(gib * 1024**3) // per_file)):
+                with (folder / f"file{i:03}.{'bin' if i % 2 else 'dat'}").open("wb") as f:
+                    for _ in range(per_file // BLOCK_SIZE):
+                        f.write(os.urandom(BLOCK_SIZE) if i % 2 else words[:BLOCK_SIZE])
+        total = sum(f.stat().st_size for f in folder.rglob("*") if f.is_file())
+        print(f"{total / 1024**3:.2f} GiB in {folder}")
+
+        def _legacy(out):
+            buf = BytesIO()
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zipf:
+                for file in folder.rglob("*"):
+                    if file.is_file():
+                        zipf.write(file, arcname=file.relative_to(folder))
+            out.write_bytes(buf.getvalue())
+
+        runs = [
+            ("in-memory (old)", _legacy),
+            ("streaming, 1 thread", lambda out: zip_folder(folder, out, workers=1, store_compressed=False)),
+            ("streaming, threads", lambda out: zip_folder(folder, out, store_compressed=False)),
+            ("streaming, threads + store", lambda out: zip_folder(folder, out)),
+        ]
+        for name, run in runs:
+            out = work / "out.zip"
+            tracemalloc.start()
+            start = time.perf_counter()
+            run(out)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{name:>28}: {elapsed:6.1f}s  {total / elapsed / 1024**2:6.0f} MiB/s  "
+                f"peak {peak / 1024**2:7.1f} MiB  -> {out.stat().st_size / 1024**2:.0f} MiB"
+            )
+            out.unlink()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    _benchmark()